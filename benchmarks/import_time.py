@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the time taken to import the simulation module in a fresh interpreter.
+
+Compares `import cv19.simulation` against also importing the plotting and statistics
+dependencies that used to be imported along with it (pandas, matplotlib and scipy),
+which every worker process of a parallel run used to pay for.
+
+Usage: python3 benchmarks/import_time.py [repeats]
+"""
+import sys
+import subprocess
+from timeit import default_timer as timer
+
+import numpy as np
+
+STATEMENTS = {
+    "cv19.simulation": "import cv19.simulation",
+    "cv19.simulation + plotting": "import cv19.simulation, pandas, matplotlib.pyplot, scipy.stats",
+}
+
+
+def measure(statement):
+    """Function to measure the time (in seconds) taken to start an interpreter and run a statement."""
+
+    start = timer()
+    subprocess.run([sys.executable, "-c", statement], check=True)
+    return timer() - start
+
+
+def main(repeats):
+    """Function to report the median import time of each statement."""
+
+    baseline = np.median([measure("pass") for _ in range(repeats)])
+    times = {name: np.median([measure(statement) for _ in range(repeats)]) - baseline
+             for name, statement in STATEMENTS.items()}
+
+    print(f"Median import time over {repeats} runs (interpreter start up removed)")
+    for name, time in times.items():
+        print(f"    {name:28s}: {time * 1000:8.1f} ms")
+
+    loaded = subprocess.run([sys.executable, "-c", "import sys, cv19.simulation; "
+                             "print(sorted({'pandas', 'matplotlib', 'scipy'} & set(sys.modules)))"],
+                            check=True, capture_output=True, text=True).stdout.strip()
+    print(f"    heavy modules loaded by cv19.simulation: {loaded}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
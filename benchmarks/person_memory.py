@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the memory used per agent of a population.
+
+Compares the Person class from before the agent store, which held its attributes
+(including string valued ones and two contact dictionaries) in a per-instance
+dictionary, against the current slotted Person view plus its share of the integer
+coded agent store. The previous Person class is read from the git history, from the
+given revision or otherwise from the commit before the agent store was added.
+
+Usage: python3 benchmarks/person_memory.py [nPop] [baseline_revision]
+"""
+import sys
+import subprocess
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+from cv19.agent_store import AgentStore
+from cv19.data import constants
+from cv19.person import Person
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_baseline_person(revision=None):
+    """Function to load the Person class of cv19/person.py at a revision of the repository."""
+
+    if revision is None:
+        added = subprocess.run(["git", "log", "--diff-filter=A", "--format=%H", "--", "cv19/agent_store.py"],
+                               cwd=ROOT, check=True, capture_output=True, text=True).stdout.split()
+        revision = f"{added[-1]}^"
+
+    source = subprocess.run(["git", "show", f"{revision}:cv19/person.py"],
+                            cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    namespace = {"__name__": "baseline_person"}
+    exec(compile(source, f"{revision}:cv19/person.py", "exec"), namespace)  # pylint: disable=exec-used
+    return namespace["Person"]
+
+
+def measure(build):
+    """Function to measure the memory allocated (in bytes) by a callable."""
+
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current
+
+
+def main(nPop, revision=None):
+    """Function to report the memory used per agent by the previous and current Person."""
+
+    BaselinePerson = load_baseline_person(revision)
+    rng = np.random.default_rng(0)
+    sim_obj = SimpleNamespace(protocol_compliance=1.0)
+
+    # Drawn outside of the measurements, which then only see the people themselves
+    ages = rng.integers(len(constants.AGE_OPTIONS), size=nPop)
+    jobs = rng.integers(len(constants.JOB_OPTIONS), size=nPop)
+    severities = rng.integers(len(constants.SEVERITY_OPTIONS), size=nPop)
+    masks = rng.integers(len(constants.MASK_OPTIONS), size=nPop)
+    isolation = rng.integers(len(constants.ISOLATION_OPTIONS), size=nPop)
+    houses = np.arange(nPop) // 3
+
+    def build_baseline():
+        return [BaselinePerson(index=i, sim_obj=sim_obj, age=constants.AGE_OPTIONS[ages[i]],
+                               job=constants.JOB_OPTIONS[jobs[i]], house_index=int(houses[i]),
+                               isolation_tendencies=constants.ISOLATION_OPTIONS[isolation[i]],
+                               case_severity=constants.SEVERITY_OPTIONS[severities[i]],
+                               mask_type=constants.MASK_OPTIONS[masks[i]])
+                for i in range(nPop)]
+
+    def build_store():
+        store = AgentStore(nPop)
+        store.age[:] = ages
+        store.job[:] = jobs
+        store.case_severity[:] = severities
+        store.mask_type[:] = masks
+        store.isolation_tendencies[:] = isolation
+        store.household[:] = houses
+        return store
+
+    def build_views():
+        store = build_store()
+        return store, [Person.from_store(store, i, sim_obj) for i in range(nPop)]
+
+    baseline = measure(build_baseline)
+    views = measure(build_views)
+    store = measure(build_store)
+
+    print(f"Memory per agent, nPop = {nPop}")
+    print(f"    previous Person              : {baseline / nPop:8.1f} bytes")
+    print(f"    slotted Person + agent store : {views / nPop:8.1f} bytes")
+    print(f"        of which agent store     : {store / nPop:8.1f} bytes")
+    print(f"    reduction                    : {baseline / views:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000, sys.argv[2] if len(sys.argv) > 2 else None)
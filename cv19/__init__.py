@@ -1,3 +1,17 @@
 import os
+from pathlib import Path
 
-CV19ROOT = os.environ["CV19ROOT"]
+
+def get_cv19_root():
+    """Function to get the root directory of the repository, used to find input files.
+
+    Returns
+    -------
+    : str
+        The CV19ROOT environment variable if set, otherwise the directory holding the
+        cv19 package.
+    """
+    return os.environ.get("CV19ROOT", str(Path(__file__).resolve().parent.parent))
+
+
+CV19ROOT = get_cv19_root()
@@ -0,0 +1,197 @@
+"""
+This file holds the array-backed agent store used by population.py and person.py.
+"""
+import numpy as np
+
+from .data import constants
+
+# This value means that the person index at this location is not susceptible/infected/dead/...
+NULL_ID = -1
+
+# Stands in for None in the optional integer columns. NULL_ID cannot be used here,
+# as infection days can legitimately be negative (e.g. incoming students).
+NULL_INT = np.iinfo(np.int32).min
+
+# Column names and default values. Optional integer columns use NULL_INT as their
+# default, and are converted to and from None when accessed one agent at a time.
+BOOL_COLUMNS = {
+    "infected": False,
+    "recovered": False,
+    "dead": False,
+    "hospitalized": False,
+    "ICU": False,
+    "quarantined": False,
+    "vaccinated": False,
+    "has_mask": True,
+    "show_symptoms": False,
+    "has_covid_symptoms": False,
+    "knows_infected": False,
+    "will_get_symptoms": False,
+    "has_cold": False,
+    "has_ct_app": True,
+    "waiting_for_test": False,
+}
+OPTIONAL_INT_COLUMNS = ("quarantined_day", "infected_day", "recovered_day", "death_day", "cure_days",
+                        "days_until_symptoms", "test_day", "vaccinated_day", "virus_type", "household")
+INT_COLUMNS = {
+    "days_in_lockdown": 0,
+}
+FLOAT_COLUMNS = {
+    "protocol_compliance": 1.0,
+}
+OBJECT_COLUMNS = ("others_infected", "recent_infections")
+
+# String valued attributes are stored as small integer codes, indexing into these tables.
+# A code of NULL_ID stands for None.
+CATEGORICAL_COLUMNS = {
+    "age": constants.AGE_OPTIONS,
+    "job": constants.ALL_JOB_OPTIONS,
+    "case_severity": constants.SEVERITY_OPTIONS,
+    "mask_type": constants.MASK_OPTIONS,
+    "vaccine_type": constants.VACCINE_OPTIONS,
+    "isolation_tendencies": constants.ISOLATION_OPTIONS,
+}
+CATEGORICAL_CODES = {name: {option: code for code, option in enumerate(options)}
+                     for name, options in CATEGORICAL_COLUMNS.items()}
+
+
+class AgentStore:
+    """A struct-of-arrays container holding the attributes of every agent in a population.
+
+    Each attribute of a person is stored as a single NumPy column, indexed by the row of
+    the agent. This avoids the overhead of one Python object per agent, and lets the hot
+    paths of the simulation read and write the state of many agents at once. Individual
+    agents can still be accessed through the :obj:`cv19.person.Person` view class.
+
+    Attributes
+    ----------
+    size : int
+        The number of rows (agents) held by the store.
+    columns : :obj:`tuple` of :obj:`str`
+        The names of all of the columns held by the store. Each column is also set as an
+        attribute of the store, as a :obj:`np.array` of length size.
+    """
+
+    def __init__(self, size, protocol_compliance=1.0):
+        """ __init__ method docstring.
+
+        Parameters
+        ----------
+        size : int
+            The number of agents to allocate storage for.
+        protocol_compliance : float
+            The default protocol compliance value of each agent.
+        """
+
+        self.size = size
+        self.defaults = {**BOOL_COLUMNS, **INT_COLUMNS, **FLOAT_COLUMNS,
+                         "protocol_compliance": protocol_compliance}
+
+        for name, default in BOOL_COLUMNS.items():
+            setattr(self, name, np.full(size, default, dtype=bool))
+        for name in OPTIONAL_INT_COLUMNS:
+            setattr(self, name, np.full(size, NULL_INT, dtype=np.int32))
+        for name, default in INT_COLUMNS.items():
+            setattr(self, name, np.full(size, default, dtype=np.int32))
+        for name in FLOAT_COLUMNS:
+            setattr(self, name, np.full(size, self.defaults[name], dtype=float))
+        for name in CATEGORICAL_COLUMNS:
+            setattr(self, name, np.full(size, NULL_ID, dtype=np.int8))
+        for name in OBJECT_COLUMNS:
+            setattr(self, name, np.full(size, None, dtype=object))
+
+        self.columns = (tuple(BOOL_COLUMNS) + OPTIONAL_INT_COLUMNS + tuple(INT_COLUMNS)
+                        + tuple(FLOAT_COLUMNS) + tuple(CATEGORICAL_COLUMNS) + OBJECT_COLUMNS)
+
+    def __len__(self):
+        return self.size
+
+    def get(self, name, row):
+        """Method to retrieve the value of a single agent attribute as a Python object.
+
+        Parameters
+        ----------
+        name : str
+            The name of the column.
+        row : int
+            The row of the agent in the store.
+
+        Returns
+        -------
+        value : :obj:`object`
+            The value of the attribute, where NULL_INT is returned as None. Categorical
+            attributes are decoded back into their string values.
+        """
+
+        column = getattr(self, name)
+        if column.dtype == object:
+            return column[row]
+
+        value = column.item(row)
+        if name in CATEGORICAL_COLUMNS:
+            return None if value == NULL_ID else CATEGORICAL_COLUMNS[name][value]
+        if name in OPTIONAL_INT_COLUMNS and value == NULL_INT:
+            return None
+        return value
+
+    def set(self, name, row, value):
+        """Method to set the value of a single agent attribute.
+
+        Parameters
+        ----------
+        name : str
+            The name of the column.
+        row : int
+            The row of the agent in the store.
+        value : :obj:`object`
+            The new value of the attribute. None is stored as NULL_INT in integer columns.
+            Categorical attributes are given as strings and stored as their code.
+        """
+
+        if name in CATEGORICAL_COLUMNS:
+            value = self.encode(name, value)
+        elif value is None and name in OPTIONAL_INT_COLUMNS:
+            value = NULL_INT
+        getattr(self, name)[row] = value
+
+    @staticmethod
+    def encode(name, value):
+        """Method to convert the string value of a categorical attribute to its integer code.
+
+        Parameters
+        ----------
+        name : str
+            The name of the categorical column.
+        value : str or None
+            The value of the attribute.
+
+        Returns
+        -------
+        code : int
+            The index of the value in the table for that column, or NULL_ID for None.
+        """
+
+        if value is None:
+            return NULL_ID
+        try:
+            return CATEGORICAL_CODES[name][value]
+        except KeyError as e:
+            raise ValueError(f"'{value}' is not a valid option for '{name}'.") from e
+
+    def reset(self, rows):
+        """Method to reset rows of the store to their default values.
+
+        Parameters
+        ----------
+        rows : :obj:`slice` or :obj:`np.array` of :obj:`int`
+            The rows to reset.
+        """
+
+        for name, default in self.defaults.items():
+            getattr(self, name)[rows] = default
+        for name in OPTIONAL_INT_COLUMNS:
+            getattr(self, name)[rows] = NULL_INT
+        for name in CATEGORICAL_COLUMNS:
+            getattr(self, name)[rows] = NULL_ID
+        for name in OBJECT_COLUMNS:
+            getattr(self, name)[rows] = None
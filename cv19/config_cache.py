@@ -0,0 +1,109 @@
+"""
+This file holds the process-level cache of parsed configuration and input data files,
+used by simulation.py, population.py and parallel.py.
+"""
+from copy import deepcopy
+from pathlib import Path
+import tomli
+
+# Parsed TOML files, keyed by resolved path. Each entry holds the modification time and size of
+# the file when it was parsed, the parsed data, and the tables derived from it keyed by the
+# function that built them.
+_toml_cache = {}
+
+
+def _load_entry(filename):
+    """Function to return the cache entry of a TOML file, parsing the file if it is new or has changed.
+
+    Parameters
+    ----------
+    filename : str or :obj:`pathlib.Path`
+        Path to the TOML file.
+
+    Returns
+    -------
+    entry : tuple
+        The (modification time, size) of the file, the parsed data and the derived tables.
+    """
+
+    path = Path(filename).resolve()
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    entry = _toml_cache.get(str(path))
+    if entry is None or entry[0] != stamp:
+        with open(path, 'rb') as file:
+            entry = (stamp, tomli.load(file), {})
+        # Replaces the entry of any older version of the file
+        _toml_cache[str(path)] = entry
+
+    return entry
+
+
+def load_toml(filename):
+    """Function to load a TOML file, parsing each file only once per process.
+
+    Files are cached by their resolved path, and parsed again when their modification time
+    or size changes. Each caller gets its own deep copy of the parsed data, which it is free
+    to change.
+
+    Parameters
+    ----------
+    filename : str or :obj:`pathlib.Path`
+        Path to the TOML file.
+
+    Returns
+    -------
+    data : dict
+        The parsed contents of the file.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    """
+
+    return deepcopy(_load_entry(filename)[1])
+
+
+def load_table(filename, build):
+    """Function to load a table derived from a TOML file, building each table only once per process.
+
+    The table is cached along with the parsed file, and built again when the file changes.
+    Unlike load_toml, every caller gets the same table, so the arrays of the table are made
+    read only.
+
+    Parameters
+    ----------
+    filename : str or :obj:`pathlib.Path`
+        Path to the TOML file.
+    build : callable
+        Function building the table from the parsed contents of the file, without changing them.
+        It returns a :obj:`np.array` or a tuple of them.
+
+    Returns
+    -------
+    table : :obj:`np.array` or tuple of :obj:`np.array`
+        The table built from the file.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    """
+
+    _, data, tables = _load_entry(filename)
+
+    if build not in tables:
+        table = build(data)
+        for array in table if isinstance(table, tuple) else (table,):
+            array.setflags(write=False)
+        tables[build] = table
+
+    return tables[build]
+
+
+def clear_cache():
+    """Function to empty the cache of parsed files."""
+
+    _toml_cache.clear()
@@ -0,0 +1,131 @@
+"""
+This file holds the contact log used by population.py and interaction_sites.py to record contacts for contact tracing.
+"""
+import numpy as np
+
+from .agent_store import NULL_INT
+
+
+class ContactLog:
+    """A log of the contacts made between agents over the last few days, held in integer arrays.
+
+    The log holds one slot for each day it keeps, used as a ring buffer: the slot of a day is
+    emptied and reused once that day is too old to be kept. Each slot holds the two agents of
+    every contact made on its day, and whether or not the contact was personal. A contact is
+    held once, and is found from either of its two agents. The memory used by the log depends
+    on the number of contacts made over the days kept, and not on the length of the simulation.
+
+    Attributes
+    ----------
+    n_days : int
+        The number of days of contacts kept by the log.
+    days : :obj:`np.array` of :obj:`int`
+        The day held by each slot, or NULL_INT for a slot that has not been used.
+    sizes : :obj:`np.array` of :obj:`int`
+        The number of contacts held by each slot.
+    first : :obj:`list` of :obj:`np.array` of :obj:`int`
+        The first agent of each contact, for each slot. Only the first sizes[slot] entries are used.
+    second : :obj:`list` of :obj:`np.array` of :obj:`int`
+        The second agent of each contact, for each slot.
+    personal : :obj:`list` of :obj:`np.array` of :obj:`bool`
+        Whether or not each contact was personal, for each slot.
+    """
+
+    def __init__(self, n_days):
+        """ __init__ method docstring.
+
+        Parameters
+        ----------
+        n_days : int
+            The number of days of contacts kept by the log.
+        """
+
+        self.n_days = max(int(n_days), 1)
+        self.days = np.full(self.n_days, NULL_INT, dtype=int)
+        self.sizes = np.zeros(self.n_days, dtype=int)
+        self.first = [np.zeros(0, dtype=np.int32) for _ in range(self.n_days)]
+        self.second = [np.zeros(0, dtype=np.int32) for _ in range(self.n_days)]
+        self.personal = [np.zeros(0, dtype=bool) for _ in range(self.n_days)]
+
+    def log(self, day, first, second, personal=False):
+        """Method to log the contacts made between pairs of agents on a day.
+
+        Days must be logged in order, as logging a day replaces the oldest day kept.
+
+        Parameters
+        ----------
+        day : int
+            Current day in the simulation.
+        first : :obj:`np.array` of :obj:`int`
+            The first agent of each contact.
+        second : :obj:`np.array` of :obj:`int`
+            The second agent of each contact.
+        personal : bool, default False
+            Whether or not the people of the contacts know each other.
+        """
+
+        slot = day % self.n_days
+        if self.days[slot] != day:
+            self.days[slot] = day
+            self.sizes[slot] = 0
+
+        start, end = self.sizes[slot], self.sizes[slot] + len(first)
+        if end > len(self.first[slot]):
+            # Grow the arrays of the slot, doubling their size to keep the cost of logging constant
+            capacity = max(end, 2 * len(self.first[slot]))
+            for arrays in (self.first, self.second, self.personal):
+                grown = np.zeros(capacity, dtype=arrays[slot].dtype)
+                grown[:start] = arrays[slot][:start]
+                arrays[slot] = grown
+
+        self.first[slot][start:end] = first
+        self.second[slot][start:end] = second
+        self.personal[slot][start:end] = personal
+        self.sizes[slot] = end
+
+    def get_log(self, beginning, end):
+        """Method to retrieve every contact logged over a range of days.
+
+        Parameters
+        ----------
+        beginning : int
+            The first day to include.
+        end : int
+            The day after the last day to include.
+
+        Returns
+        -------
+        first : :obj:`np.array` of :obj:`int`
+        second : :obj:`np.array` of :obj:`int`
+        personal : :obj:`np.array` of :obj:`bool`
+        """
+
+        slots = np.flatnonzero((self.days >= beginning) & (self.days < end)).tolist()
+        return tuple(np.concatenate([arrays[slot][:self.sizes[slot]] for slot in slots])
+                     if slots else np.zeros(0, dtype=arrays[0].dtype)
+                     for arrays in (self.first, self.second, self.personal))
+
+    def get_contacts(self, index, beginning, end, personal_only=False):
+        """Method to retrieve the union of the contacts of an agent over a range of days.
+
+        Parameters
+        ----------
+        index : int
+            The index of the agent.
+        beginning : int
+            The first day to include.
+        end : int
+            The day after the last day to include.
+        personal_only : bool, default False
+            Whether or not to only include personal contacts.
+
+        Returns
+        -------
+        contacts : :obj:`set` of :obj:`int`
+            The population indices of all contacts over the range of days.
+        """
+
+        first, second, personal = self.get_log(beginning, end)
+        if personal_only:
+            first, second = first[personal], second[personal]
+        return set(second[first == index].tolist()) | set(first[second == index].tolist())
@@ -7,3 +7,6 @@ MASK_OPTIONS = ["Surgical", "Non-surgical"]
 HOUSE_OPTIONS = ["1", "2", "3", "4", "5"]
 ISOLATION_OPTIONS = ["0.1", "0.2", "0.3", "0.4", "0.5", "0.6", "0.7", "0.8", "0.9", "1"]
 VACCINE_OPTIONS = ["Pfizer", "Moderna", "AZ"]
+
+# Jobs that are not drawn from the job weights, but set directly for students and visitors
+ALL_JOB_OPTIONS = JOB_OPTIONS + ["Student", "Visitor"]
@@ -0,0 +1,99 @@
+"""
+This file holds the event calendar used by population.py to schedule state changes of agents.
+"""
+import numpy as np
+
+
+class EventCalendar:
+    """A calendar of agent events, bucketed by the day they are due.
+
+    Each type of event has its own calendar, holding one bucket (a list of agent indices)
+    for every day that has an event due. Events that are due before the first day that has
+    not been processed yet are placed in the bucket of that day, so that no event is missed.
+    Every day, only the buckets that are due need to be looked at, so the cost of a day
+    depends on the number of events due and not on the size of the population.
+
+    Events are never removed once scheduled. The state of an agent should be checked when
+    their event is processed, as it may have changed since the event was scheduled.
+
+    Attributes
+    ----------
+    buckets : :obj:`dict` of :obj:`dict` of :obj:`list` of :obj:`int`
+        The agent indices with an event due, by type of event and then by day.
+    next_day : :obj:`dict` of :obj:`int`
+        The first day that has not been processed yet, for each type of event.
+    """
+
+    def __init__(self, events):
+        """ __init__ method docstring.
+
+        Parameters
+        ----------
+        events : :obj:`iterable` of :obj:`str`
+            The names of the types of events held by the calendar.
+        """
+
+        self.buckets = {event: {} for event in events}
+        self.next_day = dict.fromkeys(self.buckets, 0)
+
+    def schedule(self, event, day, index):
+        """Method to schedule an event for an agent.
+
+        Parameters
+        ----------
+        event : str
+            The type of event.
+        day : int
+            The day the event is due.
+        index : int
+            The index of the agent.
+        """
+
+        day = max(day, self.next_day[event])
+        self.buckets[event].setdefault(day, []).append(index)
+
+    def schedule_many(self, event, days, indices):
+        """Method to schedule an event for many agents at once.
+
+        Parameters
+        ----------
+        event : str
+            The type of event.
+        days : :obj:`np.array` of :obj:`int`
+            The day the event is due for each agent.
+        indices : :obj:`np.array` of :obj:`int`
+            The indices of the agents.
+        """
+
+        days = np.maximum(days, self.next_day[event])
+
+        # Group the agents by day, so that each bucket is only extended once
+        order = np.argsort(days, kind="stable")
+        days, indices = days[order], indices[order]
+        unique_days, starts = np.unique(days, return_index=True)
+
+        buckets = self.buckets[event]
+        for day, group in zip(unique_days.tolist(), np.split(indices, starts[1:])):
+            buckets.setdefault(day, []).extend(group.tolist())
+
+    def pop_due(self, event, day):
+        """Method to remove and return every event of a type that is due on or before a day.
+
+        Parameters
+        ----------
+        event : str
+            The type of event.
+        day : int
+            The day being processed.
+
+        Returns
+        -------
+        indices : :obj:`np.array` of :obj:`int`
+            The indices of the agents with an event due, in the order they were scheduled.
+        """
+
+        buckets = self.buckets[event]
+        due = [buckets.pop(d) for d in range(self.next_day[event], day + 1) if d in buckets]
+        self.next_day[event] = max(self.next_day[event], day + 1)
+
+        return np.fromiter((index for bucket in due for index in bucket), dtype=int)
@@ -2,13 +2,17 @@
 This file holds the interaction sites class used in simulation.py.
 """
 import warnings
-from random import random
 from copy import deepcopy
-from itertools import combinations
-from math import comb
 
 import numpy as np
 
+from .data import constants
+from .agent_store import AgentStore
+from .site_membership import SiteMembership
+
+# Number of times the stubs of people paired with themselves are reshuffled before those pairs are dropped
+MAX_PAIRING_ROUNDS = 10
+
 
 class InteractionSites:
     """A class designed to host interactions between persons within specific locations.
@@ -22,27 +26,27 @@ class InteractionSites:
 
     Attributes
     ----------
-    grade_A_sites : :obj:`np.array` of :obj:`list` of :obj:`np.array` of :obj:`int`
+    grade_A_sites : :obj:`cv19.site_membership.SiteMembership`
         Designed to represent resturants, gas stations, retail stores, etc. Any location where you
         do not visit often, but attend a wide variety of them.
-    grade_B_sites : :obj:`np.array` of :obj:`list` of :obj:`np.array` of :obj:`int`
+    grade_B_sites : :obj:`cv19.site_membership.SiteMembership`
         Designed to represent a gym, grocery store, etc. Any location where
         you visit semi-often, and are likly to visit the same one, but this may varry.
-    grade_C_sites : :obj:`np.array` of :obj:`list` of :obj:`np.array` of :obj:`int`
+    grade_C_sites : :obj:`cv19.site_membership.SiteMembership`
         Designed to represent offices or schools. Any location where they are
         visited almost every workday, and you almost always visit the same one.
     house_sites : :obj:`np.array` of :obj:`list` of :obj:`int`
         Visited by every person each day, and hosts interactions between members
         of the same household. Infection spread at home is not defined by explicit contacts,
         but by a known spread factor.
-    lect_sites : :obj:`np.array` of :obj:`list` of :obj:`np.array` of :obj:`int`
+    lect_sites : :obj:`cv19.site_membership.SiteMembership`
         Designed to replicate university lecture hall interactions. They are only visited by students.
-    study_sites : :obj:`np.array` of :obj:`list` of :obj:`np.array` of :obj:`int`
+    study_sites : :obj:`cv19.site_membership.SiteMembership`
         Designed to replicate study environments at university, on-campus (library, bookable rooms, ...).
         They are only visited by students.
-    food_sites : :obj:`np.array` of :obj:`list` of :obj:`np.array` of :obj:`int`
+    food_sites : :obj:`cv19.site_membership.SiteMembership`
         Designed to replicate cafeteria and restaurant interactions on-campus. Only visited by students.
-    res_sites : :obj:`list` of :obj:`np.array` of :obj:`int`
+    res_sites : :obj:`cv19.site_membership.SiteMembership`
         Designed to replicate the student residences on campus. They are only visited by first year students.
     stud_house_sites : :obj:`np.array` of :obj:`list` of :obj:`int`
         Visited by every student each day, and hosts interactions between members
@@ -73,10 +77,12 @@ class InteractionSites:
         self.grade_C_sites = self.init_grade(grade_code="C")
         self.house_sites = deepcopy(self.pop.household)
         self.house_indices = deepcopy(self.pop.house_ppl_i)
+        self.house_members = self.init_houses(self.house_indices)
 
         # Students Stuff #
         self.stud_house_sites = deepcopy(self.pop.stud_houses)
         self.stud_house_indices = deepcopy(self.pop.house_stud_i)
+        self.stud_house_members = self.init_houses(self.stud_house_indices)
         self.lect_sites = self.init_uni(grade_code="LECT")
         self.study_sites = self.init_uni(grade_code="STUDY")
         self.food_sites = self.init_uni(grade_code="FOOD")
@@ -96,6 +102,8 @@ class InteractionSites:
             The encompassing simulation obejct hosting the simulation.
         """
 
+        self.rng = sim_obj.rng  # random number generator of the simulation
+
         attributes = sim_obj.parameters["interaction_sites_data"].keys()
         for attr in attributes:
             setattr(self, attr, sim_obj.parameters["interaction_sites_data"][attr])
@@ -109,6 +117,19 @@ class InteractionSites:
         self.variant_codes = sim_obj.variant_codes
         self.variant_code_map = {v_id: v_name for v_name, v_id in self.variant_codes.items()}  # virus ids
 
+        # Lookup arrays for the transmission kernel, indexed by virus, mask and vaccine type codes.
+        # Types without a value are NaN, and raise an error if they are used.
+        self.spread_prob_by_variant = np.full(max(self.variant_codes.values()) + 1, np.nan)
+        for v_name, v_id in self.variant_codes.items():
+            self.spread_prob_by_variant[v_id] = self.base_infection_spread_prob.get(v_name, np.nan)
+        self.mask_inward_eff_by_type = np.array([sim_obj.mask_inward_eff.get(mask_type, np.nan)
+                                                 for mask_type in constants.MASK_OPTIONS])
+        self.mask_outward_eff_by_type = np.array([sim_obj.mask_outward_eff.get(mask_type, np.nan)
+                                                  for mask_type in constants.MASK_OPTIONS])
+        self.vaccine_eff_by_type = np.array([sim_obj.vaccine_eff.get(vaccine_type, np.nan)
+                                             for vaccine_type in constants.VACCINE_OPTIONS])
+        self.wear_mask_properly = sim_obj.wear_mask_properly
+
         # Set the actual objects now
         self.pop = sim_obj.pop
         self.policy = sim_obj.policy
@@ -128,33 +149,20 @@ class InteractionSites:
 
         Returns
         -------
-        grade_sites : :obj:`np.array` of :obj:`np.array` of :obj:`int`
-            An array holding one array for each interaction site of this type. Each nested
-            array holds the index of people that are associated with that site (can visit it).
+        grade_sites : :obj:`cv19.site_membership.SiteMembership`
+            The people that are associated with each interaction site of this type (can visit it).
         """
 
-        loyalty_mean = self.grade_loyalty_means[grade_code]
-        loyalty_std = self.grade_loyalty_stds[grade_code]
         students_interact = self.students_participate[grade_code]
 
-        # Calculate number of sites
-        num_sites = self.calculate_num_sites(grade_code=grade_code)
-        grade_sites = [[] for _ in range(num_sites)]
-
-        for person in self.pop.get_population():
-            if students_interact or not (self.students_on and person.job == 'Student'):
-                # if students are meant to go to this site
-                # Assign people to this specific site
-                num_diff_sites = abs(round(np.random.normal(loyalty_mean, loyalty_std)))
-                num_diff_sites = num_diff_sites if num_diff_sites <= num_sites else num_sites
-                # Get a list of len num_diff_sites for this person to be associated with now
-                person_sites = np.random.choice(num_sites, num_diff_sites, replace=False)
-                for site in person_sites:
-                    # Assign this person to that site
-                    grade_sites[site].append(person.get_index())
-
-        # Convert everything to numpy arrays
-        grade_sites = [np.asarray(site) for site in grade_sites]
+        # Find the people that are meant to go to this site
+        if students_interact or not self.students_on:
+            people = np.arange(self.pop.get_population_size())
+        else:
+            is_student = self.pop.agents.job[:self.pop.get_population_size()] == AgentStore.encode("job", "Student")
+            people = np.flatnonzero(~is_student)
+
+        grade_sites = self.assign_sites(people, grade_code)
 
         # Initialize the number of interactions dictionary
         self.daily_interactions[grade_code] = np.zeros(self.nDays)
@@ -174,31 +182,12 @@ class InteractionSites:
 
         Returns
         -------
-        grade_sites : :obj:`np.array` of :obj:`np.array` of :obj:`int`
-            An array holding one array for each interaction site of this type. Each nested
-            array holds the index of people that are associated with that site (can visit it).
+        grade_sites : :obj:`cv19.site_membership.SiteMembership`
+            The people that are associated with each interaction site of this type (can visit it).
         """
 
-        loyalty_mean = self.grade_loyalty_means[grade_code]
-        loyalty_std = self.grade_loyalty_stds[grade_code]
-
-        # Calculate number of sites
-        num_sites = self.calculate_num_sites(grade_code=grade_code)
-        grade_sites = [[] for _ in range(num_sites)]
-
-        for student in self.pop.get_population():
-            if student.job == 'Student':
-                # Assign people to this specific site
-                num_diff_sites = abs(round(np.random.normal(loyalty_mean, loyalty_std)))
-                num_diff_sites = num_diff_sites if num_diff_sites <= num_sites else num_sites
-                # Get a list of len num_diff_sites for this person to be associated with now
-                student_sites = np.random.choice(num_sites, num_diff_sites, replace=False)
-                for site in student_sites:
-                    # Assign this person to that site
-                    grade_sites[site].append(student.get_index())
-
-        # Convert everything to numpy arrays
-        grade_sites = [np.asarray(site) for site in grade_sites]
+        is_student = self.pop.agents.job[:self.pop.get_population_size()] == AgentStore.encode("job", "Student")
+        grade_sites = self.assign_sites(np.flatnonzero(is_student), grade_code)
 
         # Initialize the number of interactions dictionary
         self.daily_interactions[grade_code] = np.zeros(self.nDays)
@@ -218,37 +207,72 @@ class InteractionSites:
 
         Returns
         -------
-        grade_sites : :obj:`np.array` of :obj:`np.array` of :obj:`int`
-            An array holding one array for each interaction site of this type. Each nested
-            array holds the index of people that are associated with that site (can visit it)
+        grade_sites : :obj:`cv19.site_membership.SiteMembership`
+            The people that are associated with each interaction site of this type (can visit it).
         """
 
-        loyalty_mean = self.grade_loyalty_means[grade_code]
-        loyalty_std = self.grade_loyalty_stds[grade_code]
+        # Students living in the residences
+        rooms = [self.stud_house_indices[room] for room in self.pop.get_residences()]
+        people = np.concatenate(rooms).astype(int) if rooms else np.zeros(0, dtype=int)
 
-        # Calculate number of sites
-        num_sites = self.calculate_num_sites(grade_code=grade_code)
-        grade_sites = [[] for _ in range(num_sites)]
-
-        for room in self.pop.get_residences():
-            for student_i in self.stud_house_indices[room]:
-                # Assign people to this specific site
-                num_diff_sites = abs(round(np.random.normal(loyalty_mean, loyalty_std)))
-                num_diff_sites = num_diff_sites if num_diff_sites <= num_sites else num_sites
-                # Get a list of len num_diff_sites for this person to be associated with now
-                student_sites = np.random.choice(num_sites, num_diff_sites, replace=False)
-                for site in student_sites:
-                    # Assign this person to that site
-                    grade_sites[site].append(student_i)
-
-        # Convert everything to numpy arrays
-        grade_sites = [np.asarray(site) for site in grade_sites]
+        grade_sites = self.assign_sites(people, grade_code)
 
         # Initialize the number of interactions dictionary
         self.daily_interactions[grade_code] = np.zeros(self.nDays)
 
         return grade_sites
 
+    def assign_sites(self, people, grade_code):
+        """Method to associate people with the interaction sites of a grade.
+
+        Each person is associated with a number of different sites drawn from the loyalty
+        distribution of the grade, with the sites chosen uniformly without replacement.
+        All of the draws are done in bulk: every site is first drawn with replacement, and the
+        repeated sites of each person are then redrawn until all of their sites are different.
+
+        Parameters
+        ----------
+        people : :obj:`np.array` of :obj:`int`
+            The indices of the people to associate with the sites.
+        grade_code : str
+            Code used to index the values to create this type of site from the config file.
+
+        Returns
+        -------
+        grade_sites : :obj:`cv19.site_membership.SiteMembership`
+        """
+
+        num_sites = self.calculate_num_sites(grade_code=grade_code)
+
+        # Number of different sites for each person
+        num_diff_sites = np.abs(np.round(self.rng.normal(self.grade_loyalty_means[grade_code],
+                                                         self.grade_loyalty_stds[grade_code],
+                                                         size=len(people)))).astype(int)
+        np.minimum(num_diff_sites, num_sites, out=num_diff_sites)
+
+        # One row of sites per person, of which the first num_diff_sites are used
+        max_diff_sites = num_diff_sites.max(initial=0)
+        chosen = np.arange(max_diff_sites) < num_diff_sites[:, None]
+        person_sites = np.where(chosen, self.rng.integers(max(num_sites, 1), size=chosen.shape),
+                                -1 - np.arange(max_diff_sites))
+
+        # Redraw repeated sites until the sites of each person are all different
+        rows = np.arange(len(people)) if max_diff_sites > 1 else np.zeros(0, dtype=int)
+        while len(rows) > 0:
+            order = np.argsort(person_sites[rows], axis=1, kind="stable")
+            sorted_sites = np.take_along_axis(person_sites[rows], order, axis=1)
+            repeat_row, repeat_col = np.nonzero(sorted_sites[:, 1:] == sorted_sites[:, :-1])
+            repeat_col = order[repeat_row, repeat_col + 1]
+            person_sites[rows[repeat_row], repeat_col] = self.rng.integers(num_sites, size=len(repeat_row))
+            rows = np.unique(rows[repeat_row])
+
+        sites = SiteMembership.from_pairs(person_sites[chosen], np.repeat(people, num_diff_sites),
+                                          num_sites, self.pop.get_population_size())
+
+        # Build the person to site index once, as will_visit_site uses it every day
+        sites.get_transposed()
+        return sites
+
     def daily_reset(self):
         """Method used to reset the interaction sites at the end of each day.
 
@@ -267,6 +291,24 @@ class InteractionSites:
         self.remove_dead()
         self.daily_new_infections = 0
 
+    def init_houses(self, house_indices):
+        """Method to hold the members of a type of house in the same layout as the interaction sites.
+
+        Parameters
+        ----------
+        house_indices : :obj:`list` of :obj:`np.array` of :obj:`int`
+            The indices of the people living in each house.
+
+        Returns
+        -------
+        house_members : :obj:`cv19.site_membership.SiteMembership`
+        """
+
+        house_sizes = [len(house) for house in house_indices]
+        return SiteMembership(np.concatenate(([0], np.cumsum(house_sizes, dtype=int))),
+                              np.concatenate(house_indices) if house_indices else np.zeros(0, dtype=int),
+                              self.pop.get_population_size())
+
     def calculate_num_sites(self, grade_code):
         """Method used to calculate the number of sites for an interaction site grade.
 
@@ -292,8 +334,8 @@ class InteractionSites:
     def remove_dead(self):
         """Method to remove dead agents from interaction site arrays.
 
-        Iterates through each type of site array, and will remove all agents that are
-        dead from each array.
+        Removes the agents that died since the last reset from the membership of each
+        type of site, using the person to site index. Does nothing on days without deaths.
 
         Parameters
         ----------
@@ -304,101 +346,54 @@ class InteractionSites:
         None
         """
 
-        # Create list of all dead agents
-        dead_agents = self.pop.get_dead()
-
-        # Site type A
-        for i, site_array in enumerate(self.grade_A_sites):
-            # Mask where True indicates alive and False indicates dead (note the invert argument)
-            mask_alive = np.isin(site_array, dead_agents, invert=True)
-            self.grade_A_sites[i] = site_array[mask_alive]
-
-        # Site type B
-        for i, site_array in enumerate(self.grade_B_sites):
-            mask_alive = np.isin(site_array, dead_agents, invert=True)
-            self.grade_B_sites[i] = site_array[mask_alive]
-
-        # Site type C
-        for i, site_array in enumerate(self.grade_C_sites):
-            mask_alive = np.isin(site_array, dead_agents, invert=True)
-            self.grade_C_sites[i] = site_array[mask_alive]
-
-        # Site type lecture
-        for i, site_array in enumerate(self.lect_sites):
-            mask_alive = np.isin(site_array, dead_agents, invert=True)
-            self.lect_sites[i] = site_array[mask_alive]
-
-        # Site type study
-        for i, site_array in enumerate(self.study_sites):
-            mask_alive = np.isin(site_array, dead_agents, invert=True)
-            self.study_sites[i] = site_array[mask_alive]
-
-        # Site type food
-        for i, site_array in enumerate(self.food_sites):
-            mask_alive = np.isin(site_array, dead_agents, invert=True)
-            self.food_sites[i] = site_array[mask_alive]
-
-        # Site type res
-        for i, site_array in enumerate(self.res_sites):
-            mask_alive = np.isin(site_array, dead_agents, invert=True)
-            self.res_sites[i] = site_array[mask_alive]
+        # Only the agents that died since the last reset need to be removed
+        new_dead = self.pop.pop_new_dead()
+        if len(new_dead) == 0:
+            return
+
+        for grade_sites in (self.grade_A_sites, self.grade_B_sites, self.grade_C_sites,
+                            self.lect_sites, self.study_sites, self.food_sites, self.res_sites):
+            grade_sites.remove(new_dead)
 
     def will_visit_site(self, site_array, will_go_prob):
         """Method to determine who will visit a site on a given day.
 
-        Generates a boolean list for each individual interaction site in site_array,
-        indicating what people from the list will visit that site on a given day. Accounts
-        for quarantined people by setting their will_go_prob value to
+        Decides which of the people associated with site_array go out to this type of site
+        on a given day, and picks one of their associated sites at random for each of them.
+        Accounts for quarantined people by setting their will_go_prob value to
         self.quarantine_isolation_factor.
 
         Parameters
         ----------
-        site_array : :obj:`np.array` of :obj:`np.array` of :obj:`int`
-            An array holding lists (one for each interaction site) of the index of each person
-            associated with each of the individual sites.
+        site_array : :obj:`cv19.site_membership.SiteMembership`
+            The people associated with each of the individual sites.
         will_go_prob : float
             The probability that any given person in site_array will visit this type of site.
 
         Returns
         -------
-        will_visit_grade : :obj:`np.array` of :obj:`np.array` of :obj:`int`
-            An array holding an array for each site of this interaction site type.
-            Each individual list holds the indexes of people that will visit that site for this day.
+        will_visit_grade : :obj:`cv19.site_membership.SiteMembership`
+            The people that will visit each site of this interaction site type for this day.
         """
 
         # Figure out who is going to go to this site type today.
-        person_ids = np.unique(np.concatenate(site_array))
+        person_ids = site_array.members()
 
         # Create array of attendence probabilities.
-        prob_attendence = [self.quarantine_isolation_factor
-                           if self.pop.get_person(person).is_quarantined() else will_go_prob
-                           for person in person_ids]
+        prob_attendence = np.where(self.pop.agents.quarantined[person_ids],
+                                   self.quarantine_isolation_factor, will_go_prob)
 
         # Select a subset of people who will actually choose to go to the site.
-        person_will_go_mask = np.random.binomial(1, p=prob_attendence).astype(bool)
+        person_will_go_mask = self.rng.binomial(1, p=prob_attendence).astype(bool)
         person_ids = person_ids[person_will_go_mask]
 
-        # Create a Boolean array of people (rows) and sites (columns).
-        # Each entry corresponds to whether or not
-        # a given person can go to the given site.
-        person_site_array = np.zeros(shape=(person_ids.shape[0], len(site_array)), dtype=bool)
-        for s, site in enumerate(site_array):
-            mask = np.isin(person_ids, site)
-            person_site_array[mask, s] = True
+        # Choose one of the sites associated with each person, with the person to site index.
+        first_site = site_array.person_indptr[person_ids]
+        num_person_sites = site_array.person_indptr[person_ids + 1] - first_site
+        person_site_index = site_array.person_sites[first_site + self.rng.integers(low=0, high=num_person_sites)]
 
-        # Choose a random number for each person,
-        # with an upper bound as the number of available sites for that person.
-        high = person_site_array.sum(axis=-1)
-        random_site_index = np.random.randint(low=0, high=high)
-
-        # argsort the array (descending) along sites and use random number above to select
-        # one of the available sites (first sites up to high[i] are available for person i).
-        site_indexes_argsorted = np.argsort(person_site_array, axis=-1)[..., ::-1]
-        person_site_index = site_indexes_argsorted[np.arange(site_indexes_argsorted.shape[0]),
-                                                   random_site_index]
-
-        will_visit_grade = [person_ids[np.where(person_site_index == s)[0]]
-                            for s in range(len(site_array))]
+        # Group the people by the site they chose
+        will_visit_grade = SiteMembership.from_pairs(person_site_index, person_ids, len(site_array), site_array.n_people)
 
         return will_visit_grade
 
@@ -412,9 +407,8 @@ class InteractionSites:
 
         Parameters
         ----------
-        will_go_array : :obj:`np.array` of :obj:`np.array` of :obj:`int`
-            An array holding an array for each site of this interaction site type. Each individual list
-            holds the indexes of people that will visit that site for this day.
+        will_go_array : :obj:`cv19.site_membership.SiteMembership`
+            The people that will visit each site of this interaction site type for this day.
         day : int
             The day value that this function is being called on in the encompassing simulation class.
             Used as input to the infect function after infections have been determined.
@@ -428,68 +422,54 @@ class InteractionSites:
         new_infections = np.zeros(self.pop.get_population_size(), dtype=bool)
         new_infection_type = np.zeros(self.pop.get_population_size(), dtype=int)
 
-        total_interactions_count = 0
-
-        for ppl_going in will_go_array:
-
-            infected_persons = [index for index in ppl_going if self.pop.get_person(index).is_infected()]
-            recovered_persons = [index for index in ppl_going if self.pop.get_person(index).is_recovered()]
-
-            # Generate a list of how many interactions ppl have at the site
-            num_interactions = self.calc_interactions(site_day_pop=len(ppl_going))
-            total_interactions_count += np.sum(num_interactions) // 2
-
-            if len(infected_persons) == 0 or (len(infected_persons) + len(recovered_persons) == len(ppl_going)):
-                continue  # No ppl to infect here or no one already infected
-
-            while np.sum(num_interactions > 0) > 1:
-                # grab the highest interactor
-                person_1 = np.argmax(num_interactions)
-                # find a random interactor for them to pair with (that is not them)
-                person_2 = np.random.randint(num_interactions.shape[0])
-                while person_2 == person_1 or num_interactions[person_2] <= 0:
-                    person_2 = np.random.randint(num_interactions.shape[0])
-
-                # Get the actual people at these indexes
-                person_1_index = ppl_going[person_1]
-                person_2_index = ppl_going[person_2]
-
-                # Getting the Person objects and logging the contacts
-                p1_obj = self.pop.get_person(person_1_index)
-                p2_obj = self.pop.get_person(person_2_index)
-                p1_obj.log_contact(p2_obj, day=day, personal=personal)
-                p2_obj.log_contact(p1_obj, day=day, personal=personal)
-
-                # Check to make sure one is infected
-                person_1_infected = p1_obj.is_infected()
-                person_2_infected = p2_obj.is_infected()
-
-                if person_1_infected != person_2_infected:
-                    # Have an interaction between those people
-                    did_infect = self.interact(p1_obj, p2_obj)
-                    if did_infect:
-                        if person_1_infected:
-                            new_infections[person_2_index] = True
-                            new_infection_type[person_2_index] = self.pop.get_person(person_1_index).get_virus_type()
-                        else:
-                            new_infections[person_1_index] = True
-                            new_infection_type[person_1_index] = self.pop.get_person(person_2_index).get_virus_type()
-
-                # Lower the interaction count for those people
-                num_interactions[person_1] -= 1
-                num_interactions[person_2] -= 1
+        agents = self.pop.agents
+
+        # Count the infected and susceptible people at every site in one pass, to find the
+        # sites where the infection can spread
+        site_of_visitor = will_go_array.site_of_entries()
+        visitors = will_go_array.indices
+        n_infected = np.bincount(site_of_visitor, weights=agents.infected[visitors], minlength=len(will_go_array))
+        n_susceptible = np.bincount(site_of_visitor, weights=~(agents.infected[visitors] | agents.recovered[visitors]),
+                                    minlength=len(will_go_array))
+        can_spread = (n_infected > 0) & (n_susceptible > 0)
+
+        # Generate how many interactions ppl have at every site at once
+        num_interactions = self.calc_interactions(site_day_pop=np.diff(will_go_array.indptr))
+        site_interactions = np.bincount(site_of_visitor, weights=num_interactions, minlength=len(will_go_array))
+        total_interactions_count = int(np.sum(site_interactions // 2))
+
+        # Only the sites with ppl to infect and someone already infected are paired up
+        for site in np.flatnonzero(can_spread).tolist():
+            ppl_going = will_go_array[site]
+            site_num_interactions = num_interactions[will_go_array.indptr[site]:will_go_array.indptr[site + 1]]
+
+            pairs = ppl_going[self.pair_interactions(site_num_interactions)]
+
+            # Logging the contacts, which are only needed for contact tracing
+            if self.pop.ct_enabled:
+                self.pop.contact_log.log(day, pairs[:, 0], pairs[:, 1], personal=personal)
+
+            # Only pairs where exactly one person is infected can spread the infection
+            pairs_infected = agents.infected[pairs]
+            pairs = pairs[pairs_infected[:, 0] != pairs_infected[:, 1]]
+            first_infected = agents.infected[pairs[:, 0]]
+            infectors = np.where(first_infected, pairs[:, 0], pairs[:, 1])
+            susceptibles = np.where(first_infected, pairs[:, 1], pairs[:, 0])
+
+            did_infect = self.transmit(infectors, susceptibles)
+            new_infections[susceptibles[did_infect]] = True
+            new_infection_type[susceptibles[did_infect]] = agents.virus_type[infectors[did_infect]]
 
         #  Update people who get infected only at the end. Assuming if I get CV19 at work, I probably won't spread at the store that night.
         new_infection_indexes = np.where(new_infections)[0]
         self.daily_new_infections += len(new_infection_indexes)
-        for new_infection in new_infection_indexes:
-            self.pop.infect(index=new_infection, virus_type=new_infection_type[new_infection], day=day)
+        self.pop.infect_many(new_infection_indexes, new_infection_type[new_infection_indexes], day)
 
         # Update total daily interactions count
         self.daily_interactions[grade_code][day] = total_interactions_count
 
     def calc_interactions(self, site_day_pop):
-        """Method to determine how many interactions a person will have.
+        """Method to determine how many interactions each person at the sites of a grade will have.
 
         Note
         ----
@@ -503,28 +483,68 @@ class InteractionSites:
         adjusted between simulations. If the need is felt for an adjustable scaling factor, a new (second)
         variable should be introduced.
 
+        The numbers for all of the sites are drawn at once, with the right edge of the distribution
+        given per person by the population of their site.
+
         Parameters
         ----------
-        site_day_pop : `int`
-            The total number of people at that specific interaction site this day.
+        site_day_pop : :obj:`np.array` of :obj:`int`
+            The total number of people at each interaction site this day.
 
         Returns
         -------
         number_of_interactions : :obj:`np.array` of :obj:`int`
-            The number of interactions all people will have within this interaction site.
+            The number of interactions all people will have within their interaction site,
+            site after site.
         """
 
         day_hours_scaler = 12
 
-        if site_day_pop == 0:
-            return np.array([])
-        else:
-            # Generate a linaer distribution from
-            number_of_interactions = np.round(np.random.triangular(left=0, mode=0, right=site_day_pop / day_hours_scaler,
-                                                                   size=site_day_pop)).astype(int)
+        site_day_pop = np.asarray(site_day_pop, dtype=int)
+        right = np.repeat(site_day_pop / day_hours_scaler, site_day_pop)
+        if len(right) == 0:
+            return np.zeros(0, dtype=int)
+
+        # Generate a linear distribution for every person at once
+        number_of_interactions = np.rint(self.rng.triangular(left=0, mode=0, right=right)).astype(int)
 
         return number_of_interactions
 
+    def pair_interactions(self, num_interactions):
+        """Method to pair up the people at a site so that each has their number of interactions.
+
+        Uses stub matching: each person gets one stub per interaction, and the shuffled stubs
+        are paired up in order. Pairs of a person with themselves are reshuffled together with
+        as many other pairs, up to MAX_PAIRING_ROUNDS times, and dropped if they remain. With an
+        odd number of stubs, one is left out. Two people can be paired more than once.
+
+        Parameters
+        ----------
+        num_interactions : :obj:`np.array` of :obj:`int`
+            The number of interactions each person at the site will have.
+
+        Returns
+        -------
+        pairs : :obj:`np.array` of :obj:`int`
+            An array of shape (n_pairs, 2) holding the positions in num_interactions of the two
+            people of each interaction.
+        """
+
+        stubs = np.repeat(np.arange(len(num_interactions)), num_interactions)
+        self.rng.shuffle(stubs)
+        pairs = stubs[:len(stubs) - len(stubs) % 2].reshape(-1, 2)
+
+        for _ in range(MAX_PAIRING_ROUNDS):
+            self_pairs = np.flatnonzero(pairs[:, 0] == pairs[:, 1])
+            if len(self_pairs) == 0:
+                break
+            redo = np.union1d(self_pairs, self.rng.choice(len(pairs), size=len(self_pairs), replace=False))
+            redo_stubs = pairs[redo].ravel()
+            self.rng.shuffle(redo_stubs)
+            pairs[redo] = redo_stubs.reshape(-1, 2)
+
+        return pairs[pairs[:, 0] != pairs[:, 1]]
+
     def interact(self, person_1, person_2):
         """Method that models the interaction between two people.
 
@@ -541,47 +561,89 @@ class InteractionSites:
             Whether or not the interaction caused the spread of the infection.
         """
 
-        p1_infected = person_1.is_infected()
-        p2_infected = person_2.is_infected()
+        infector, susceptible = (person_1, person_2) if person_1.is_infected() else (person_2, person_1)
+        return bool(self.transmit(np.array([infector.get_index()]), np.array([susceptible.get_index()]))[0])
+
+    def transmit(self, infectors, susceptibles):
+        """Method that models the spread of the infection over many interactions at once.
+
+        The spread probability of each interaction starts from the spread probability of the
+        virus type of the infector. It is lowered by the outward efficiency of the mask of the
+        infector and the inward efficiency of the mask of the susceptible person, if a mask
+        mandate is in place and they wear them, and by the efficiency of their vaccines.
+        One uniform draw per interaction decides if the infection spreads.
+
+        Parameters
+        ----------
+        infectors : :obj:`np.array` of :obj:`int`
+            The index of the infected person of each interaction.
+        susceptibles : :obj:`np.array` of :obj:`int`
+            The index of the uninfected person of each interaction.
+
+        Returns
+        -------
+        did_infect : :obj:`np.array` of :obj:`bool`
+            Whether or not each interaction caused the spread of the infection.
+        """
 
-        virus_type = person_1.get_virus_type() if p1_infected else person_2.get_virus_type()
-        spread_prob = self.base_infection_spread_prob[self.variant_code_map[virus_type]]
+        agents = self.pop.agents
+        spread_prob = self.spread_prob_by_variant[agents.virus_type[infectors]]
 
         if self.policy.get_mask_mandate():
-            p1_mask = person_1.wear_mask()
-            p2_mask = person_2.wear_mask()
+            spread_prob *= np.where(self.wear_masks(infectors),
+                                    1 - self.mask_outward_eff_by_type[agents.mask_type[infectors]], 1)
+            spread_prob *= np.where(self.wear_masks(susceptibles),
+                                    1 - self.mask_inward_eff_by_type[agents.mask_type[susceptibles]], 1)
+
+        spread_prob *= (1 - self.vaccine_efficiency(infectors)) * (1 - self.vaccine_efficiency(susceptibles))
 
-            P1_INWARD_EFF, P1_OUTWARD_EFF = person_1.mask_type_efficiency()
-            P2_INWARD_EFF, P2_OUTWARD_EFF = person_2.mask_type_efficiency()
+        if np.isnan(spread_prob).any():
+            raise ValueError("An interacting person has a virus, mask or vaccine type "
+                             "with no associated spread probability or efficiency.")
 
-            if p1_infected:
-                if p1_mask:
-                    spread_prob *= (1 - P1_OUTWARD_EFF)
-                if p2_mask:
-                    spread_prob *= (1 - P2_INWARD_EFF)
+        return self.rng.random(len(infectors)) < spread_prob
 
-            elif p2_infected:
-                if p1_mask:
-                    spread_prob *= (1 - P1_INWARD_EFF)
-                if p2_mask:
-                    spread_prob *= (1 - P2_OUTWARD_EFF)
+    def wear_masks(self, indices):
+        """Method to check which of many people will wear a mask, as Person.wear_mask does for one.
 
-        p1_vaccinated1 = person_1.is_vaccinated()
-        p2_vaccinated1 = person_2.is_vaccinated()
+        Parameters
+        ----------
+        indices : :obj:`np.array` of :obj:`int`
+            The indices of the people.
 
-        p1_vaccine_eff = person_1.vaccine_type_efficiency() if p1_vaccinated1 else 0
-        p2_vaccine_eff = person_2.vaccine_type_efficiency() if p2_vaccinated1 else 0
+        Returns
+        -------
+        : :obj:`np.array` of :obj:`bool`
+            True for each person wearing a mask.
+        """
 
-        spread_prob *= ((1 - p1_vaccine_eff) * (1 - p2_vaccine_eff))
+        agents = self.pop.agents
+        mask_options = self.rng.random(len(indices))
+        return agents.has_mask[indices] & (mask_options / agents.protocol_compliance[indices] <= self.wear_mask_properly)
+
+    def vaccine_efficiency(self, indices):
+        """Method to find the efficiency of the vaccines of many people, 0 for the unvaccinated.
+
+        Parameters
+        ----------
+        indices : :obj:`np.array` of :obj:`int`
+            The indices of the people.
+
+        Returns
+        -------
+        : :obj:`np.array` of :obj:`float`
+        """
 
-        return random() < spread_prob
+        agents = self.pop.agents
+        return np.where(agents.vaccinated[indices], self.vaccine_eff_by_type[agents.vaccine_type[indices]], 0)
 
     def house_interact(self, day):
         """Method to manage interactions between members of the same household.
 
         Determines if any infection will spread among members of the same household. Different
         from interaction sites in the fact that contacts are not calculated, but assumed to happen
-        between all house members. Does not have a return value, infections are managed internally.
+        between all house members. These contacts are not logged, as contact tracing finds them
+        from the households directly. Does not have a return value, infections are managed internally.
 
         Parameters
         ----------
@@ -590,50 +652,15 @@ class InteractionSites:
             Used as input to the infect function after infections have been determined.
         """
 
-        total_house_interactions = 0
-        for house_indices in self.house_indices:
-            # Get people in house
-            house_size = len(house_indices)
-            housemembers = [self.pop.get_population()[ind] for ind in house_indices]
-            virus_types = [person.get_virus_type() for person in housemembers]
-
-            total_house_interactions += comb(len(housemembers), 2)
-
-            # Do interactions between the housemates
-            for member1, member2 in combinations(housemembers, 2):
-                member1.log_contact(member2, day=day, personal=True)
-                member2.log_contact(member1, day=day, personal=True)
-
-            # Check if anyone in the house is infected
-            if any(housemembers[i].is_infected() for i in range(house_size)):
-                infected_housemembers = [i for i in range(house_size) if housemembers[i].is_infected()]
-                virus_types = [virus_types[i] for i in infected_housemembers]
-                healthy_housemembers = [i for i in range(house_size) if not housemembers[i].is_infected()]
-
-                for person in healthy_housemembers:
-                    virus_id = np.random.choice(a=virus_types)
-                    virus_name = self.variant_code_map[virus_id]
-
-                    infection_chance = self.base_infection_spread_prob[virus_name] * self.house_infection_spread_factor
-                    person_vaccinated = housemembers[person].is_vaccinated()
-                    person_vaccine_eff = housemembers[person].vaccine_type_efficiency() if person_vaccinated else 0
-                    infection_chance *= (1 - person_vaccine_eff)
-                    caught_infection = random() < infection_chance
-
-                    if caught_infection:
-                        self.daily_new_infections += 1
-                        if virus_id is None:
-                            raise ValueError("House infection has incorrect virus type.")
-                        self.pop.infect(index=housemembers[person].get_index(), day=day, virus_type=virus_id)
-
-        self.daily_interactions["HOUSE_GENERAL"][day] = total_house_interactions
+        self.daily_interactions["HOUSE_GENERAL"][day] = self.house_spread(self.house_members, day)
 
     def student_house_interact(self, day):
         """Method to manage interactions between members of the same student household.
 
         Determines if any infection will spread among members of the same household. Different
         from interaction sites in the fact that contacts are not calculated, but assumed to happen
-        between all house members. Does not have a return value, infections are managed internally.
+        between all house members. These contacts are not logged, as contact tracing finds them
+        from the households directly. Does not have a return value, infections are managed internally.
 
         Parameters
         ----------
@@ -642,42 +669,56 @@ class InteractionSites:
             Used as input to the infect function after infections have been determined.
         """
 
-        total_house_interactions = 0
-        for house_indices in self.stud_house_indices:
-            # Get people in house
-            house_size = len(house_indices)
-            housemembers = [self.pop.get_population()[ind] for ind in house_indices]
-            virus_types = [person.get_virus_type() for person in housemembers]
-
-            total_house_interactions += comb(len(housemembers), 2)
-
-            # Do interactions between the housemates
-            for member1, member2 in combinations(housemembers, 2):
-                member1.log_contact(member2, day=day, personal=True)
-                member2.log_contact(member1, day=day, personal=True)
-
-            # Check if anyone in the house is infected
-            if any(housemembers[i].is_infected() for i in range(house_size)):
-                infected_housemembers = [i for i in range(house_size) if housemembers[i].is_infected()]
-                virus_types = [virus_types[i] for i in infected_housemembers]
-                healthy_housemembers = [i for i in range(house_size) if not housemembers[i].is_infected()]
-
-                for person in healthy_housemembers:
-                    virus_id = np.random.choice(a=virus_types)
-                    virus_name = self.variant_code_map[virus_id]
-
-                    infection_chance = self.base_infection_spread_prob[virus_name] * self.house_infection_spread_factor
-                    person_vaccinated = housemembers[person].is_vaccinated()
-                    person_vaccine_eff = housemembers[person].vaccine_type_efficiency() if person_vaccinated else 0
-                    infection_chance *= (1 - person_vaccine_eff)
-                    caught_infection = random() < infection_chance
-                    if caught_infection:
-                        self.daily_new_infections += 1
-                        if virus_id is None:
-                            raise ValueError("House infection has incorrect virus type.")
-                        self.pop.infect(index=housemembers[person].get_index(), day=day, virus_type=virus_id)
-
-        self.daily_interactions["HOUSE_STUDENT"][day] = total_house_interactions
+        self.daily_interactions["HOUSE_STUDENT"][day] = self.house_spread(self.stud_house_members, day)
+
+    def house_spread(self, houses, day):
+        """Method to spread the infection within every house of a type, in one vectorized pass.
+
+        Every uninfected member of a house with infected members catches the virus type of one
+        of those infected members, chosen at random, with the spread probability of that virus
+        type scaled by house_infection_spread_factor and lowered by the efficiency of their vaccine.
+
+        Parameters
+        ----------
+        houses : :obj:`cv19.site_membership.SiteMembership`
+            The people living in each house.
+        day : int
+            The day value that this function is being called on in the encompassing simulation class.
+
+        Returns
+        -------
+        total_house_interactions : int
+            The number of pairs of people living in the same house.
+        """
+
+        agents = self.pop.agents
+        members = houses.indices
+        house_of_member = houses.site_of_entries()
+
+        # Infected members, which are held house after house like all members
+        member_infected = agents.infected[members]
+        infected_members = members[member_infected]
+        n_infected = np.bincount(house_of_member[member_infected], minlength=len(houses))
+        first_infected = np.cumsum(n_infected) - n_infected
+
+        # Uninfected members of houses with someone infected, and the infected member each catches it from
+        exposed = ~member_infected & (n_infected[house_of_member] > 0)
+        people, people_houses = members[exposed], house_of_member[exposed]
+        infectors = infected_members[first_infected[people_houses] + self.rng.integers(n_infected[people_houses])]
+        virus_ids = agents.virus_type[infectors]
+
+        infection_chance = (self.spread_prob_by_variant[virus_ids] * self.house_infection_spread_factor
+                            * (1 - self.vaccine_efficiency(people)))
+        if np.isnan(infection_chance).any():
+            raise ValueError("An infected person has a virus type with no associated spread probability.")
+        caught_infection = self.rng.random(len(people)) < infection_chance
+
+        # Houses do not share members, so everyone can be infected at once
+        self.daily_new_infections += np.count_nonzero(caught_infection)
+        self.pop.infect_many(people[caught_infection], virus_ids[caught_infection], day)
+
+        house_sizes = np.diff(houses.indptr)
+        return int(np.sum(house_sizes * (house_sizes - 1) // 2))
 
     def testing_site(self, tests_per_day, day):
         """Method to update status of symptoms and run the testing sites code.
@@ -695,64 +736,64 @@ class InteractionSites:
         self.pop.get_tested(tests_per_day, day)
 
     def get_grade_A_sites(self):
-        """Method to return a copy of the grade_A_sites attribute.
+        """Method to return a read only view of the grade_A_sites attribute.
 
         Returns
         -------
-        self.grade_A_sites.copy() : :obj:`np.array` of :obj:`list` of :obj:`np.array` of :obj:`int`
+        self.grade_A_sites.view() : :obj:`cv19.site_membership.SiteMembership`
         """
-        return deepcopy(self.grade_A_sites)
+        return self.grade_A_sites.view()
 
     def get_grade_B_sites(self):
-        """Method to return a copy of the grade_B_sites attribute.
+        """Method to return a read only view of the grade_B_sites attribute.
 
         Returns
         -------
-        self.grade_B_sites.copy() : :obj:`np.array` of :obj:`list` of :obj:`np.array` of :obj:`int`
+        self.grade_B_sites.view() : :obj:`cv19.site_membership.SiteMembership`
         """
-        return deepcopy(self.grade_B_sites)
+        return self.grade_B_sites.view()
 
     def get_grade_C_sites(self):
-        """Method to return a copy of the grade_C_sites attribute.
+        """Method to return a read only view of the grade_C_sites attribute.
 
         Returns
         -------
-        self.grade_C_sites.copy() : :obj:`np.array` of :obj:`list` of :obj:`np.array` of :obj:`int`
+        self.grade_C_sites.view() : :obj:`cv19.site_membership.SiteMembership`
         """
-        return deepcopy(self.grade_C_sites)
+        return self.grade_C_sites.view()
 
     def get_lect_sites(self):
-        """Method to return a copy of the lect_sites attribute.
+        """Method to return a read only view of the lect_sites attribute.
 
         Returns
         -------
-        self.lect_sites.copy() : :obj:`np.array` of :obj:`list` of :obj:`np.array` of :obj:`int`
+        self.lect_sites.view() : :obj:`cv19.site_membership.SiteMembership`
         """
-        return deepcopy(self.lect_sites)
+        return self.lect_sites.view()
 
     def get_study_sites(self):
-        """Method to return a copy of the study_sites attribute.
+        """Method to return a read only view of the study_sites attribute.
 
         Returns
         -------
-        self.study_sites.copy() : :obj:`np.array` of :obj:`list` of :obj:`np.array` of :obj:`int`
+        self.study_sites.view() : :obj:`cv19.site_membership.SiteMembership`
         """
-        return deepcopy(self.study_sites)
+        return self.study_sites.view()
 
     def get_food_sites(self):
-        """Method to return a copy of the food_sites attribute.
+        """Method to return a read only view of the food_sites attribute.
 
         Returns
         -------
-        self.food_sites.copy() : :obj:`np.array` of :obj:`list` of :obj:`np.array` of :obj:`int`
+        self.food_sites.view() : :obj:`cv19.site_membership.SiteMembership`
         """
-        return deepcopy(self.food_sites)
+        return self.food_sites.view()
 
     def get_res_sites(self):
-        """Method to return a copy of the res_sites attribute.
+        """Method to return a read only view of the res_sites attribute.
 
         Returns
         -------
-        self.res_sites.copy() : :obj:`np.array` of :obj:`list` of :obj:`np.array` of :obj:`int`
+        self.res_sites.view() : :obj:`cv19.site_membership.SiteMembership`
         """
-        return deepcopy(self.res_sites)
+        return self.res_sites.view()
@@ -1,17 +1,17 @@
+import os
 import multiprocessing
 import pickle
+import pstats
 from pathlib import Path
-import tomli
 
 import numpy as np
-import pandas as pd
-import scipy.stats as st
-from matplotlib import pyplot as plt
 
-from .simulation import Simulation
+from .simulation import Simulation, get_code_version
+from .config_cache import load_toml
 
 
-def async_simulation(config_file, config_dir="", config_override_data=None, verbose=False):
+def async_simulation(config_file, config_dir="", config_override_data=None, verbose=False, code_version=None,
+                     seed=None, profile=None):
     """Does a single run of the simulation with the supplied configuration details.
 
     Parameters
@@ -25,22 +25,29 @@ def async_simulation(config_file, config_dir="", config_override_data=None, verb
         default parameters loaded.
     verbose : bool, default False
         Whether to output information from each day of the simulation.
+    code_version : str, default None
+        Version of the code running the simulation. Found by the simulation if None.
+    seed : None, int or np.random.SeedSequence, default None
+        Seed of the random number generator of the simulation.
+    profile : str or None, default None
+        Path of a file to write a cProfile profile of the run to. Not profiled if None.
 
     Returns
     -------
     tuple
-        Arrays from the simulation.
+        Arrays from the simulation, and the time spent on each phase of each day.
     """
 
     sim = Simulation(config_file=config_file, config_dir=config_dir,
-                     config_override_data=config_override_data, verbose=verbose)
+                     config_override_data=config_override_data, verbose=verbose,
+                     code_version=code_version, seed=seed)
 
-    sim.run()
-    return sim.get_arrays()
+    sim.run(profile=profile)
+    return sim.get_tracking_arrays(), sim.timings
 
 
 def run_async(num_runs, config_file, save_name=None, num_cores=-1, config_dir="", config_override_data=None,
-              verbose=False):
+              verbose=False, seed=None, profile=None):
     """Runs multiple simulations in parallel using the supplied configuration settings.
 
     Parameters
@@ -60,23 +67,55 @@ def run_async(num_runs, config_file, save_name=None, num_cores=-1, config_dir=""
         in configuration files other than main.
     verbose : bool, default False
         Whether to output information from each day of the simulation.
+    seed : None, int or np.random.SeedSequence, default None
+        Seed of the runs. Each run gets its own independent random stream, spawned from
+        this seed, so the same seed gives the same results for any number of cores.
+    profile : str or None, default None
+        Directory to write cProfile profiles to, created if needed. Each run writes its profile
+        to run_<number>.pstats, and the profiles of all runs are merged into merged.pstats
+        (which can be read with pstats.Stats or snakeviz). Not profiled if None.
 
     Returns
     -------
     pandas.DataFrame
-        Containing the results of the simulation in tabular format.
+        Containing the results of the simulation in tabular format. A summary of the time
+        spent on each phase of the runs (see summarize_timings) is held in its attrs, under
+        the "timings" key.
     """
 
     if num_cores == -1:
         num_cores = multiprocessing.cpu_count()
 
+    # Find the code version once, instead of in every simulation
+    code_version = os.environ.get("CV19_CODE_VERSION") or get_code_version()
+
+    # Independent random streams for each run
+    seeds = _seed_sequence(seed).spawn(num_runs)
+
+    # Profile files of each run
+    profiles = [None] * num_runs
+    if profile is not None:
+        Path(profile).mkdir(parents=True, exist_ok=True)
+        profiles = [str(Path(profile, f"run_{i:03}.pstats")) for i in range(num_runs)]
+
     # Run all of the simulations
     multiprocessing.freeze_support()
     with multiprocessing.Pool(processes=num_cores) as pool:
-        results = pool.starmap(async_simulation, ((config_file, config_dir, config_override_data, verbose)
-                                                  for _ in range(num_runs)))
+        outputs = pool.starmap(async_simulation, ((config_file, config_dir, config_override_data, verbose,
+                                                   code_version, run_seed, run_profile)
+                                                  for run_seed, run_profile in zip(seeds, profiles)))
+
+    results, timings = zip(*outputs)
+
+    if profile is not None:
+        pstats.Stats(*profiles).dump_stats(Path(profile, "merged.pstats"))
+
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+    df = pd.DataFrame(list(results))
+    df.attrs["timings"] = summarize_timings(timings)
+    if verbose:
+        print(df.attrs["timings"])
 
-    df = pd.DataFrame(results)
     if save_name is not None:
         with open(save_name, 'wb') as f:
             pickle.dump(df, f)
@@ -84,6 +123,49 @@ def run_async(num_runs, config_file, save_name=None, num_cores=-1, config_dir=""
     return df
 
 
+def summarize_timings(timings):
+    """Summarizes the time spent on each phase of a set of simulation runs.
+
+    Parameters
+    ----------
+    timings : list of dict of np.array
+        The time spent on each phase of each day, for each run (see Simulation.timings).
+
+    Returns
+    -------
+    pandas.DataFrame
+        Indexed by phase, holding the mean and standard deviation over the runs of the
+        total time (in seconds) spent on each phase, and the mean fraction of the run time
+        that it makes up.
+    """
+
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    totals = pd.DataFrame([{phase: np.sum(times) for phase, times in run_timings.items()}
+                           for run_timings in timings])
+    fractions = totals.div(totals.sum(axis=1), axis=0)
+
+    return pd.DataFrame({"mean": totals.mean(), "std": totals.std(), "fraction": fractions.mean()})
+
+
+def _seed_sequence(seed):
+    """Makes a seed sequence from a seed, to spawn independent random streams from.
+
+    Parameters
+    ----------
+    seed : None, int or np.random.SeedSequence
+        The seed. A fresh, unpredictable seed is used if None.
+
+    Returns
+    -------
+    np.random.SeedSequence
+    """
+
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+
 def _config_editor(main_config, disease_config, param_name, value):
     """Takes string form of a parameter's name (eg. policy_data.testing_rate)
     and changes it to the supplied value.
@@ -137,7 +219,8 @@ def _config_editor(main_config, disease_config, param_name, value):
         raise ValueError(f"The supplied param_name {param_name} is not in any configuration file")
 
 
-def tabular_mode(base_config_file, independent, dependent, num_runs=8, num_cores=8, save_name=None, verbose=False):
+def tabular_mode(base_config_file, independent, dependent, num_runs=8, num_cores=8, save_name=None, verbose=False,
+                 seed=None):
     """Automatically measures the impact of various public health measures on different metrics.
 
     Parameters
@@ -176,6 +259,9 @@ def tabular_mode(base_config_file, independent, dependent, num_runs=8, num_cores
         corresponding filename. If None, then don't save any results.
     verbose : bool, default False
         Whether to output information from each day of the simulation.
+    seed : None, int or np.random.SeedSequence, default None
+        Seed of the sweep. Each scenario gets its own independent random stream, spawned
+        from this seed.
 
     Returns
     -------
@@ -208,19 +294,20 @@ def tabular_mode(base_config_file, independent, dependent, num_runs=8, num_cores
     # Results stores the results of the different scenarios
     results = []
 
+    # Independent random streams for each scenario
+    scenario_seeds = _seed_sequence(seed).spawn(len(mesh[0]))
+
     # Running through each scenario
     for i, values in enumerate(zip(*mesh)):
 
         config_dir = Path(base_config_file).parent
 
-        # Load the main TOML file
-        with open(base_config_file, 'rb') as f:
-            temp_main_config = tomli.load(f)
+        # Load the main TOML file (parsed once, each scenario gets its own copy)
+        temp_main_config = load_toml(base_config_file)
         # Load the disease TOML file
         disease_config_filename = Path(config_dir,
                                        temp_main_config['simulation_data']['disease_config_file'])
-        with open(disease_config_filename, 'rb') as f:
-            temp_disease_config = tomli.load(f)
+        temp_disease_config = load_toml(disease_config_filename)
 
         # Setting the parameters from the independent variables
         for key, value in zip(indep_keys, values):
@@ -238,13 +325,14 @@ def tabular_mode(base_config_file, independent, dependent, num_runs=8, num_cores
             scenario_save_name = save_name + f"{i:02}"
         data = run_async(num_runs, temp_main_config, num_cores=num_cores,
                          save_name=scenario_save_name, config_dir=config_dir, verbose=verbose,
-                         config_override_data=config_override_data)
+                         config_override_data=config_override_data, seed=scenario_seeds[i])
 
         # Processing the results to get the dependent measurements, add to results
         result = [f(data) for f in dep_funcs]
         results.append(result)
 
     # Convert results to a dataframe
+    import pandas as pd  # pylint: disable=import-outside-toplevel
     results = pd.DataFrame(results, index=list(independent.values())[0], columns=dependent.keys())
 
     # Handle the case of multiple return values from the functions.
@@ -269,7 +357,8 @@ def tabular_mode(base_config_file, independent, dependent, num_runs=8, num_cores
     return results
 
 
-def confidence_interval(config, parameterstoplot, num_runs=8, confidence=0.80, num_cores=-1, save_name=None, verbose=False):
+def confidence_interval(config, parameterstoplot, num_runs=8, confidence=0.80, num_cores=-1, save_name=None, verbose=False,
+                        seed=None):
     """Plots the results of multiple simulations with confidence bands
     to give a better understanding of the trend of a given scenario.
     Displays a plot of the results.
@@ -294,9 +383,14 @@ def confidence_interval(config, parameterstoplot, num_runs=8, confidence=0.80, n
         the results.
     verbose : bool, default False
         Whether to output information from each day of the simulation.
+    seed : None, int or np.random.SeedSequence, default None
+        Seed of the runs, see run_async.
     """
 
-    result = run_async(num_runs, config, num_cores=num_cores, save_name=save_name, verbose=verbose)
+    import scipy.stats as st  # pylint: disable=import-outside-toplevel
+    from matplotlib import pyplot as plt  # pylint: disable=import-outside-toplevel
+
+    result = run_async(num_runs, config, num_cores=num_cores, save_name=save_name, verbose=verbose, seed=seed)
 
     fig_ci, ax_ci = plt.subplots()
     z_score = st.norm.ppf(confidence)
@@ -576,6 +670,7 @@ def time_elapsed(data):
 
 # Sample usage
 if __name__ == "__main__":
+    import matplotlib.pyplot
 
     # Tabular mode
     table = tabular_mode(
@@ -593,7 +688,7 @@ if __name__ == "__main__":
     # Plot results
     ax = table.plot()
     ax.set_xlabel("Proportion of people wearing masks")
-    plt.show()
+    matplotlib.pyplot.show()
 
     # Confidence interval mode
     parameters_to_plot = ["infected",
@@ -1,6 +1,26 @@
-from random import random
+from .agent_store import AgentStore
 
-import numpy as np
+
+def _column_property(name):
+    """Function to create a property that reads and writes a column of the agent store.
+
+    Parameters
+    ----------
+    name : str
+        The name of the column in the agent store.
+
+    Returns
+    -------
+    : :obj:`property`
+    """
+
+    def fget(self):
+        return self.store.get(name, self.row)
+
+    def fset(self, value):
+        self.store.set(name, self.row, value)
+
+    return property(fget, fset, doc=f"The {name} attribute of the person, held in the agent store.")
 
 
 class Person(object):
@@ -8,27 +28,43 @@ class Person(object):
 
     There are currently 26 different attributes set for each person.
 
-    All attributes are passed through the sim_obj, which accesses the simulation
-    configuration file.Outlined below are the main object attributes that create a
-    person.
+    A person does not hold its own attributes, but is a thin view onto a row of a
+    :obj:`cv19.agent_store.AgentStore`, in which every attribute is a NumPy column.
+    String valued attributes (age, job, case severity, mask and vaccine type) are stored
+    as small integer codes into the tables in `cv19/data/constants.py`, and are decoded
+    back into strings when accessed through a person. Parameters of the simulation are accessed through the sim_obj, which accesses the
+    simulation configuration file. Outlined below are the main object attributes that
+    create a person.
 
     Attributes
     ----------
-
+    store : :obj:`cv19.agent_store.AgentStore`
+        The agent store holding the attributes of this person.
+    row : int
+        The row of this person in the agent store.
+    index : int
+        The index of this person in the population.
+    sim_obj : :obj:`simulation.simulation`
+        The encompassing simulation object hosting the simulation.
     """
 
+    # Only the reference to the agent store row is held per person, with no instance dictionary
+    __slots__ = ("store", "row", "index", "sim_obj")
+
     def __init__(self, index, sim_obj, infected=False, recovered=False, dead=False, hospitalized=False, ICU=False,
                  quarantined=False, quarantined_day=None, infected_day=None, recovered_day=None, death_day=None,
                  others_infected=None, cure_days=None, recent_infections=None, vaccinated=False, vaccine_type=None,
                  age=None, job=None, house_index=0, isolation_tendencies=None, case_severity=None, mask_type=None,
                  has_mask=True, virus_type=None, days_until_symptoms=None):
-        """Method to load in attributes from the provided simulation class object.
+        """Method to create a standalone person, backed by its own single agent store.
 
-        Sets all objects in the "person_data" dictionary key as self attributes of the
-        InteractionSites class.
+        People that are part of a population are not created this way, but are views onto the
+        agent store of the population (see `Person.from_store`).
 
         Parameters
         ----------
+        index : int
+            The index of the person in the population.
         sim_obj :obj:`simulation.simulation`
             The encompassing simulation object hosting the simulation.
         infected : bool
@@ -72,11 +108,19 @@ class Person(object):
             Determines type of mask worn by person, defaults to None.
         has_mask : bool
             Determines if a person will wear a mask or not, defaults to True.
-        goodness : float
-        days_in_lockdown : int
-            Records the number of days a person has been under lockdown.
+        virus_type : int
+            The code of the virus type the person is infected with, defaults None.
+        days_until_symptoms : int
+            The number of days after infection until symptoms show, defaults None.
         """
 
+        self.store = AgentStore(1, protocol_compliance=sim_obj.protocol_compliance)
+        self.row = 0
+        self.index = index
+
+        # Set the simulaiton object to access the variables
+        self.sim_obj = sim_obj
+
         self.infected = infected
         self.recovered = recovered
         self.dead = dead
@@ -92,33 +136,97 @@ class Person(object):
         self.recent_infections = recent_infections
         self.vaccinated = vaccinated
         self.vaccine_type = vaccine_type
-        self.index = index
         self.age = age
         self.job = job
         self.household = house_index
         self.isolation_tendencies = isolation_tendencies
         self.case_severity = case_severity
         self.mask_type = mask_type
-        self.show_symptoms = False
         self.days_until_symptoms = days_until_symptoms
-        self.knows_infected = False
-        self.will_get_symptoms = False
         self.has_mask = has_mask
         self.virus_type = virus_type
-        self.test_day = None
-        self.has_cold = False
-        self.days_in_lockdown = 0
 
-        # Set the simulaiton object to access the variables
-        self.sim_obj = sim_obj
-        self.protocol_compliance = self.sim_obj.protocol_compliance
+        # Whether this person uses a contact tracing app
+        self.has_ct_app = self.sim_obj.rng.random() < 1  # TODO add the "CT_APP_PROB" variable here
 
-        # Dictionary of sets that stores all the contacts on a given day
-        self.all_contacts = {}
-        self.personal_contacts = {}
+    @classmethod
+    def from_store(cls, store, index, sim_obj):
+        """Method to create a person that is a view onto a row of an existing agent store.
 
-        # Whether this person uses a contact tracing app
-        self.has_ct_app = random() < 1  # TODO add the "CT_APP_PROB" variable here
+        No attributes are copied, all reads and writes go directly to the store.
+
+        Parameters
+        ----------
+        store : :obj:`cv19.agent_store.AgentStore`
+            The agent store holding the attributes of this person.
+        index : int
+            The index of the person in the population, which is also their row in the store.
+        sim_obj :obj:`simulation.simulation`
+            The encompassing simulation object hosting the simulation.
+
+        Returns
+        -------
+        person : :obj:`Person`
+        """
+
+        person = cls.__new__(cls)
+        person.store = store
+        person.row = index
+        person.index = index
+        person.sim_obj = sim_obj
+        return person
+
+    infected = _column_property("infected")
+    recovered = _column_property("recovered")
+    dead = _column_property("dead")
+    hospitalized = _column_property("hospitalized")
+    ICU = _column_property("ICU")
+    quarantined = _column_property("quarantined")
+    quarantined_day = _column_property("quarantined_day")
+    infected_day = _column_property("infected_day")
+    recovered_day = _column_property("recovered_day")
+    death_day = _column_property("death_day")
+    cure_days = _column_property("cure_days")
+    recent_infections = _column_property("recent_infections")
+    vaccinated = _column_property("vaccinated")
+    vaccinated_day = _column_property("vaccinated_day")
+    vaccine_type = _column_property("vaccine_type")
+    age = _column_property("age")
+    job = _column_property("job")
+    household = _column_property("household")
+    isolation_tendencies = _column_property("isolation_tendencies")
+    case_severity = _column_property("case_severity")
+    mask_type = _column_property("mask_type")
+    show_symptoms = _column_property("show_symptoms")
+    has_covid_symptoms = _column_property("has_covid_symptoms")
+    days_until_symptoms = _column_property("days_until_symptoms")
+    knows_infected = _column_property("knows_infected")
+    will_get_symptoms = _column_property("will_get_symptoms")
+    has_mask = _column_property("has_mask")
+    virus_type = _column_property("virus_type")
+    test_day = _column_property("test_day")
+    has_cold = _column_property("has_cold")
+    days_in_lockdown = _column_property("days_in_lockdown")
+    protocol_compliance = _column_property("protocol_compliance")
+    has_ct_app = _column_property("has_ct_app")
+
+    @property
+    def others_infected(self):
+        """The list of others infected by this person, created on first access."""
+        others_infected = self.store.others_infected[self.row]
+        if others_infected is None:
+            others_infected = self.store.others_infected[self.row] = []
+        return others_infected
+
+    @others_infected.setter
+    def others_infected(self, value):
+        self.store.others_infected[self.row] = value
+
+    def __eq__(self, other):
+        return isinstance(other, Person) and self.store is other.store and self.row == other.row
+
+    def __hash__(self):
+        return hash((id(self.store), self.row))
 
     def __str__(self):
         """Prints the person identifier.
@@ -191,6 +299,7 @@ class Person(object):
 
     def set_quarantine(self, day):
         """Method to set a person to be in quarantine. Sets the day the quarantine begins to the day inputted.
+        The person is quarantined through the population, which schedules the end of their quarantine.
 
         Parameters
         ----------
@@ -202,19 +311,14 @@ class Person(object):
         self.quarantined: :obj:`bool`
         """
 
-        # Make sure person is not already quarantined.
-        if not self.is_quarantined():
-            self.quarantined_day = day
-            self.quarantined = True
-            self.sim_obj.pop.quarantined[self.index] = self.index
-
+        self.sim_obj.pop.quarantine(self.index, day)
         return self.quarantined
 
     def leave_quarantine(self, day):
         """ Method to determine if a person is done quarantining based on an inputted day.
         Will return True if person is recovered, dead or the inputted day is greater than
         self.sim_obj.quarantine_time.
-        Will return False otherwise.
+        Will return False otherwise. The person is released through the population.
 
         Parameters
         ----------
@@ -226,11 +330,7 @@ class Person(object):
         not self.quarantined: :obj:`bool`
         """
 
-        if self.recovered or self.dead or (day - self.quarantined_day) >= self.sim_obj.quarantine_time:
-            self.quarantined = False
-            self.show_symptoms = False
-            return True
-        return False
+        return len(self.sim_obj.pop.release_quarantine([self.index], day)) > 0
 
     def get_quarantine_day(self):
         """Method to retrieve the day a person is put into quarantine.
@@ -250,10 +350,10 @@ class Person(object):
         """
 
         if self.has_cold:
-            if random() <= 1 / self.sim_obj.cold_duration_days:
+            if self.sim_obj.rng.random() <= 1 / self.sim_obj.cold_duration_days:
                 self.show_symptoms = False
                 self.has_cold = False
-        elif random() <= self.sim_obj.cold_prob:
+        elif self.sim_obj.rng.random() <= self.sim_obj.cold_prob:
             self.show_symptoms = True
             self.has_cold = True
         return self.show_symptoms
@@ -391,100 +491,6 @@ class Person(object):
         """
         return self.virus_type
 
-    def infect(self, day, virus_type, cure_days=None):
-        """Method to infect a person.
-
-        Parameters
-        ----------
-        day : int
-            The day value that this function is being called on in the encompassing simulation class.
-        virus_type : str
-            The type of virus that this person is being infected with.
-        cure_days : int
-            The day value set for the person to be cured after being infected.
-
-        Returns
-        -------
-        : :obj:`bool`
-            True if infected and False if not.
-        """
-
-        d_params = self.sim_obj.disease_parameters
-
-        # Check that they are suseptable (maybe should have that as property?)
-        if not self.recovered and not self.infected and not self.dead:
-            self.infected = True
-            self.virus_type = virus_type
-            self.infected_day = day
-            self.will_get_symptoms = True
-            self.days_until_symptoms = np.random.randint(d_params["days_before_symptoms"]["min"],
-                                                         d_params["days_before_symptoms"]["max"])
-
-            # If cure days not specified then choose random number inbetween min and max
-            if self.case_severity == 'Mild' or self.case_severity is None:  # If severity not specified, choose Mild
-                if random() > d_params["mild_symptom_prob"]:  # probability that the person has mild symptoms
-                    # choose number of days after infection when symptoms show
-                    self.will_get_symptoms = False
-                    self.days_until_symptoms = None
-
-                self.cure_days = np.random.randint(d_params["mild_days"]["min"],
-                                                   d_params["mild_days"]["max"]) if cure_days is None else cure_days
-            # Assuming that all hospitalization or worse cases will show symptoms
-            elif self.case_severity == 'Hospitalization':
-                self.cure_days = np.random.randint(d_params["hospital_days"]["min"],
-                                                   d_params["hospital_days"]["max"]) if cure_days is None else cure_days
-                self.hospitalized = True
-            elif self.case_severity == 'ICU':
-                self.cure_days = np.random.randint(d_params["ICU_days"]["min"],
-                                                   d_params["ICU_days"]["max"]) if cure_days is None else cure_days
-                self.hospitalized = True
-                self.ICU = True
-            elif self.case_severity == 'Death':
-                self.cure_days = np.random.randint(d_params["die_days"]["min"],
-                                                   d_params["die_days"]["max"]) if cure_days is None else cure_days
-                self.hospitalized = True
-                self.ICU = True
-            else:
-                raise ValueError(f"'{self.case_severity}' is not a valid case severity.")
-
-            return True
-
-        return False
-
-    def check_quarantine(self, day):
-        """Method to check if a person should be quarantined.
-        If they're quarantined and their quarantine time has ended, let them out of quarantine.
-        If they're not quarantined but they have severe symptoms, set self.quarantined to be True.
-
-        Parameters
-        ----------
-        day : int
-            The day value that this function is being called on in the encompassing simulation class.
-
-        Returns
-        -------
-        : :obj:`bool`
-            True if quarantined and False if not.
-        """
-
-        if self.quarantined:
-            days_since_quarantined = day - self.quarantined_day
-            if days_since_quarantined >= self.sim_obj.quarantine_time:
-                self.quarantined = False
-                self.sim_obj.pop.quarantined[self.index] = -1  # Null value
-                return False
-            return True
-        else:  # if not self quarantined
-            # if they aren't in quarantine, check if they know they're infected
-            #   then put them into quarantine
-            if self.case_severity != "Mild":
-                # if their symtoms are not mild, quarantine if they're infected
-                # assume people in the hospital aren't spreading it either
-                self.set_quarantine(day)
-
-                return True
-            return False
-
     def check_cured(self, day):
         """Method that checks if a person is past their cure time and will cure them
         their days_since_infected is greater or equal to their cure_days.
@@ -512,6 +518,7 @@ class Person(object):
                 self.knows_infected = False
                 self.days_until_symptoms = None
                 self.show_symptoms = False
+                self.has_covid_symptoms = False
                 self.hospitalized = False
                 self.ICU = False
 
@@ -539,6 +546,7 @@ class Person(object):
             days_since_infected = day - self.infected_day
             if days_since_infected >= self.cure_days:
                 self.infected = False
+                self.has_covid_symptoms = False
                 self.dead = True
                 self.death_day = day
 
@@ -585,7 +593,7 @@ class Person(object):
             True if wearing a mask and False if not.
         """
 
-        mask_options = np.random.uniform()
+        mask_options = self.sim_obj.rng.random()
 
         if self.has_mask:
             if mask_options / self.protocol_compliance > self.sim_obj.wear_mask_properly:
@@ -631,15 +639,7 @@ class Person(object):
             Whether or not the two people know each other.
         """
 
-        def add_contact(log):
-            if day in log.keys():
-                log[day].add(other)
-            else:
-                log[day] = set([other])
-
-        add_contact(self.all_contacts)
-        if personal:
-            add_contact(self.personal_contacts)
+        self.sim_obj.pop.contact_log.log(day, [self.index], [other.get_index()], personal=personal)
 
     def contact_tracing(self, day: int) -> None:
         """Contacts everyone that they have had contact with.
@@ -650,41 +650,15 @@ class Person(object):
             Current day in the simulation.
         """
 
-        end = day + 1
-        beginning = end - self.sim_obj.ct_length
-
-        def get_contacts(log):
-            contacts = set()
-            for d in range(beginning, end):
-                if d in log.keys():
-                    contacts = contacts.union(log[d])
-            return contacts
-
-        # Personal contacts
-        personal_contacts = get_contacts(self.personal_contacts)
-        remembered_contacts = set()
-
-        # Notify all personal contacts
-        for contact in personal_contacts:
-            if random() < self.sim_obj.ct_prob_remember_personal_contacts:
-                contact.positive_contact(day)
-                remembered_contacts.add(contact)
-
-        # CT apps
-        if self.has_ct_app:
-            # Gets all contacts that are from the CT app, minus those
-            # already contacted because they were personal contacts
-            impersonal_contacts = get_contacts(self.all_contacts).difference(remembered_contacts)
-
-            for contact in impersonal_contacts:
-                contact.positive_contact(day)
+        self.sim_obj.pop.trace_contacts([self.index], day)
 
     def positive_contact(self, day):
         """Called when a person is notified of a positive contact with a
-        covid case.
+        covid case. The person is quarantined through the population, which
+        schedules the end of their quarantine.
         """
 
-        self.set_quarantine(day)
+        self.sim_obj.pop.quarantine(self.index, day)
 
     def set_protocol_compliance(self, house_size):
         """Method to set the initial protocol compliance value of a person.
@@ -704,13 +678,13 @@ class Person(object):
 
         if house_size > len(self.sim_obj.protocol_compliance_house_prob):  # Sets the house size to the largest house size probability if the house size is larger than that number
             house_size = len(self.sim_obj.protocol_compliance_house_prob)
-        if random() < self.sim_obj.protocol_compliance_house_prob[house_size - 1]:
+        if self.sim_obj.rng.random() < self.sim_obj.protocol_compliance_house_prob[house_size - 1]:
             self.protocol_compliance *= self.sim_obj.protocol_compliance_house_reduction[house_size - 1]  # changes the persons protocol compliance based on house size
 
-        if random() < self.sim_obj.protocol_compliance_age_prob[self.age]:
+        if self.sim_obj.rng.random() < self.sim_obj.protocol_compliance_age_prob[self.age]:
             self.protocol_compliance *= self.sim_obj.protocol_compliance_age_reduction[self.age]
 
-        if random() < self.sim_obj.protocol_compliance_case_severity_prob[self.case_severity]:
+        if self.sim_obj.rng.random() < self.sim_obj.protocol_compliance_case_severity_prob[self.case_severity]:
             self.protocol_compliance *= self.sim_obj.protocol_compliance_case_severity_reduction[self.case_severity]  # changes protocol compliance based on how severity of a potential case
         return self.protocol_compliance
 
@@ -734,15 +708,15 @@ class Person(object):
             self.protocol_compliance = self.sim_obj.protocol_compliance
 
         # As the lockdown length increases, decrease the protocol compliance
-        if self.days_in_lockdown > self.sim_obj.protocol_compliance_lockdown_length_threshold and random() < self.sim_obj.protocol_compliance_lockdown_prob:
+        if self.days_in_lockdown > self.sim_obj.protocol_compliance_lockdown_length_threshold and self.sim_obj.rng.random() < self.sim_obj.protocol_compliance_lockdown_prob:
             self.protocol_compliance *= self.sim_obj.protocol_compliance_lockdown_length_reduction
 
         if lockdown_level != old_lockdown_mandate:
             # when the lockdown starts increase the protocol compliance of a person
-            if lockdown_level and random() < self.sim_obj.protocol_compliance_lockdown_prob:
+            if lockdown_level and self.sim_obj.rng.random() < self.sim_obj.protocol_compliance_lockdown_prob:
                 self.protocol_compliance *= self.sim_obj.protocol_compliance_lockdown_reduction
             # when the lockdown ends decrease the protocol compliance of a person
-            elif not lockdown_level and random() < self.sim_obj.protocol_compliance_lockdown_prob:
+            elif not lockdown_level and self.sim_obj.rng.random() < self.sim_obj.protocol_compliance_lockdown_prob:
                 self.protocol_compliance /= self.sim_obj.protocol_compliance_lockdown_reduction
 
         return self.protocol_compliance
@@ -791,10 +765,8 @@ class Person(object):
         -------
         self.vaccinated: :obj:`bool`
         """
-        # Make sure person is not already vaccinated.
-        if not self.is_vaccinated():
-            self.vaccinated_day = day
-            self.vaccinated = True
+        self.sim_obj.pop.vaccinate_many([self.index], day)
+        return self.vaccinated
 
     def vaccine_type_efficiency(self):
         """Method to determines what the efficiency of the vaccine based on the type of vaccine administered.
@@ -1,24 +1,118 @@
-from random import random, sample
-import tomli
+# pylint: disable=too-many-lines
+import warnings
+from collections import deque
+from collections.abc import Sequence
 
 import numpy as np
 
 from .data import constants
 from .person import Person
+from .config_cache import load_table
+from .agent_store import AgentStore, CATEGORICAL_CODES, NULL_ID, NULL_INT
+from .event_calendar import EventCalendar
+from .contact_log import ContactLog
 
-# This value means that the person index at this location is not susceptible/infected/dead/...
-# All arrays are intialized to this (except healthy, as everyone is healthy)
-NULL_ID = -1
+# Compartment codes held in the population state array. Infected people are split by
+# the care they need, so that hospital and ICU counts come from the same counters.
+SUSCEPTIBLE, INFECTED, HOSPITALIZED, ICU, RECOVERED, DEAD = range(6)
+INFECTED_STATES = (INFECTED, HOSPITALIZED, ICU)
+N_STATES = 6
+
+# Case severities of people who are quarantined for as long as they are infected
+QUARANTINED_SEVERITIES = ("Hospitalization", "ICU")
+
+SEVERITY_CODES = CATEGORICAL_CODES["case_severity"]
+QUARANTINED_SEVERITY_CODES = [SEVERITY_CODES[severity] for severity in QUARANTINED_SEVERITIES]
+# Disease parameter holding the range of the length of the infection, for each case severity
+SEVERITY_DAYS = {"Mild": "mild_days", "Hospitalization": "hospital_days", "ICU": "ICU_days", "Death": "die_days"}
+
+
+def severity_table(severity_params):
+    """Function to build the probability of each case severity for each age range, from the case severity file.
+
+    Parameters
+    ----------
+    severity_params : dict
+        The parsed case severity file.
+
+    Returns
+    -------
+    table : :obj:`np.array` of :obj:`float`
+        The probability of each case severity (columns) for each age range (rows), in the order
+        of the options in constants.py. Age ranges or severities missing from the file are NaN.
+    """
+
+    return np.array([[severity_params.get(age, {}).get(severity, np.nan) for severity in constants.SEVERITY_OPTIONS]
+                     for age in constants.AGE_OPTIONS], dtype=float)
+
+
+def demographic_tables(demographics):
+    """Function to build the age, job and house size weights from the demographics file.
+
+    Parameters
+    ----------
+    demographics : dict
+        The parsed demographics file.
+
+    Returns
+    -------
+    age_weights : :obj:`np.array` of :obj:`float`
+    job_weights : :obj:`np.array` of :obj:`float`
+    house_weights : :obj:`np.array` of :obj:`float`
+    """
+
+    return (np.array([demographics['age_weights'][age_range] for age_range in constants.AGE_OPTIONS]),
+            np.array([demographics['job_weights'][job_type] for job_type in constants.JOB_OPTIONS]),
+            np.array([demographics['house_weights'][house_size] for house_size in constants.HOUSE_OPTIONS]))
+
+
+class PopulationView(Sequence):
+    """A read only sequence of the people of a population, including visitors.
+
+    The people are created as views onto the agent store when they are indexed, so
+    the sequence can be handed out without building a list of the whole population.
+    """
+
+    def __init__(self, population, size):
+        """ __init__ method docstring.
+
+        Parameters
+        ----------
+        population : :obj:`cv19.population.Population`
+            The population holding the people.
+        size : int
+            The number of people in the sequence.
+        """
+
+        self.population = population
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.size))]
+        if not -self.size <= index < self.size:
+            raise IndexError("population index out of range")
+        return self.population.get_person(index % self.size)
 
 
 class Population:
     """Creates a population of people based on the total population
      uses and age distrubution to weight the assignment of ages.
 
-     Susceptible list has negative values for infected, and positive indicies for suseptible.
-     Infected list has negative values for healthy, and positive indicies for infected.
-     Recovered list has negative values for not recovered, and postitive indicies for
-     recovered.
+     The compartment of each person (susceptible, infected, hospitalized, ICU, recovered
+     or dead) is held in a single state array. People only change compartment through
+     the transition methods of this class (infect, cure, die and their update_* versions),
+     which also keep the number of people in each compartment and with each variant, so
+     that all count_* methods are O(1). In the same way, people are only quarantined, released
+     and vaccinated through the methods of this class, which keep the number of people of the
+     population (visitors excluded) in quarantine and vaccinated.
+
+     Changes of state that are known in advance (the end of an infection, the onset of
+     symptoms and the start and end of a quarantine) are scheduled in an event calendar
+     when they become known, so that each day only the people with an event due are updated.
      """
 
     def __init__(self, sim_obj):
@@ -44,7 +138,6 @@ class Population:
         # Student parameter
         self.nStudents = sim_obj.num_students  # full capacity ~ 24k students
 
-        self.population = [NULL_ID] * self.nPop_w_vis  # The list to hold all person objects
         self.household = [0] * self.nPop  # list of non-student houses (list that contains all lists of the people in the house)
         self.students = [0] * self.nStudents  # The list of only students
         self.stud_houses = [0] * self.nStudents  # list of student houses
@@ -58,7 +151,7 @@ class Population:
         houseIndex = 0
         totalHouse = 0
         while totalHouse < self.nPop - self.nStudents:
-            houseSize = np.random.choice(a=self.house_options, p=self.house_weights)
+            houseSize = self.rng.choice(a=self.house_options, p=self.house_weights)
             totalHouse += houseSize
             self.household[houseIndex] = houseSize
             houseIndex += 1
@@ -72,7 +165,7 @@ class Population:
         studTotalHouse = 0
         count = 0
         while studTotalHouse < self.nStudents:
-            studHouseSize = np.random.choice(a=self.house_options, p=self.house_weights)
+            studHouseSize = self.rng.choice(a=self.house_options, p=self.house_weights)
             studTotalHouse += studHouseSize
             self.stud_houses[studHouseIndex] = studHouseSize
             studHouseIndex += 1
@@ -86,134 +179,45 @@ class Population:
 
         # Initialize parameters of people immediately.
         # Much quick this way, utilizes numpy efficiency.
-        age_arr = np.random.choice(a=self.age_options, p=self.age_weights, size=self.nPop)
-        job_arr = np.random.choice(a=self.job_options, p=self.job_weights, size=self.nPop)
-        isolation_tend_arr = np.random.choice(a=self.isolation_options, p=self.isolation_weights, size=self.nPop)
-        case_severity_arr = np.empty(shape=self.nPop, dtype=object)
-        # case severity now changes to depending on the age
-
-        for i, age in enumerate(age_arr):
-            try:
-                case_severity_arr[i] = np.random.choice(a=self.severity_options,
-                                                        p=[self.severity_params[age][key] for key in constants.SEVERITY_OPTIONS])
-            except KeyError as e:
-                raise ValueError((f"'{age}' is not a valid age range and has no associated case severity.")) from e
+        # Categorical attributes are drawn directly as their integer codes (indices into the options).
+        nGeneral = self.nPop - self.nStudents
+        age_arr = self.rng.choice(len(self.age_options), p=self.age_weights, size=self.nPop)
+        job_arr = self.rng.choice(len(self.job_options), p=self.job_weights, size=self.nPop)
+        isolation_tend_arr = self.rng.choice(len(self.isolation_options), p=self.isolation_weights, size=self.nPop)
+        mask_type_arr = self.rng.choice(len(self.mask_options), p=self.mask_weights, size=self.nPop)
+        has_mask_arr = self.rng.random(size=self.nPop) < self.prob_has_mask
+        vaccine_type_arr = self.rng.choice(len(self.vaccine_options), p=self.vaccine_weights, size=self.nPop)
 
-        mask_type_arr = np.random.choice(a=self.mask_options, p=self.mask_weights, size=self.nPop)
-        has_mask_arr = np.random.uniform(size=self.nPop) < self.prob_has_mask
-        vaccine_type_arr = np.random.choice(a=self.vaccine_options, p=self.vaccine_weights, size=self.nPop)
+        # Students
+        student_ages = [AgentStore.encode("age", age) for age in ['10-19', '20-29']]  # students age ranges 10-19 and 20-29
+        age_arr[nGeneral:] = self.rng.choice(a=student_ages, p=[0.5, 0.5], size=self.nStudents)
+        job_arr[nGeneral:] = AgentStore.encode("job", "Student")
 
-        # Initialize the house index and size for the loop
-        houseIndex = 0
-        houseSize = self.household[houseIndex]
-
-        for i in range(0, self.nPop - self.nStudents):
-            # check if the house size is 0 at the beginning
-            if houseSize == 0:
-                houseIndex += 1
-                houseSize = self.household[houseIndex]
-
-            # MAKE A PERSON
-            newPerson = Person(index=i,
-                               sim_obj=sim_obj,
-                               infected=False,
-                               recovered=False,
-                               dead=False,
-                               hospitalized=False,
-                               ICU=False,
-                               quarantined=False,
-                               quarantined_day=None,
-                               infected_day=None,
-                               recovered_day=None,
-                               death_day=None,
-                               others_infected=None,
-                               cure_days=None,
-                               recent_infections=None,
-                               age=age_arr[i],
-                               job=job_arr[i],
-                               house_index=houseIndex,
-                               vaccinated=False,
-                               vaccine_type=vaccine_type_arr[i],
-                               isolation_tendencies=isolation_tend_arr[i],
-                               case_severity=case_severity_arr[i],
-                               mask_type=mask_type_arr[i],
-                               has_mask=has_mask_arr[i],
-                               virus_type=None)
-
-            # ADD A PERSON
-            self.population[i] = newPerson
-
-            # Increment house info
-            houseSize -= 1
+        # case severity now changes to depending on the age
+        case_severity_arr = self.draw_case_severity(age_arr)
+
+        # All of the people are held in the agent store, with the visitors at the end
+        self.agents = AgentStore(self.nPop_w_vis, protocol_compliance=sim_obj.protocol_compliance)
+        self.agents.age[:self.nPop] = age_arr
+        self.agents.job[:self.nPop] = job_arr
+        self.agents.isolation_tendencies[:self.nPop] = isolation_tend_arr
+        self.agents.case_severity[:self.nPop] = case_severity_arr
+        self.agents.mask_type[:self.nPop] = mask_type_arr
+        self.agents.has_mask[:self.nPop] = has_mask_arr
+        self.agents.vaccine_type[:self.nPop] = vaccine_type_arr
+
+        # Houses are filled in order, so each house holds a consecutive range of people
+        self.agents.household[:nGeneral] = np.repeat(np.arange(len(self.household)), self.household)
+        self.agents.household[nGeneral:self.nPop] = np.repeat(np.arange(len(self.stud_houses)), self.stud_houses)
 
         # Create the array to hold the indices of people in the house
-        self.house_ppl_i = [np.tile(-1, size) for size in self.household]
-
-        # add people indices to the housing list
-        for i in range(0, self.nPop - self.nStudents):
-            housei = self.population[i].household
-            where = np.where(self.house_ppl_i[housei] == -1)[0][0]
-            self.house_ppl_i[housei][where] = i
-
-        # Students
-        student_age = np.random.choice(a=['10-19', '20-29'], p=[0.5, 0.5], size=self.nStudents)  # students age ranges 10-19 and 20-29
-        student_case_severity_arr = np.empty(self.nStudents, dtype=object)
-        for i, age in enumerate(student_age):
-            try:
-                student_case_severity_arr[i] = np.random.choice(a=self.severity_options,
-                                                                p=[self.severity_params[age][key]
-                                                                   for key in constants.SEVERITY_OPTIONS])
-            except KeyError as e:
-                raise ValueError((f"'{age}' is not a valid age range and has no associated case severity.")) from e
+        self.house_ppl_i = np.split(np.arange(nGeneral), np.cumsum(self.household)[:-1]) if self.household else []
+        self.house_stud_i = np.split(np.arange(nGeneral, self.nPop), np.cumsum(self.stud_houses)[:-1]) if self.stud_houses else []
 
         self.student_indices = np.zeros(self.nPop, dtype=int) + NULL_ID
+        self.student_indices[nGeneral:] = np.arange(nGeneral, self.nPop)  # set their student status
         self.res_houses = np.zeros(len(self.stud_houses), dtype=int) + NULL_ID  # student houses that are in residence will be nonzero
 
-        studHouseIndex = 0
-        studHouseSize = self.stud_houses[studHouseIndex]
-
-        for i in range(self.nPop - self.nStudents, self.nPop):
-            # check if the house size is 0 at the beginning
-            if studHouseSize == 0:
-                studHouseIndex += 1
-                studHouseSize = self.stud_houses[studHouseIndex]
-
-            newStudent = Person(index=i,
-                                sim_obj=sim_obj,
-                                infected=False,
-                                recovered=False,
-                                dead=False,
-                                hospitalized=False,
-                                ICU=False,
-                                quarantined=False,
-                                quarantined_day=None,
-                                infected_day=None,
-                                recovered_day=None,
-                                death_day=None,
-                                others_infected=None,
-                                cure_days=None,
-                                recent_infections=None,
-                                age=student_age[i - self.nPop + self.nStudents],  # adjust for index inconsistency
-                                job='Student',
-                                house_index=studHouseIndex,
-                                vaccinated=False,
-                                vaccine_type=vaccine_type_arr[i],
-                                isolation_tendencies=isolation_tend_arr[i],
-                                case_severity=student_case_severity_arr[i - self.nPop + self.nStudents],  # adjust for index inconsistency
-                                mask_type=mask_type_arr[i],
-                                has_mask=has_mask_arr[i],
-                                virus_type=None)
-
-            self.population[i] = newStudent
-
-            self.student_indices[i] = i  # set their student status
-
-            # Increment house info
-            studHouseSize -= 1
-
-        # Create the array to hold the indices of people in the house
-        self.house_stud_i = [np.tile(-1, size) for size in self.stud_houses]
-
         # create the residence list
         # this is probably not the most efficient it could be
         for house_size in range(1, 3):
@@ -227,50 +231,36 @@ class Population:
             if self.n_students_in_res >= (sim_obj.max_num_res_students - 1):
                 break
 
-        # Add the people indices to the list
-        for i in range(self.nPop - self.nStudents, self.nPop):
-            housei = self.population[i].household
-            where = np.where(self.house_stud_i[housei] == -1)[0][0]
-            self.house_stud_i[housei][where] = i
-
-        # Create person status arrays (visitors not included here)
-        # A non-negative index indicates that they are the property,
-        # NULL_ID (-1) indicates that they are /not/ the property.
-        self.susceptible = np.array(range(self.nPop), dtype=int)  # list of all susceptible individuals
-        self.infected = np.zeros(self.nPop, dtype=int) + NULL_ID  # list of all infected people
-        self.recovered = np.zeros(self.nPop, dtype=int) + NULL_ID  # list of recovered people
-        self.dead = np.zeros(self.nPop, dtype=int) + NULL_ID  # list of dead people
-        self.knows_infected = np.zeros(self.nPop, dtype=int) + NULL_ID  # list of people with positive test and still infected
-        self.hospitalized = np.zeros(self.nPop, dtype=int) + NULL_ID  # list of people hospitalized and in the ICU
-        self.ICU = np.zeros(self.nPop, dtype=int) + NULL_ID  # list of people in the ICU
-        self.quarantined = np.zeros(self.nPop, dtype=int) + NULL_ID  # list of people who are currently in quarantine
-        self.virus_types = np.zeros(self.nPop, dtype=int) + NULL_ID  # list of individuals with NULL_ID as virus type
-        self.vaccinated = np.zeros(self.nPop, dtype=int) + NULL_ID  # list of people who have been vaccinated
-        self.testing = []  # list of people waiting to be tested
+        # Create the person state array and its counters (visitors not included here).
+        # Quarantined and vaccinated people are counted by the agent store.
+        self.state = np.full(self.nPop, SUSCEPTIBLE, dtype=np.uint8)  # compartment of each person
+        self.state_counts = [0] * N_STATES  # number of people in each compartment
+        self.state_counts[SUSCEPTIBLE] = self.nPop
+        self.variant_counts = dict.fromkeys(self.virus_codes.values(), 0)  # number of infected people per virus code
+        self.n_infected_students = 0
+        self.n_quarantined = 0  # number of people of the population in quarantine, visitors excluded
+        self.n_vaccinated = 0  # number of people of the population vaccinated, visitors excluded
+        self.new_dead = []  # people who died since the interaction sites last removed the dead
+        self.events = EventCalendar(("infection_end", "symptom_onset", "quarantine_start", "quarantine_end"))
+        self.contact_log = ContactLog(sim_obj.ct_length)  # contacts over the days looked at by contact tracing
+        self.testing = deque()  # people waiting to be tested, in order; see agents.waiting_for_test
         self.test_sum = 0  # total number of tests that have been run
         self.quarantined_sum = 0  # total number of people in quarantine (created as the list was having indexing issues)
         self.new_quarantined_num = 0  # new people in quarantine
 
         # Infect the first n0 people for each virus type
         total_n0 = sum(v_id for _, v_id in sim_obj.variants.items())
-        init_infect_count, total_indices = 0, sample(range(self.nPop), total_n0)
+        init_infect_count, total_indices = 0, self.rng.choice(self.nPop, total_n0, replace=False)
         for virus_name in sim_obj.variants.keys():
             virus_code = sim_obj.variant_codes[virus_name]
             variant_infections = sim_obj.variants[virus_name]
 
-            for index_count in range(init_infect_count, init_infect_count + variant_infections):
-                i = total_indices[index_count]
-                self.population[i].infect(day=0, virus_type=virus_code)
-                self.infected[i] = i
-                self.virus_types[i] = virus_code
-                self.susceptible[i] = NULL_ID
+            self.infect_many(total_indices[init_infect_count:init_infect_count + variant_infections],
+                             virus_code, day=0)
             init_infect_count += variant_infections
 
         # Vaccinate first v0 people
-        v_indices = sample(range(self.nPop), self.v0)
-        for i in v_indices:
-            self.population[i].set_vaccinated(day=0)
-            self.vaccinated[i] = i
+        self.vaccinate_many(self.rng.choice(self.nPop, self.v0, replace=False), day=0)
 
     def load_attributes_from_sim_obj(self, sim_obj):
         """Method to load in attributes from the provided simulation class object.
@@ -286,6 +276,7 @@ class Population:
 
         # making sim_obj accessible
         self.sim_obj = sim_obj
+        self.rng = sim_obj.rng  # random number generator of the simulation
 
         attributes = sim_obj.parameters["population_data"].keys()
         for attr in attributes:
@@ -299,9 +290,8 @@ class Population:
         # case severity from disease params
         self.severity_options = constants.SEVERITY_OPTIONS
 
-        # assign severity weights
-        with open(self.case_severity_file, 'rb') as toml_file:
-            self.severity_params = tomli.load(toml_file)
+        # assign severity weights, shared by every population made from the same file
+        self.severity_probs = load_table(self.case_severity_file, severity_table)
 
         # format mask weights correctly
         self.mask_weights = np.array([self.mask_type[key] for key in constants.MASK_OPTIONS])
@@ -317,9 +307,6 @@ class Population:
         Sets all constants in the population class as self attributes of the population class.
         """
 
-        with open(self.demographics_file, 'rb') as toml_file:
-            disease_params = tomli.load(toml_file)
-
         self.age_options = constants.AGE_OPTIONS
         self.job_options = constants.JOB_OPTIONS
         self.house_options = constants.HOUSE_OPTIONS
@@ -331,21 +318,36 @@ class Population:
         self.isolation_weights /= float(sum(self.isolation_weights))  # this is the one we don't have data on yet
 
         # PULL DATA FROM THE TOML FILE #
-        # age #
-        self.age_weights = np.array([disease_params['age_weights'][age_range]
-                                     for age_range in self.age_options])
-
-        # Job #
-        self.job_weights = np.array([disease_params['job_weights'][job_type]
-                                     for job_type in self.job_options])
-
-        # House #
-        self.house_weights = np.array([disease_params['house_weights'][house_size]
-                                       for house_size in self.house_options])
+        # age, job and house weights, shared by every population made from the same file
+        self.age_weights, self.job_weights, self.house_weights = load_table(self.demographics_file, demographic_tables)
 
         # Cast this so they can be used as ints
         self.house_options = [int(x) for x in constants.HOUSE_OPTIONS]
 
+    def draw_case_severity(self, age_arr):
+        """Method to draw the case severity of people based on their age.
+
+        Parameters
+        ----------
+        age_arr : :obj:`np.array` of :obj:`int`
+            The age range code of each person (index into the age options).
+
+        Returns
+        -------
+        case_severity_arr : :obj:`np.array` of :obj:`int`
+            The case severity code of each person (index into the severity options).
+        """
+
+        case_severity_arr = np.zeros(shape=len(age_arr), dtype=np.int8)
+        for age_code in np.unique(age_arr):
+            has_age = age_arr == age_code
+            if np.isnan(self.severity_probs[age_code]).any():
+                raise ValueError((f"'{self.age_options[age_code]}' is not a valid age range and has no associated case severity."))
+            case_severity_arr[has_age] = self.rng.choice(len(self.severity_options), size=np.count_nonzero(has_age),
+                                                         p=self.severity_probs[age_code])
+
+        return case_severity_arr
+
     def get_population_size(self):
         """Method to return population size. Does not include visitors.
 
@@ -356,17 +358,16 @@ class Population:
         return self.nPop
 
     def get_population(self):
-        """Method to retrieve a list of the population, including visitors. Makes sure not to grab
-        empty visitor bins in the population array.
+        """Method to retrieve a read only sequence of the population, including visitors. Makes
+        sure not to grab empty visitor bins in the population array. Nothing is copied; use
+        list() on the result for a list of the people.
 
         Returns
         -------
-        self.has_mask: :obj:`np.array` of :obj:`int`
+        pop_list: :obj:`cv19.population.PopulationView`
         """
 
-        pop_list = self.population[:self.nPop + self.current_num_vis]
-
-        return pop_list
+        return PopulationView(self, self.nPop + self.current_num_vis)
 
     def get_student_indices(self):
         """Method to retrieve a list of the student indices.
@@ -396,118 +397,163 @@ class Population:
 
         """
 
-        self.current_num_vis = np.random.choice(a=self.sim_obj.N_VIS_OPTION, p=self.sim_obj.N_VIS_PROB)
-
-        visitors_ind = [x for x in range(self.nPop, self.nPop + self.current_num_vis)]
-        vis_age = np.random.choice(a=self.age_options, p=self.age_weights, size=self.current_num_vis)
-        vis_iso_tend = np.random.choice(a=self.isolation_options, p=self.isolation_weights, size=self.current_num_vis)
-        vis_has_mask = np.random.uniform(size=self.current_num_vis) < self.prob_has_mask
-        vis_mask_type = np.random.choice(a=self.mask_options, p=self.mask_weights, size=self.current_num_vis)
-        vis_cure_days = np.random.choice(self.max_infectious[self.sim_obj.vis_default_severity], size=self.current_num_vis)
-
-        for i in range(0, self.current_num_vis):
-            visitor = Person(index=visitors_ind[i],
-                             sim_obj=self.sim_obj,
-                             infected=True,
-                             recovered=False,
-                             dead=False,
-                             hospitalized=False,
-                             ICU=False,
-                             quarantined=False,
-                             quarantined_day=None,
-                             infected_day=day,
-                             recovered_day=None,
-                             death_day=None,
-                             others_infected=None,
-                             cure_days=vis_cure_days[i],
-                             recent_infections=None,
-                             vaccinated=False,
-                             age=vis_age[i],
-                             job="Visitor",
-                             house_index=None,
-                             isolation_tendencies=vis_iso_tend[i],
-                             case_severity=self.sim_obj.vis_default_severity,
-                             has_mask=vis_has_mask[i],
-                             virus_type=self.sim_obj.vis_default_virus_type,
-                             mask_type=vis_mask_type[i],
-                             days_until_symptoms=0)
-
-            self.population[self.nPop + i] = visitor
+        self.current_num_vis = self.rng.choice(a=self.sim_obj.N_VIS_OPTION, p=self.sim_obj.N_VIS_PROB)
+
+        visitors_ind = slice(self.nPop, self.nPop + self.current_num_vis)
+        vis_age = self.rng.choice(len(self.age_options), p=self.age_weights, size=self.current_num_vis)
+        vis_iso_tend = self.rng.choice(len(self.isolation_options), p=self.isolation_weights, size=self.current_num_vis)
+        vis_has_mask = self.rng.random(size=self.current_num_vis) < self.prob_has_mask
+        vis_mask_type = self.rng.choice(len(self.mask_options), p=self.mask_weights, size=self.current_num_vis)
+        vis_cure_days = self.rng.choice(self.max_infectious[self.sim_obj.vis_default_severity], size=self.current_num_vis)
+
+        # Visitors do not progress through the disease while in the simulation,
+        # so their default severity only sets their cure days and no case severity is stored.
+        self.agents.reset(visitors_ind)
+        self.agents.infected[visitors_ind] = True
+        self.agents.infected_day[visitors_ind] = day
+        self.agents.cure_days[visitors_ind] = vis_cure_days
+        self.agents.age[visitors_ind] = vis_age
+        self.agents.job[visitors_ind] = AgentStore.encode("job", "Visitor")
+        self.agents.isolation_tendencies[visitors_ind] = vis_iso_tend
+        self.agents.has_mask[visitors_ind] = vis_has_mask
+        self.agents.virus_type[visitors_ind] = self.virus_codes[self.sim_obj.vis_default_virus_type]
+        self.agents.mask_type[visitors_ind] = vis_mask_type
+        self.agents.days_until_symptoms[visitors_ind] = 0
 
     def remove_visitors(self):
         """Method to remove visitors from the simulation.
         """
 
-        for i in range(self.nPop, self.nPop_w_vis):
-            self.population[i] = NULL_ID
+        self.agents.reset(slice(self.nPop, self.nPop_w_vis))
         self.current_num_vis = 0
 
-        if len(self.get_population()) != self.nPop:
-            raise RuntimeError(("Population is not expected length after removing visitors "
-                               f"(expected {self.nPop}, is {len(self.get_population())})."))
-
     def get_susceptible(self):
         """Method to retrieve indicies of people suseptible.
 
         Returns
         -------
-        self.suseptible[self.suseptible != NULL_ID]: :obj:`np.array` of :obj:`int`
+        np.flatnonzero(self.state == SUSCEPTIBLE): :obj:`np.array` of :obj:`int`
         """
-        return self.susceptible[self.susceptible != NULL_ID]
+        return np.flatnonzero(self.state == SUSCEPTIBLE)
 
     def get_infected(self):
-        """Method to retrieve indicies of people infected.
+        """Method to retrieve indicies of people infected, including those in the hospital and ICU.
 
         Returns
         -------
-        self.infected[self.infected != NULL_ID]: :obj:`np.array` of :obj:`int`
+        np.flatnonzero((self.state >= INFECTED) & (self.state <= ICU)): :obj:`np.array` of :obj:`int`
         """
-        return self.infected[self.infected != NULL_ID]
+        return np.flatnonzero((self.state >= INFECTED) & (self.state <= ICU))
 
     def get_recovered(self):
         """Method to retrieve indicies of people recovered.
 
         Returns
         -------
-        self.recovered[self.recovered != NULL_ID]: :obj:`np.array` of :obj:`int`
+        np.flatnonzero(self.state == RECOVERED): :obj:`np.array` of :obj:`int`
         """
-        return self.recovered[self.recovered != NULL_ID]
+        return np.flatnonzero(self.state == RECOVERED)
 
     def get_dead(self):
         """Method to retrieve indicies of dead people.
 
         Returns
         -------
-        self.dead[self.dead != NULL_ID]: :obj:`np.array` of :obj:`int`
+        np.flatnonzero(self.state == DEAD): :obj:`np.array` of :obj:`int`
         """
-        return self.dead[self.dead != NULL_ID]
+        return np.flatnonzero(self.state == DEAD)
 
     def get_hospitalized(self):
-        """Method to retrieve indicies of the people hospitalized.
+        """Method to retrieve indicies of the people hospitalized (not including the ICU).
 
         Returns
         -------
-        self.hospitalized[self.hospitalized != NULL_ID]: :obj:`np.array` of :obj:`int`
+        np.flatnonzero(self.state == HOSPITALIZED): :obj:`np.array` of :obj:`int`
         """
-        return self.hospitalized[self.hospitalized != NULL_ID]
+        return np.flatnonzero(self.state == HOSPITALIZED)
 
     def get_ICU(self):
         """Method to retrieve indicies of the people in the ICU.
 
         Returns
         -------
-        self.ICU[self.ICU != NULL_ID]: :obj:`np.array` of :obj:`int`
+        np.flatnonzero(self.state == ICU): :obj:`np.array` of :obj:`int`
         """
-        return self.ICU[self.ICU != NULL_ID]
+        return np.flatnonzero(self.state == ICU)
 
     def get_quarantined(self):
         """Method to retrieve indicies of the people in quarantining.
 
         Returns
         -------
-        self.quarantined[self.quarantined != NULL_ID]: :obj:`np.array` of :obj:`int`
+        np.flatnonzero(self.agents.quarantined[:self.nPop]): :obj:`np.array` of :obj:`int`
+        """
+        return np.flatnonzero(self.agents.quarantined[:self.nPop])
+
+    def pop_new_dead(self):
+        """Method to retrieve the indices of the people who died since the last call, and clear them.
+
+        Returns
+        -------
+        new_dead: :obj:`np.array` of :obj:`int`
+        """
+        new_dead = np.array(self.new_dead, dtype=int)
+        self.new_dead.clear()
+        return new_dead
+
+    def get_housemates(self, index):
+        """Method to retrieve the indices of the other people living in the same house as a person.
+
+        Parameters
+        ----------
+        index : int
+            The index of the person in the population.
+
+        Returns
+        -------
+        : :obj:`np.array` of :obj:`int`
+            Empty for visitors, who do not live in a house.
         """
-        return self.quarantined[self.quarantined != NULL_ID]
+
+        return self.get_housemates_many(np.array([index]))[1]
+
+    def get_housemates_many(self, indices):
+        """Method to retrieve the other people living in the same house as each of many people.
+
+        Houses hold consecutive ranges of people, so the housemates are found from the start
+        and size of each house, without looking at the houses one at a time.
+
+        Parameters
+        ----------
+        indices : :obj:`np.array` of :obj:`int`
+            The indices of the people in the population. Visitors, who do not live in a house, are skipped.
+
+        Returns
+        -------
+        people : :obj:`np.array` of :obj:`int`
+            The index of the person of each (person, housemate) pair.
+        housemates : :obj:`np.array` of :obj:`int`
+            The index of the housemate of each pair.
+        """
+
+        indices = np.asarray(indices, dtype=int)
+        indices = indices[indices < self.nPop]
+        n_general = self.nPop - self.nStudents
+        houses = self.agents.household[indices]
+        in_student_house = indices >= n_general
+
+        # Start and size of the house of each person
+        starts, sizes = np.zeros(len(indices), dtype=int), np.zeros(len(indices), dtype=int)
+        house_types = ((~in_student_house, self.household, 0), (in_student_house, self.stud_houses, n_general))
+        for in_house_type, house_sizes, first_index in house_types:
+            house_starts = first_index + np.concatenate(([0], np.cumsum(house_sizes, dtype=int)))
+            starts[in_house_type] = house_starts[houses[in_house_type]]
+            sizes[in_house_type] = np.asarray(house_sizes, dtype=int)[houses[in_house_type]]
+
+        people = np.repeat(indices, sizes)
+        housemates = np.repeat(starts - np.cumsum(sizes) + sizes, sizes) + np.arange(sizes.sum())
+        is_other = people != housemates
+        return people[is_other], housemates[is_other]
 
     def get_residences(self):
         """Method to retrieve a list of the houses that are part of the residences.
@@ -528,95 +574,95 @@ class Population:
         return self.n_students_in_res
 
     def count_susceptible(self):
-        """Method to count the number of people susceptible in each bin.
+        """Method to count the number of people susceptible.
 
         Returns
         -------
-        np.count_nonzero(self.suseptible != NULL_ID): :obj:`np.array` of :obj:`int`
+        self.state_counts[SUSCEPTIBLE]: :obj:`int`
         """
-        return np.count_nonzero(self.susceptible != NULL_ID)
+        return self.state_counts[SUSCEPTIBLE]
 
     def count_infected(self):
-        """Method to count the number of people infected.
+        """Method to count the number of people infected, including those in the hospital and ICU.
 
         Returns
         -------
-        np.count_nonzero(self.infetced != NULL_ID): :obj:`np.array` of :obj:`int`
+        : :obj:`int`
         """
-        return np.count_nonzero(self.infected != NULL_ID)
+        return self.state_counts[INFECTED] + self.state_counts[HOSPITALIZED] + self.state_counts[ICU]
 
     def count_variant_cases(self, virus_name):
         """Method to count the number of people infected with a certain variant.
 
         Returns
         -------
-        np.count_nonzero(self.infetced != NULL_ID): :obj:`np.array` of :obj:`int`
+        self.variant_counts[virus_code]: :obj:`int`
         """
         virus_code = self.virus_codes[virus_name]
-        return np.count_nonzero(self.virus_types == virus_code)
+        return self.variant_counts[virus_code]
 
     def count_infected_students(self):
         """Method to count how many infected students there are.
 
         Returns
         -------
-        np.count_nonzero(np.logical_and(self.student_indices != NULL_ID, self.infected != NULL_ID)): :obj:`int`
+        self.n_infected_students: :obj:`int`
         """
-        return np.count_nonzero(np.logical_and(self.student_indices != NULL_ID, self.infected != NULL_ID))
+        return self.n_infected_students
 
     def count_recovered(self):
         """Method to count the number of people recovered.
 
         Returns
         -------
-        np.count_nonzero(self.recovered != NULL_ID): :obj:`np.array` of :obj:`int`
+        self.state_counts[RECOVERED]: :obj:`int`
         """
-        return np.count_nonzero(self.recovered != NULL_ID)
+        return self.state_counts[RECOVERED]
 
     def count_dead(self):
         """Method to count the number of people dead.
 
         Returns
         -------
-        np.count_nonzero(self.dead != NULL_ID): :obj:`np.array` of :obj:`int`
+        self.state_counts[DEAD]: :obj:`int`
         """
-        return np.count_nonzero(self.dead != NULL_ID)
+        return self.state_counts[DEAD]
 
     def count_hospitalized(self):
-        """Method to count the number of people in the hospital.
+        """Method to count the number of people in the hospital (not including the ICU).
 
         Returns
         -------
-        np.count_nonzero(self.hospitalized != NULL_ID): :obj:`np.array` of :obj:`int`
+        self.state_counts[HOSPITALIZED]: :obj:`int`
         """
-        return np.count_nonzero(self.hospitalized != NULL_ID)
+        return self.state_counts[HOSPITALIZED]
 
     def count_ICU(self):
         """Method to count the number of people in the ICU.
 
         Returns
         -------
-        np.count_nonzero(self.ICU != NULL_ID): :obj:`np.array` of :obj:`int`
+        self.state_counts[ICU]: :obj:`int`
         """
-        return np.count_nonzero(self.ICU != NULL_ID)
+        return self.state_counts[ICU]
 
     def count_quarantined(self):
         """Method to count the number of people quarantining.
 
         Returns
         -------
-        np.count_nonzero(self.quarantined != NULL_ID): :obj:`np.array` of :obj:`int`
+        self.n_quarantined: :obj:`int`
         """
-        return np.count_nonzero(self.quarantined != NULL_ID)
+        return self.n_quarantined
 
     def count_masks(self):
         """Method to count the number of people wearing masks.
 
         Returns
         -------
-        np.count_nonzero(self.has_mask > 0): :obj:`np.array` of :obj:`int`
+        np.count_nonzero(self.agents.has_mask[:self.nPop]): :obj:`int`
         """
-        return np.count_nonzero(self.has_mask > 0)
+        return np.count_nonzero(self.agents.has_mask[:self.nPop])
 
     def count_virus_types(self):
         """Method to count all virus types and return them as a dictionary.
@@ -625,7 +671,7 @@ class Population:
         -------
         counts : :obj:`dict`
         """
-        counts = {virus_type: np.count_nonzero(self.virus_types == virus_code)
+        counts = {virus_type: self.variant_counts[virus_code]
                   for virus_type, virus_code in self.variant_codes.items()}
         return counts
 
@@ -634,9 +680,93 @@ class Population:
 
         Returns
         -------
-        np.population[index]: :obj:`int`
+        : :obj:`cv19.person.Person`
+            A view onto the row of the agent store holding this person.
         """
-        return self.population[index]
+        return Person.from_store(self.agents, index, self.sim_obj)
+
+    def transition(self, index, new_state):
+        """Method to move a person to a new compartment, keeping all of the counters up to date.
+
+        This is the only place the state array is changed. The variant and infected student
+        counters are updated when a person enters or leaves one of the infected compartments,
+        using the virus type held in the agent store.
+
+        Parameters
+        ----------
+        index : int
+            The index of the person in the population.
+        new_state : int
+            The code of the compartment the person is moving to.
+        """
+
+        old_state = self.state[index]
+        self.state[index] = new_state
+        self.state_counts[old_state] -= 1
+        self.state_counts[new_state] += 1
+        if new_state == DEAD:
+            self.new_dead.append(index)
+
+        was_infected = old_state in INFECTED_STATES
+        is_infected = new_state in INFECTED_STATES
+        if was_infected != is_infected:
+            change = 1 if is_infected else -1
+            self.variant_counts[self.agents.virus_type[index]] += change
+            if self.student_indices[index] != NULL_ID:
+                self.n_infected_students += change
+
+    def transition_many(self, indices, new_states):
+        """Method to move many people to new compartments at once, keeping all of the counters up to date.
+
+        The vectorized version of transition, for indices that are all distinct.
+
+        Parameters
+        ----------
+        indices : :obj:`np.array` of :obj:`int`
+            The indices of the people in the population.
+        new_states : :obj:`np.array` of :obj:`int`
+            The code of the compartment each person is moving to.
+        """
+
+        old_states = self.state[indices]
+        self.state[indices] = new_states
+        counts = np.bincount(new_states, minlength=N_STATES) - np.bincount(old_states, minlength=N_STATES)
+        for state, change in enumerate(counts.tolist()):
+            self.state_counts[state] += change
+        self.new_dead.extend(indices[new_states == DEAD].tolist())
+
+        infected_states = list(INFECTED_STATES)
+        change = (np.isin(new_states, infected_states).astype(int)
+                  - np.isin(old_states, infected_states).astype(int))
+        changed = np.flatnonzero(change)
+        if len(changed) == 0:
+            return
+
+        indices, change = indices[changed], change[changed]
+        virus_types = self.agents.virus_type[indices]
+        for virus_code in np.unique(virus_types).tolist():
+            self.variant_counts[virus_code] += int(change[virus_types == virus_code].sum())
+        self.n_infected_students += int(change[self.student_indices[indices] != NULL_ID].sum())
+
+    def infected_state(self, index):
+        """Method to find the infected compartment of a person from the care they need.
+
+        Parameters
+        ----------
+        index : int
+            The index of the person in the population.
+
+        Returns
+        -------
+        : :obj:`int`
+            ICU, HOSPITALIZED or INFECTED.
+        """
+
+        if self.agents.ICU[index]:
+            return ICU
+        if self.agents.hospitalized[index]:
+            return HOSPITALIZED
+        return INFECTED
 
     def infect(self, index, day, virus_type):
         """Method to infect a person.
@@ -657,17 +787,107 @@ class Population:
         if isinstance(virus_type, str):
             virus_type = self.virus_codes[virus_type]
 
-        didWork = self.population[index].infect(day=day, virus_type=virus_type)
-        if didWork:
-            self.infected[index] = index
-            self.susceptible[index] = NULL_ID
-            self.virus_types[index] = virus_type
-            if self.population[index].ICU:
-                self.ICU[index] = index
-            elif self.population[index].hospitalized:
-                self.hospitalized[index] = index
+        return len(self.infect_many([index], virus_type, day)) > 0
 
-        return didWork
+    def infect_many(self, indices, virus_codes, day):
+        """Method to infect many people at once.
+
+        People who are already infected, recovered or dead are skipped, as are repeated
+        indices after their first occurrence. The symptom onset and the length of the
+        infection of everyone infected are drawn in one vectorized call per case severity.
+
+        Parameters
+        ----------
+        indices : :obj:`np.array` of :obj:`int`
+            The indices of the people to be infected.
+        virus_codes : int or :obj:`np.array` of :obj:`int`
+            The code of the virus type each person is infected with, or a single code for all of them.
+        day : int or :obj:`np.array` of :obj:`int`
+            The day each person was infected on, or a single day for all of them.
+
+        Returns
+        -------
+        indices : :obj:`np.array` of :obj:`int`
+            The indices of the people that were infected.
+        """
+
+        agents = self.agents
+        d_params = self.sim_obj.disease_parameters
+
+        indices = np.asarray(indices, dtype=int)
+        virus_codes = np.broadcast_to(np.asarray(virus_codes, dtype=int), indices.shape)
+        days = np.broadcast_to(np.asarray(day, dtype=int), indices.shape)
+
+        # Keep the first occurrence of each person who can be infected, in the order given
+        _, first = np.unique(indices, return_index=True)
+        first.sort()
+        first = first[~(agents.infected[indices[first]] | agents.recovered[indices[first]]
+                        | agents.dead[indices[first]])]
+        indices, virus_codes, days = indices[first], virus_codes[first], days[first]
+        n_infected = len(indices)
+        if n_infected == 0:
+            return indices
+
+        agents.infected[indices] = True
+        agents.virus_type[indices] = virus_codes
+        agents.infected_day[indices] = days
+        agents.will_get_symptoms[indices] = True
+        agents.days_until_symptoms[indices] = self.rng.integers(d_params["days_before_symptoms"]["min"],
+                                                                d_params["days_before_symptoms"]["max"],
+                                                                size=n_infected)
+
+        # Draw the length of the infection for each case severity (no severity is a mild case)
+        severities = agents.case_severity[indices]
+        severities = np.where(severities == NULL_ID, SEVERITY_CODES["Mild"], severities)
+        for severity, days_key in SEVERITY_DAYS.items():
+            group = indices[severities == SEVERITY_CODES[severity]]
+            if len(group) == 0:
+                continue
+            agents.cure_days[group] = self.rng.integers(d_params[days_key]["min"], d_params[days_key]["max"],
+                                                        size=len(group))
+            if severity == "Mild":
+                # Only some mild cases show symptoms
+                asymptomatic = group[self.rng.random(len(group)) > d_params["mild_symptom_prob"]]
+                agents.will_get_symptoms[asymptomatic] = False
+                agents.days_until_symptoms[asymptomatic] = NULL_INT
+            else:
+                # Assuming that all hospitalization or worse cases will show symptoms
+                agents.hospitalized[group] = True
+                agents.ICU[group] = severity in ("ICU", "Death")
+
+        new_states = np.where(agents.ICU[indices], ICU,
+                              np.where(agents.hospitalized[indices], HOSPITALIZED, INFECTED))
+        self.transition_many(indices, new_states)
+        self.schedule_infections(indices)
+
+        return indices
+
+    def schedule_infections(self, indices):
+        """Method to schedule the events of newly infected people.
+
+        Schedules the end of their infection (when they are cured or die), the onset of their
+        symptoms if they will get any, and the start of their quarantine if their case is severe
+        enough that they are quarantined for as long as they are infected.
+
+        Parameters
+        ----------
+        indices : :obj:`np.array` of :obj:`int`
+            The indices of the infected people.
+        """
+
+        agents = self.agents
+        indices = np.asarray(indices, dtype=int)
+        infected_days = agents.infected_day[indices].astype(int)
+
+        self.events.schedule_many("infection_end", infected_days + agents.cure_days[indices], indices)
+
+        symptomatic = agents.will_get_symptoms[indices]
+        self.events.schedule_many("symptom_onset",
+                                  infected_days[symptomatic] + agents.days_until_symptoms[indices[symptomatic]],
+                                  indices[symptomatic])
+
+        quarantined = np.isin(agents.case_severity[indices], QUARANTINED_SEVERITY_CODES)
+        self.events.schedule_many("quarantine_start", infected_days[quarantined], indices[quarantined])
 
     def infect_incoming_students(self, indices, day, virus_type):
         """Method to infect incoming students to the simulation.
@@ -685,13 +905,13 @@ class Population:
             True to infect the student.
         """
 
-        for i in indices:
-            daysAgo = np.random.randint(13)
-            self.infect(index=i, day=day - daysAgo, virus_type=virus_type)
+        # Each student was infected up to 12 days before arriving
+        days_ago = self.rng.integers(13, size=len(indices))
+        self.infect_many(indices, virus_type, day - days_ago)
         return True
 
     def update_infected(self, index):
-        """Method to update the list of the infected population at the specified index.
+        """Method to update the state of a person in the population after they have been infected.
 
         Parameters
         ----------
@@ -701,14 +921,14 @@ class Population:
         Returns
         -------
         : :obj:`bool`
-            True if the value at the index in the infected list was changed, False if it was not changed.
+            True if the state of the person was changed, False if it was not changed.
         """
 
-        if self.infected[index] == index or self.susceptible[index] == NULL_ID or not self.population[index].is_infected():
+        if self.state[index] != SUSCEPTIBLE or not self.agents.infected[index]:
             # Already infected, or cant be infected
             return False
-        self.infected[index] = index
-        self.susceptible[index] = NULL_ID
+        self.transition(index, self.infected_state(index))
+        self.schedule_infections([index])
         return True
 
     def cure(self, index, day):
@@ -726,14 +946,13 @@ class Population:
         didWork: :obj:`int`
         """
 
-        didWork = self.population[index].check_cured(day)
+        didWork = self.get_person(index).check_cured(day)
         if didWork:
-            self.infected[index] = NULL_ID
-            self.recovered[index] = index
+            self.transition(index, RECOVERED)
         return didWork
 
     def update_cured(self, index):
-        """Method to update the list of the already cured population.
+        """Method to update the state of a person in the population after they have been cured.
 
         Parameters
         ----------
@@ -743,17 +962,13 @@ class Population:
         Returns
         -------
         : :obj:`bool`
-            True if the value at the index in the cured list was changed, False if it was not changed.
+            True if the state of the person was changed, False if it was not changed.
         """
 
-        if self.recovered[index] == index or not self.population[index].is_recovered():
+        if self.state[index] == RECOVERED or not self.agents.recovered[index]:
             # Already recovered in pop obj or person obj is not actually recovered
             return False
-        self.infected[index] = NULL_ID
-        self.recovered[index] = index
-        self.hospitalized[index] = NULL_ID
-        self.virus_types[index] = NULL_ID
-        self.ICU[index] = NULL_ID
+        self.transition(index, RECOVERED)
         return True
 
     def die(self, index, day):
@@ -771,15 +986,13 @@ class Population:
         didWork: :obj:`bool`
         """
 
-        didWork = self.population[index].check_dead(day)
+        didWork = self.get_person(index).check_dead(day)
         if didWork:
-            self.infected[index] = NULL_ID
-            self.recovered[index] = NULL_ID
-            self.dead[index] = index
+            self.transition(index, DEAD)
         return didWork
 
     def update_dead(self, index):
-        """Method to update the list of the dead population at the specified index.
+        """Method to update the state of a person in the population after they have died.
 
         Parameters
         ----------
@@ -789,32 +1002,189 @@ class Population:
         Returns
         -------
         : :obj:`bool`
-            True if the value at the index in the dead list was changed, False if it was not changed.
+            True if the state of the person was changed, False if it was not changed.
         """
 
-        if self.dead[index] == index or not self.population[index].is_dead():
+        if self.state[index] == DEAD or not self.agents.dead[index]:
             return False
-        self.infected[index] = NULL_ID
-        self.recovered[index] = NULL_ID
-        self.hospitalized[index] = NULL_ID
-        self.virus_types[index] = NULL_ID
-        self.ICU[index] = NULL_ID
-        self.dead[index] = index
+        self.transition(index, DEAD)
         return True
 
+    def quarantine_many(self, indices, day):
+        """Method to put many people into quarantine at once, as quarantine does for one person.
+
+        Parameters
+        ----------
+        indices : :obj:`np.array` of :obj:`int`
+            The indices of the people to quarantine. Repeated indices are quarantined once.
+        day : int
+            The day value that this function is being called on in the encompassing simulation class.
+
+        Returns
+        -------
+        indices : :obj:`np.array` of :obj:`int`
+            The indices of the people who were not already quarantined.
+        """
+
+        agents = self.agents
+        indices = np.unique(indices)
+        indices = indices[~agents.quarantined[indices]]
+
+        agents.quarantined_day[indices] = day
+        agents.quarantined[indices] = True
+        self.n_quarantined += int(np.count_nonzero(indices < self.nPop))
+
+        self.events.schedule_many("quarantine_end", np.full(len(indices), day + self.sim_obj.quarantine_time), indices)
+        released = indices[np.isin(self.state[indices], (RECOVERED, DEAD))]
+        self.events.schedule_many("quarantine_end", np.full(len(released), day), released)
+        return indices
+
+    def trace_contacts(self, positives, day):
+        """Method to notify and quarantine the contacts of people who tested positive, all at once.
+
+        The contacts of the last ct_length days are found with one pass over the contact log, and
+        housemates are added as personal contacts. Each personal contact is remembered by the
+        positive person with probability ct_prob_remember_personal_contacts, and positive people
+        with the contact tracing app notify every contact. Everyone notified is quarantined.
+
+        Parameters
+        ----------
+        positives : :obj:`np.array` of :obj:`int`
+            The indices of the people who tested positive and have their contacts traced.
+        day : int
+            Current day in the simulation.
+
+        Returns
+        -------
+        notified : :obj:`np.array` of :obj:`int`
+            The indices of everyone who was notified of a positive contact.
+        """
+
+        end = day + 1
+        first, second, personal = self.contact_log.get_log(end - self.sim_obj.ct_length, end)
+
+        # (positive, contact) pairs from either side of each logged contact, and from the houses
+        is_positive = np.zeros(len(self.agents), dtype=bool)
+        is_positive[positives] = True
+        from_first, from_second = is_positive[first], is_positive[second]
+        people, housemates = self.get_housemates_many(positives)
+        tracers = np.concatenate((first[from_first], second[from_second], people)).astype(int)
+        contacts = np.concatenate((second[from_first], first[from_second], housemates)).astype(int)
+        is_personal = np.concatenate((personal[from_first], personal[from_second], np.ones(len(people), dtype=bool)))
+
+        # Each contact of a positive person is only notified once by them, as a personal contact if
+        # they were ever a personal contact
+        pair_keys, pair_index = np.unique(tracers * len(self.agents) + contacts, return_inverse=True)
+        tracers, contacts = np.divmod(pair_keys, len(self.agents))
+        is_personal = np.bincount(pair_index.ravel(), weights=is_personal, minlength=len(pair_keys)) > 0
+
+        remembered = np.zeros(len(pair_keys), dtype=bool)
+        remembered[is_personal] = (self.rng.random(np.count_nonzero(is_personal))
+                                   < self.sim_obj.ct_prob_remember_personal_contacts)
+        notified = np.unique(contacts[remembered | self.agents.has_ct_app[tracers]])
+
+        self.quarantine_many(notified, day)
+        return notified
+
+    def quarantine(self, index, day):
+        """Method to put a person into quarantine, and schedule the day they will leave it.
+
+        People who are already recovered or dead when quarantined are released the same day
+        (see `release_quarantine`).
+
+        Parameters
+        ----------
+        index : int
+            The index of the person to quarantine.
+        day : int
+            The day value that this function is being called on in the encompassing simulation class.
+
+        Returns
+        -------
+        : :obj:`bool`
+            True if the person was not already quarantined, False if they were.
+        """
+
+        return len(self.quarantine_many([index], day)) > 0
+
+    def release_quarantine(self, indices, day):
+        """Method to release the people who are done quarantining from quarantine.
+
+        A person is done quarantining if they are recovered or dead, or if the quarantine time
+        has passed since they were quarantined. People who are not quarantined are skipped.
+
+        Parameters
+        ----------
+        indices : :obj:`np.array` of :obj:`int`
+            The indices of the people to check.
+        day : int
+            The day value that this function is being called on in the encompassing simulation class.
+
+        Returns
+        -------
+        released : :obj:`np.array` of :obj:`int`
+            The indices of the people released from quarantine.
+        """
+
+        agents = self.agents
+        indices = np.unique(indices)
+        indices = indices[agents.quarantined[indices]]
+        done = (agents.recovered[indices] | agents.dead[indices]
+                | (day - agents.quarantined_day[indices].astype(int) >= self.sim_obj.quarantine_time))
+        released = indices[done]
+
+        agents.quarantined[released] = False
+        agents.show_symptoms[released] = False
+        self.n_quarantined -= int(np.count_nonzero(released < self.nPop))
+        return released
+
     def update_quarantine(self, day):
         """Method to release everyone who has done their quarantine. This does not add new people to the list.
 
+        Only the people with a quarantine end scheduled for this day are checked. People with a
+        severe case who are still infected are put back into quarantine at the end of the day.
+
         Parameters
         ----------
         day : int
             The day value that this function is being called on in the encompassing simulation class.
         """
 
-        for i in self.get_quarantined():
-            # Check their status
-            if self.population[i].leave_quarantine(day):
-                self.quarantined[i] = NULL_ID
+        released = self.release_quarantine(self.events.pop_due("quarantine_end", day), day)
+        severe = self.agents.infected[released] & np.isin(self.agents.case_severity[released], QUARANTINED_SEVERITY_CODES)
+        self.events.schedule_many("quarantine_start", np.full(np.count_nonzero(severe), day), released[severe])
+
+    def update_disease_progression(self, day):
+        """Method to update everyone with an infection related event due on this day.
+
+        People with a severe case are quarantined, and people whose infection ends are either
+        cured or die depending on their case severity. Anyone still in quarantine when their
+        infection ends is released the following day.
+
+        Parameters
+        ----------
+        day : int
+            The day value that this function is being called on in the encompassing simulation class.
+        """
+
+        for i in self.events.pop_due("quarantine_start", day):
+            if self.agents.infected[i]:
+                self.quarantine(i, day)
+
+        for i in self.events.pop_due("infection_end", day):
+            person = self.get_person(i)
+
+            if person.get_case_severity() == "Death":
+                is_dead = person.check_dead(day)
+                if is_dead and not self.update_dead(index=i):
+                    warnings.warn("Did not die correctly.", RuntimeWarning)
+            else:
+                is_cured = person.check_cured(day)
+                if is_cured and not self.update_cured(index=i):
+                    warnings.warn("Did not cure correctly.", RuntimeWarning)
+
+            if person.is_quarantined():
+                self.events.schedule("quarantine_end", day + 1, i)
 
     def get_new_quarantined(self):
         """Method that retreves the number of new people quarantined that day.
@@ -838,18 +1208,29 @@ class Population:
         """Method that causes a random sample of people to develop cold like symptoms.
         """
 
-        for person in self.get_population():
-            person.update_uninfected_symptomatic()
+        n_agents = self.nPop + self.current_num_vis
+        has_cold = self.agents.has_cold[:n_agents]
+        rand = self.rng.random(size=n_agents)
+
+        # Either get over the cold, or catch a new one
+        cured_cold = has_cold & (rand <= 1 / self.sim_obj.cold_duration_days)
+        new_cold = ~has_cold & (rand <= self.sim_obj.cold_prob)
+
+        self.agents.show_symptoms[:n_agents][cured_cold] = False
+        self.agents.show_symptoms[:n_agents][new_cold] = True
+        has_cold[cured_cold] = False
+        has_cold[new_cold] = True
 
     def update_infected_symptomatics(self, day):
         """Method to add people to the testing waitlist based on their symptoms.
 
-        First iterates through the entire population to check who should be allowed to test again. Calling
-        the `person.has_been_tested_recently` function updates the testing ability of that person based on the day,
-        and returns `True` if that person can test again and `False` if not.
+        First processes the symptom onsets that are due, marking the people who start to show
+        symptoms of their infection. Everyone who has a cold or symptoms of their infection is then
+        checked, and their test day is cleared if their last test was more than the quarantine time
+        ago. This mirrors the `person.has_been_tested_recently` function.
 
-        The rest of the code creates a list of all people who could possibly be symptomatic and can test.
-        This list is looped through to judge whether a person should be added to the testing list.
+        Each symptomatic person who can test is then judged on whether they should be added to the
+        testing list. The waiting_for_test column of the agents keeps anyone from being added twice.
 
         Parameters
         ----------
@@ -857,20 +1238,32 @@ class Population:
             The current day the simulation is on.
         """
 
-        people_to_check = (person_id for person_id, person in enumerate(self.population[:self.nPop])
-                           if person.could_be_symptomatic() and not person.has_been_tested_recently(day))
+        agents = self.agents
+
+        # Start the symptoms of anyone still infected when their symptom onset is due
+        onset = self.events.pop_due("symptom_onset", day)
+        agents.has_covid_symptoms[onset[agents.infected[onset]]] = True
+
+        symptomatic = np.flatnonzero(agents.has_cold[:self.nPop] | agents.has_covid_symptoms[:self.nPop])
 
-        for person_id in people_to_check:
-            # Check if they are showing symptoms and update their status
-            if self.population[person_id].check_symptoms(day):
-                person = self.get_person(person_id)
+        # Let people test again once the quarantine time has passed since their last test
+        test_day = agents.test_day[symptomatic]
+        tested = test_day != NULL_INT
+        test_expired = tested & ((day - test_day.astype(int)) >= self.sim_obj.quarantine_time)
+        agents.test_day[symptomatic[test_expired]] = NULL_INT
+        symptomatic = symptomatic[~tested | test_expired]
 
-                # Calculate if they should be tested again
-                not_in_testing = person_id not in self.testing
-                will_comply = (random() / person.get_protocol_compliance()) < self.prob_of_test
+        # Update the symptoms of everyone that can test
+        agents.show_symptoms[symptomatic] = True
 
-                if not_in_testing and will_comply:
-                    self.testing.append(person_id)
+        # Calculate if they should be tested again
+        will_comply = (self.rng.random(size=len(symptomatic))
+                       / agents.protocol_compliance[symptomatic]) < self.prob_of_test
+
+        new_waiting = symptomatic[will_comply]
+        new_waiting = new_waiting[~agents.waiting_for_test[new_waiting]]
+        agents.waiting_for_test[new_waiting] = True
+        self.testing.extend(new_waiting.tolist())
 
     def get_testing_wait_list(self):
         """Method to return number of people waiting to be tested.
@@ -884,6 +1277,9 @@ class Population:
     def get_tested(self, n_tests_max, day):
         """Method to test people in the testing waitlist.
 
+        The people at the front of the wait list are tested together. Everyone who tests positive
+        is quarantined, and the contacts of up to ct_capacity of them are traced.
+
         Parameters
         ----------
         tests_per_day: int
@@ -899,47 +1295,43 @@ class Population:
         # Reset number of newly quarantined people.
         self.new_quarantined_num = 0
 
-        num_contacts_traced = 0
-        for _ in range(n_tests):
-            # Gets first person in the testing wait list and removes them.
-            person_index = self.testing.pop(0)
-            person = self.population[person_index]
-            person.set_test_day(day)
+        # Gets the first people in the testing wait list and removes them.
+        agents = self.agents
+        tested = np.array([self.testing.popleft() for _ in range(n_tests)], dtype=int)
+        agents.waiting_for_test[tested] = False
+        agents.test_day[tested] = day
 
-            # Assumes tests are 100% accurate, does not account for false negatives.
-            # TODO: implement a parameter for the testing accuracy.
-            if person.infected:
-                person.knows_infected = True
+        # Assumes tests are 100% accurate, does not account for false negatives.
+        # TODO: implement a parameter for the testing accuracy.
+        positive = agents.infected[tested]
+        agents.knows_infected[tested] = positive
+        positives = tested[positive]
 
-                # Quarantines the person.
-                person.set_quarantine(day)
-                self.new_quarantined_num += 1
+        # Quarantines the people who tested positive.
+        self.quarantine_many(positives, day)
+        self.new_quarantined_num += len(positives)
 
-                # Contact tracing.
-                if self.ct_enabled and num_contacts_traced < self.ct_capacity:
-                    person.contact_tracing(day=day)
-                    num_contacts_traced += 1
-
-            else:
-                person.knows_infected = False
+        # Contact tracing.
+        if self.ct_enabled and len(positives) > 0:
+            self.trace_contacts(positives[:self.ct_capacity], day)
 
     def get_vaccinated(self):
         """Method to retrieve indicies of people vaccinated.
 
         Returns
         -------
-        self.vaccinated[self.vaccinated != NULL_ID]: :obj:`np.array` of :obj:`int`
+        np.flatnonzero(self.agents.vaccinated[:self.nPop]): :obj:`np.array` of :obj:`int`
         """
-        return self.vaccinated[self.vaccinated != NULL_ID]
+        return np.flatnonzero(self.agents.vaccinated[:self.nPop])
 
     def count_vaccinated(self):
         """Method to count the number of people vaccinated.
 
         Returns
         -------
-        np.count_nonzero(self.vaccinated != NULL_ID): :obj:`np.array` of :obj:`int`
+        self.n_vaccinated: :obj:`int`
         """
-        return np.count_nonzero(self.vaccinated != NULL_ID)
+        return self.n_vaccinated
 
     def update_vaccinated(self, day):
         """Method to add people to the list of vaccinated people.
@@ -950,19 +1342,37 @@ class Population:
             The day the testing is being done on.
         """
 
-        non_vaccinated = np.array([index for index in range(self.nPop)
-                                   if not self.population[index].is_vaccinated()])
+        non_vaccinated = np.flatnonzero(~self.agents.vaccinated[:self.nPop])
 
         num_vacc = self.sim_obj.num_vaccinations
         num_to_vaccinate = num_vacc if len(non_vaccinated) >= num_vacc else len(non_vaccinated)
-        will_vaccinate = np.random.choice(range(len(non_vaccinated)), num_to_vaccinate, replace=False)
+        will_vaccinate = self.rng.choice(len(non_vaccinated), num_to_vaccinate, replace=False)
         self.to_vaccinate = non_vaccinated[will_vaccinate.astype(int)]
+        self.vaccinate_many(self.to_vaccinate, day)
+
+    def vaccinate_many(self, indices, day):
+        """Method to vaccinate many people at once. People who are already vaccinated are skipped.
+
+        Parameters
+        ----------
+        indices : :obj:`np.array` of :obj:`int`
+            The indices of the people to vaccinate.
+        day : int
+            The day in the simulation when the people are vaccinated.
+
+        Returns
+        -------
+        indices : :obj:`np.array` of :obj:`int`
+            The indices of the people who were not already vaccinated.
+        """
 
-        for index in self.to_vaccinate:
-            person_to_vaccinate = self.population[index]
+        indices = np.unique(indices)
+        indices = indices[~self.agents.vaccinated[indices]]
 
-            person_to_vaccinate.set_vaccinated(day)
-            self.vaccinated[index] = index
+        self.agents.vaccinated_day[indices] = day
+        self.agents.vaccinated[indices] = True
+        self.n_vaccinated += int(np.count_nonzero(indices < self.nPop))
+        return indices
 
     def change_mask_wearing(self):
         """Method to mandate wearing a mask.
@@ -972,5 +1382,4 @@ class Population:
         has_mask: bool
         """
 
-        for person in self.get_population():
-            person.has_mask = True
+        self.agents.has_mask[:self.nPop + self.current_num_vis] = True
@@ -1,19 +1,97 @@
+import os
 import warnings
 import subprocess
+import cProfile
+from functools import lru_cache
 from timeit import default_timer as timer
 from pathlib import Path
-import tomli
+from copy import deepcopy
 
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 
-from . import CV19ROOT
+from . import get_cv19_root
+from .config_cache import load_toml
 from .population import Population
 from .policy import Policy
 from .interaction_sites import InteractionSites
 
 
+@lru_cache(maxsize=None)
+def get_code_version():
+    """Function to get the version of the code from git.
+
+    Git is only asked once per process, as the code being run does not change.
+
+    Note
+    ----
+    This function should really be using the --dirty flag, but only based
+    on certain files. For example, local modifications to the notebook do not
+    matter, whereas any modifications to the main classes could.
+
+    Returns
+    -------
+    code_id : str or None
+        The git tag or commit ID, followed by '-dirty' if the cv19 package has local
+        modifications. None if it could not be found.
+    """
+
+    # By default, set the code identifier to None.
+    code_id = None
+
+    # Describe the tag as best as possible.
+    # Fall back to commit ID in the case of no existing tag.
+    git_version_cmd = ['git', 'describe', '--always', '--tag', '--abbrev=12']
+
+    try:
+        code_id = subprocess.check_output(git_version_cmd, text=True)
+        code_id = code_id.strip()
+
+    except subprocess.CalledProcessError as e:
+        warnings.warn((f"Command '{' '.join(git_version_cmd)}' returned a non-zero "
+                       f"exit code: {e.returncode}."))
+        print(e.output)
+
+    except OSError:
+        warnings.warn("Could not set code version from git.")
+
+    if code_id is not None:
+        # By default, assume no local modifications.
+        dirty = False
+
+        # Check for any differences.
+        git_dirty_cmd = ['git', 'diff', '--name-status', 'HEAD']
+
+        try:
+            diff_names = subprocess.check_output(git_dirty_cmd, text=True)
+            for line in diff_names.split('\n'):
+                # Need to check for any whitespace, if entire line is whitespace ignore.
+                name = line.split()[1] if line.strip() else ''
+
+                if name and str(Path(name).parents[0]) == 'cv19':
+                    dirty = True
+
+        except subprocess.CalledProcessError as e:
+            warnings.warn((f"Command '{' '.join(git_dirty_cmd)}' returned a non-zero "
+                           f"exit code: {e.returncode}."))
+            print(e.output)
+
+        except OSError:
+            warnings.warn("Could not set code version from git.")
+
+        if dirty:
+            code_id += '-dirty'
+
+    return code_id
+
+
+# Phases of a day of the simulation that are timed, in the order they are run
+SITE_GRADES = ("B", "A", "C", "FOOD", "LECT", "STUDY", "RES")
+TIMED_PHASES = (("tracking", "policy", "visitors")
+                + tuple(f"{step}_{grade}" for grade in SITE_GRADES for step in ("will_visit", "site_interaction"))
+                + ("masks", "house_interact", "student_house_interact", "testing", "quarantine", "vaccination",
+                   "progression"))
+
+
 class Simulation():
     """
     A class designed to host the actual monte-carlo simulation and to track the results.
@@ -25,18 +103,28 @@ class Simulation():
     ----------
     verbose : bool
         A variable indicating whether to print updates with simulation information while running.
+    tracking : dict of np.array
+        A dictionary holding a preallocated tracking array of length nDays for each tracked value,
+        written to by day while the simulation runs.
     tracking_df : pd.DataFrame
         A pandas DataFrame object that stores all the tracking arrays for a given simulation. Each
-        array is of length nDays.
+        array is of length nDays. Only built from the tracking arrays once it is first asked for,
+        after the simulation has run.
     virus_names : list of str
         A list of identifying codes for each virus type that could be in the simulation.
     track_virus_types : dict of np.array
         A dictionary containing the number of agents infected with each virus type in the simulation.
     has_run : bool
         A variable indicating if this object has run a simulaiton yet.
+    rng : np.random.Generator
+        The random number generator used for every random draw of the simulation.
+    timings : dict of np.array
+        The wall clock time (in seconds) spent on each phase of each day of the simulation,
+        see get_timings_dataframe.
     """
 
-    def __init__(self, config_file, config_dir="", config_override_data=None, verbose=False):
+    def __init__(self, config_file, config_dir="", config_override_data=None, verbose=False, code_version=None,
+                 seed=None):
         """ __init__ method docstring.
 
         Parameters
@@ -52,17 +140,26 @@ class Simulation():
             in configuration files other than main.
         verbose : bool
             A variable indicating whether to print updates with simulation information while running.
+        code_version : str
+            The version of the code being used to run the simulation. Found from the CV19_CODE_VERSION
+            environment variable or from git if not given.
+        seed : None, int, :obj:`np.random.SeedSequence` or :obj:`np.random.Generator`
+            Seed of the random number generator of the simulation. Simulations built with the same
+            seed give the same results. A fresh, unpredictable seed is used if None.
         """
 
         self.config_dir = config_dir
         self.load_general_parameters(config_file)
         self.load_disease_parameters(self.disease_config_file, config_override_data)
 
+        # All of the random numbers of the simulation are drawn from this generator
+        self.rng = np.random.default_rng(seed)
+
         self.init_classes()  # Have to initalize the classes after we have all of the parameters
 
         self.verbose = verbose  # Whether or not to print daily simulation information.
 
-        self.set_code_version()  # Set the version of the code being used to run simulation.
+        self.set_code_version(code_version)  # Set the version of the code being used to run simulation.
 
         self.make_tracking_df()
 
@@ -85,8 +182,7 @@ class Simulation():
         """
 
         if isinstance(data_file, str):
-            with open(data_file, 'rb') as file:
-                self.parameters = tomli.load(file)
+            self.parameters = load_toml(data_file)
 
             self.config_dir = Path(data_file).parent
 
@@ -122,35 +218,34 @@ class Simulation():
             Path to the disease configuration file.
         config_override_data : dict
             Dictionary containing possible override versions of the secondary configuration files.
-            Note, does not include paths to configuration files but the files themselves.
+            Note, does not include paths to configuration files but the files themselves. When
+            the disease configuration is given, the disease configuration file is not read.
 
         """
 
-        if config_override_data is not None:
-            self.disease_parameters = config_override_data['disease_config_data']
+        override = None if config_override_data is None else config_override_data.get('disease_config_data')
+        if override is not None:
+            self.disease_parameters = deepcopy(override)
+
+        # If path is absolute, use it.
+        elif Path(filename).is_absolute():
+            self.disease_parameters = load_toml(filename)
+
+        # Assume that the configuration filename is relative to path of main config.
+        # If not set, assume relative to working directory.
+        # Last attempt try relative to cv19 project directory.
         else:
-            # If path is absolute, use it.
-            if Path(filename).is_absolute():
-                with open(filename, 'rb') as file:
-                    self.disease_parameters = tomli.load(file)
-
-            # Assume that the configuration filename is relative to path of main config.
-            # If not set, assume relative to working directory.
-            # Last attempt try relative to cv19 project directory.
-            else:
-                filepath = Path(self.config_dir, filename)
-                try:
-                    with open(filepath, 'rb') as file:
-                        self.disease_parameters = tomli.load(file)
+            filepath = Path(self.config_dir, filename)
+            try:
+                self.disease_parameters = load_toml(filepath)
 
-                except FileNotFoundError:
-                    warnings.warn((f"Unable to find file: {filepath} "
-                                   "assuming directory is relative to main config. "
-                                   "Attempting read relative to CV19ROOT directory."))
+            except FileNotFoundError:
+                warnings.warn((f"Unable to find file: {filepath} "
+                               "assuming directory is relative to main config. "
+                               "Attempting read relative to CV19ROOT directory."))
 
-                    filepath = Path(CV19ROOT, filename)
-                    with open(filepath, 'rb') as file:
-                        self.disease_parameters = tomli.load(file)
+                filepath = Path(get_cv19_root(), filename)
+                self.disease_parameters = load_toml(filepath)
 
     def init_classes(self):
         """ Method that links the policy, population, and interaction sites class objects with
@@ -166,64 +261,30 @@ class Simulation():
         # Initalize the interaction sites
         self.inter_sites = InteractionSites(self)
 
-    def set_code_version(self):
+    def set_code_version(self, code_version=None):
         """Method to get and set the version of the code used to run the simulation.
 
-        Note
-        ----
-        This function should really be using the --dirty flag, but only based
-        on certain files. For example, local modifications to the notebook do not
-        matter, whereas any modifications to the main classes could.
-        """
-
-        # By default, set the code identifier to None.
-        self.code_id = None
-
-        # Describe the tag as best as possible.
-        # Fall back to commit ID in the case of no existing tag.
-        git_version_cmd = ['git', 'describe', '--always', '--tag', '--abbrev=12']
+        The version is taken from the code_version argument if given, then from the
+        CV19_CODE_VERSION environment variable if set (for installs without git), and
+        is otherwise read from git once per process (see get_code_version).
 
-        try:
-            self.code_id = subprocess.check_output(git_version_cmd, text=True)
-            self.code_id = self.code_id.strip()
-
-        except subprocess.CalledProcessError as e:
-            warnings.warn((f"Command '{' '.join(git_version_cmd)}' returned a non-zero "
-                           f"exit code: {e.returncode}."))
-            print(e.output)
-
-        except OSError:
-            warnings.warn("Could not set code version from git.")
-
-        if self.code_id is not None:
-            # By default, assume no local modifications.
-            dirty = False
-
-            # Check for any differences.
-            git_dirty_cmd = ['git', 'diff', '--name-status', 'HEAD']
-
-            try:
-                diff_names = subprocess.check_output(git_dirty_cmd, text=True)
-                for line in diff_names.split('\n'):
-                    # Need to check for any whitespace, if entire line is whitespace ignore.
-                    name = line.split()[1] if line.strip() else ''
-
-                    if name and str(Path(name).parents[0]) == 'cv19':
-                        dirty = True
-
-            except subprocess.CalledProcessError as e:
-                warnings.warn((f"Command '{' '.join(git_dirty_cmd)}' returned a non-zero "
-                               f"exit code: {e.returncode}."))
-                print(e.output)
+        Parameters
+        ----------
+        code_version : str
+            The version of the code, used instead of asking git for it.
+        """
 
-            except OSError:
-                warnings.warn("Could not set code version from git.")
+        if code_version is None:
+            code_version = os.environ.get("CV19_CODE_VERSION")
+        if code_version is None:
+            code_version = get_code_version()
 
-            if dirty:
-                self.code_id += '-dirty'
+        self.code_id = code_version
 
     def make_tracking_df(self):
-        """ Method to initalize the tracking dataframe for the simulation object
+        """ Method to initalize the tracking arrays for the simulation object
+
+        The tracking DataFrame is built from these arrays by get_tracking_dataframe.
         """
 
         # Create a dictionary with tracking arrays and correct datatypes
@@ -253,12 +314,19 @@ class Simulation():
             "gamma": np.zeros(self.nDays, dtype=float),
             "beta": np.zeros(self.nDays, dtype=float),
             "n_interactions": np.zeros(self.nDays, dtype=int),
+            "infected_students": np.zeros(self.nDays, dtype=int),
+            "mask_mandate": np.zeros(self.nDays, dtype=bool),
+            "lockdwn_mandate": np.zeros(self.nDays, dtype=bool),
+            "testing_mandate": np.zeros(self.nDays, dtype=bool),
         }
 
-        # Convert to a DataFrame object
-        self.tracking_df = pd.DataFrame(tracking_dict)
+        self.tracking = tracking_dict
+        self._tracking_df = None  # Built from the tracking arrays when first asked for
+
+        # Wall clock time (in seconds) spent on each phase of each day
+        self.timings = {phase: np.zeros(self.nDays, dtype=float) for phase in TIMED_PHASES}
 
-    def run(self, fail_on_rerun=True):
+    def run(self, fail_on_rerun=True, profile=None):
         """ Method that runs the monte-carlo simulation.
 
         This is the main function in the Simulation class that generates the tracking data. The
@@ -270,6 +338,9 @@ class Simulation():
         fail_on_rerun : bool
             Variable to indicate whether the code should return an error if same object is
             run multiple times.
+        profile : str or None
+            Path of a file to write a cProfile profile of the run to, in the pstats format. The
+            run is not profiled if None.
         """
 
         # Check whether the simulation has already been run.
@@ -283,9 +354,31 @@ class Simulation():
         if self.verbose:
             print(f"Simulation code version (from git): {self.code_id}\n")
 
+        if profile is None:
+            self._run_days()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                self._run_days()
+            finally:
+                profiler.disable()
+                profiler.dump_stats(profile)
+
+        self.has_run = True
+
+    def _run_days(self):
+        """ Method that runs the simulation over every day, and prints a summary of the run if verbose.
+        """
+
         # Get current time for measuring elapsed time of simulation.
         beg_time = timer()
 
+        # Any DataFrame built by a previous run is out of date
+        self._tracking_df = None
+        for timing in self.timings.values():
+            timing[:] = 0
+
         # Initalize variables to flag state changes
         old_mask_mandate = self.policy.initial_mask_mandate
         old_lockdown_mandate = self.policy.initial_lockdown_mandate
@@ -295,12 +388,15 @@ class Simulation():
         # Loop over the number of days
         for day in range(self.nDays):
 
+            phase_start = timer()
+
             # UPDATE TRACKING
             self.update_tracking_arrays(day)
-            self.tracking_df.at[day, "hospitalized"] = self.pop.count_hospitalized()
-            self.tracking_df.at[day, "mask_mandate"] = old_mask_mandate
-            self.tracking_df.at[day, "lockdwn_mandate"] = old_lockdown_mandate
-            self.tracking_df.at[day, "testing_mandate"] = old_testing_mandate
+            self.tracking["hospitalized"][day] = self.pop.count_hospitalized()
+            self.tracking["mask_mandate"][day] = old_mask_mandate
+            self.tracking["lockdwn_mandate"][day] = old_lockdown_mandate
+            self.tracking["testing_mandate"][day] = old_testing_mandate
+            phase_start = self.time_phase("tracking", day, phase_start)
 
             # UPDATE POLICY
             mask_mandate = self.policy.update_mask_mandate(day=day)
@@ -325,99 +421,85 @@ class Simulation():
 
             # infect random students on the day they come in
             if self.inter_sites.students_on and day == self.policy.student_day_trigger:
-                infStudents = np.random.randint(self.inf_students_lower, self.inf_students_upper)
-                indices = np.random.choice(self.pop.get_student_indices(), infStudents, replace=False)
+                infStudents = self.rng.integers(self.inf_students_lower, self.inf_students_upper)
+                indices = self.rng.choice(self.pop.get_student_indices(), infStudents, replace=False)
                 # Convert virus type to virus code
                 student_default_virus_code = self.variant_codes[self.student_default_virus_type]
                 self.pop.infect_incoming_students(indices=indices, day=day, virus_type=student_default_virus_code)
+            phase_start = self.time_phase("policy", day, phase_start)
 
             # ADD DAILY VISITORS
             self.pop.add_visitors(day)
+            phase_start = self.time_phase("visitors", day, phase_start)
 
             # UPDATE INTERACTION SITES
             self.inter_sites.daily_reset()
 
-            will_visit_B = self.inter_sites.will_visit_site(self.inter_sites.get_grade_B_sites(), self.will_go_prob["B"])
-            self.inter_sites.site_interaction(will_visit_B, day, personal=False, grade_code="B")
+            phase_start = self.interact_at_sites(self.inter_sites.get_grade_B_sites(), "B", False, day, phase_start)
             if not lockdown:
-                will_visit_A = self.inter_sites.will_visit_site(self.inter_sites.get_grade_A_sites(), self.will_go_prob["A"])
-                self.inter_sites.site_interaction(will_visit_A, day, personal=True, grade_code="A")
-                will_visit_C = self.inter_sites.will_visit_site(self.inter_sites.get_grade_C_sites(), self.will_go_prob["C"])
-                self.inter_sites.site_interaction(will_visit_C, day, personal=False, grade_code="C")
+                phase_start = self.interact_at_sites(self.inter_sites.get_grade_A_sites(), "A", True, day, phase_start)
+                phase_start = self.interact_at_sites(self.inter_sites.get_grade_C_sites(), "C", False, day, phase_start)
 
             if self.inter_sites.students_on and students_go:
-                will_visit_food = self.inter_sites.will_visit_site(self.inter_sites.get_food_sites(), self.will_go_prob["FOOD"])
-                self.inter_sites.site_interaction(will_visit_food, day, personal=True, grade_code="FOOD")
+                phase_start = self.interact_at_sites(self.inter_sites.get_food_sites(), "FOOD", True, day, phase_start)
                 if not lockdown:
-                    will_visit_lects = self.inter_sites.will_visit_site(self.inter_sites.get_lect_sites(),
-                                                                        self.will_go_prob["LECT"])
-                    self.inter_sites.site_interaction(will_visit_lects, day, personal=True, grade_code="LECT")
-                    will_visit_study = self.inter_sites.will_visit_site(self.inter_sites.get_study_sites(),
-                                                                        self.will_go_prob["STUDY"])
-                    self.inter_sites.site_interaction(will_visit_study, day, personal=False, grade_code="STUDY")
+                    phase_start = self.interact_at_sites(self.inter_sites.get_lect_sites(), "LECT", True, day, phase_start)
+                    phase_start = self.interact_at_sites(self.inter_sites.get_study_sites(), "STUDY", False, day, phase_start)
 
             # Manage masks
             if mask_mandate:
                 self.pop.change_mask_wearing()
+            phase_start = self.time_phase("masks", day, phase_start)
 
             # Manage at home interactions
             self.inter_sites.house_interact(day)
+            phase_start = self.time_phase("house_interact", day, phase_start)
             self.inter_sites.student_house_interact(day)
+            phase_start = self.time_phase("student_house_interact", day, phase_start)
 
             # Residence interactions
             if self.inter_sites.students_on and students_go:
-                will_visit_res = self.inter_sites.will_visit_site(self.inter_sites.get_res_sites(), self.will_go_prob["RES"])
-                self.inter_sites.site_interaction(will_visit_res, day, personal=True, grade_code="RES")
+                phase_start = self.interact_at_sites(self.inter_sites.get_res_sites(), "RES", True, day, phase_start)
 
             # Manage testing sites
             if testing_ON:
-                tests_per_day = self.policy.get_num_tests(self.tracking_df.at[day, "quarantined"],
-                                                          self.tracking_df.at[day, "new_quarantined"],
-                                                          self.tracking_df.at[day, "testing_wait_list"])
+                tests_per_day = self.policy.get_num_tests(self.tracking["quarantined"][day],
+                                                          self.tracking["new_quarantined"][day],
+                                                          self.tracking["testing_wait_list"][day])
                 self.inter_sites.testing_site(tests_per_day, day)
+            phase_start = self.time_phase("testing", day, phase_start)
 
             # Manage Quarantine
             self.pop.update_quarantine(day)
+            phase_start = self.time_phase("quarantine", day, phase_start)
 
             # Manage Vaccines
             self.pop.update_vaccinated(day)
+            phase_start = self.time_phase("vaccination", day, phase_start)
 
             # UPDATE POPULATION
 
             # remove the daily visitors
             self.pop.remove_visitors()
+            phase_start = self.time_phase("visitors", day, phase_start)
 
-            for index in self.pop.get_infected():
-                infected_person = self.pop.get_person(index=index)
+            self.pop.update_disease_progression(day)
+            self.time_phase("progression", day, phase_start)
 
-                if infected_person.get_case_severity() == "Death":
-                    is_dead = infected_person.check_dead(day)
-                    if is_dead and not self.pop.update_dead(index=infected_person.get_index()):
-                        warnings.warn("Did not die correctly.", RuntimeWarning)
-
-                else:
-                    # Update cured stuff
-                    is_cured = infected_person.check_cured(day)
-                    if is_cured and not self.pop.update_cured(index=infected_person.get_index()):
-                        warnings.warn("Did not cure correctly.", RuntimeWarning)
-
-                    # Update quarintine stuff
-                    infected_person.check_quarantine(day)
-
-            self.tracking_df.at[day, "time"] = timer() - beg_time
+            self.tracking["time"][day] = timer() - beg_time
 
             if self.verbose:
                 print((f"Day: {day}, "
-                       f"infected: {self.tracking_df.at[day, 'infected']}, "
-                       f"recovered: {self.tracking_df.at[day, 'recovered']}, "
-                       f"susceptible: {self.tracking_df.at[day, 'susceptible']}, "
-                       f"dead: {self.tracking_df.at[day, 'dead']}, "
-                       f"hospitalized: {self.tracking_df.at[day, 'hospitalized']}, "
-                       f"ICU: {self.tracking_df.at[day, 'ICU']}, "
-                       f"tested: {self.tracking_df.at[day, 'tested']}, "
-                       f"total quarantined: {self.tracking_df.at[day, 'quarantined']}, "
-                       f"infected students: {self.tracking_df.at[day, 'inf_students']}, "
-                       f"vaccinated: {self.tracking_df.at[day, 'vaccinated']}"))
+                       f"infected: {self.tracking['infected'][day]}, "
+                       f"recovered: {self.tracking['recovered'][day]}, "
+                       f"susceptible: {self.tracking['susceptible'][day]}, "
+                       f"dead: {self.tracking['dead'][day]}, "
+                       f"hospitalized: {self.tracking['hospitalized'][day]}, "
+                       f"ICU: {self.tracking['ICU'][day]}, "
+                       f"tested: {self.tracking['tested'][day]}, "
+                       f"total quarantined: {self.tracking['quarantined'][day]}, "
+                       f"infected students: {self.tracking['inf_students'][day]}, "
+                       f"vaccinated: {self.tracking['vaccinated'][day]}"))
 
                 # Print variants
                 print("Variants", end=": ")
@@ -432,32 +514,68 @@ class Simulation():
             print(f"{'':-<80}")
             print("Simulation summary:")
             print(f"    Time elapsed: {h:02.0f}:{m:02.0f}:{s:02.0f}")
-            print(f"    {self.tracking_df['susceptible'].iloc[-1]} never got it")
-            print(f"    {self.tracking_df['dead'].iloc[-1]} died")
-            print(f"    {self.tracking_df['infected'].max()} had it at the peak")
-            print(f"    {self.tracking_df.at[day, 'tested']} were tested")
-            print(f"    {self.tracking_df['quarantined'].max()} were in quarantine at the peak")
-            print(f"    {self.tracking_df['hospitalized'].max()} at peak hospitalizations")
-            print(f"    {self.tracking_df['dead'].max()} at peak deaths")
+            print(f"    {self.tracking['susceptible'][-1]} never got it")
+            print(f"    {self.tracking['dead'][-1]} died")
+            print(f"    {self.tracking['infected'].max()} had it at the peak")
+            print(f"    {self.tracking['tested'][day]} were tested")
+            print(f"    {self.tracking['quarantined'].max()} were in quarantine at the peak")
+            print(f"    {self.tracking['hospitalized'].max()} at peak hospitalizations")
+            print(f"    {self.tracking['dead'].max()} at peak deaths")
             print("    The breakdown of the variants is", end=": ")
             for key, val in self.track_virus_types.items():
                 print(f"{key}-{np.max(val)}", end=", ")
             print("")
-            print(f"    {self.tracking_df.at[day, 'vaccinated']} people were vaccinated")
-            print(f"    {self.tracking_df.at[day, 'vaccinated']/self.nPop*100:.2f}% of population was vaccinated.")
+            print(f"    {self.tracking['vaccinated'][day]} people were vaccinated")
+            print(f"    {self.tracking['vaccinated'][day]/self.nPop*100:.2f}% of population was vaccinated.")
+
+    def interact_at_sites(self, sites, grade_code, personal, day, phase_start):
+        """ Method to run the interactions at one grade of interaction sites, timing each step.
 
-        # Unpack the virus types into the dataframe
-        for virus_type, virus_type_arr in self.track_virus_types.items():
-            self.tracking_df.loc[:, virus_type] = virus_type_arr
+        Parameters
+        ----------
+        sites : :obj:`cv19.site_membership.SiteMembership`
+            The sites of the grade, as returned by the InteractionSites get_*_sites methods.
+        grade_code : str
+            The code of the grade of the sites.
+        personal : bool
+            Whether the contacts made at these sites are personal contacts.
+        day : int
+            The day value that this function is being called on in the simulation.
+        phase_start : float
+            The time at which the interactions started.
 
-        # Unpack the interaction site number of interactions into the dataframe
-        for inter_site, inter_site_arr in self.inter_sites.daily_interactions.items():
-            self.tracking_df.loc[:, f"n_interactions_{inter_site}"] = inter_site_arr
+        Returns
+        -------
+        : float
+            The time at which the interactions finished.
+        """
 
-        # Change the index to day
-        self.tracking_df.index.rename("day", inplace=True)
+        will_visit = self.inter_sites.will_visit_site(sites, self.will_go_prob[grade_code])
+        phase_start = self.time_phase(f"will_visit_{grade_code}", day, phase_start)
+        self.inter_sites.site_interaction(will_visit, day, personal=personal, grade_code=grade_code)
+        return self.time_phase(f"site_interaction_{grade_code}", day, phase_start)
 
-        self.has_run = True
+    def time_phase(self, phase, day, phase_start):
+        """ Method to add the time elapsed since the start of a phase of a day to its timings.
+
+        Parameters
+        ----------
+        phase : str
+            The name of the phase, one of the keys of self.timings.
+        day : int
+            The day value that this function is being called on in the simulation.
+        phase_start : float
+            The time at which the phase started, from timeit.default_timer.
+
+        Returns
+        -------
+        : float
+            The current time, which is the start of the next phase.
+        """
+
+        now = timer()
+        self.timings[phase][day] += now - phase_start
+        return now
 
     def update_tracking_arrays(self, day):
         """ Function to update the tracking dataframe after each day.
@@ -470,24 +588,24 @@ class Simulation():
         """
 
         # Count all the different states of people
-        self.tracking_df.at[day, "infected"] = self.pop.count_infected()
-        self.tracking_df.at[day, "recovered"] = self.pop.count_recovered()
-        self.tracking_df.at[day, "dead"] = self.pop.count_dead()
-        self.tracking_df.at[day, "hospitalized"] = self.pop.count_hospitalized()
-        self.tracking_df.at[day, "ICU"] = self.pop.count_ICU()
-        self.tracking_df.at[day, "tested"] = self.pop.count_tested()
-        self.tracking_df.at[day, "quarantined"] = self.pop.count_quarantined()
-        self.tracking_df.at[day, "testing_wait_list"] = self.pop.get_testing_wait_list()
-        self.tracking_df.at[day, "new_quarantined"] = self.pop.get_new_quarantined()
-        self.tracking_df.at[day, "infected_students"] = self.pop.count_infected_students()
-        self.tracking_df.at[day, "vaccinated"] = self.pop.count_vaccinated()
+        self.tracking["infected"][day] = self.pop.count_infected()
+        self.tracking["recovered"][day] = self.pop.count_recovered()
+        self.tracking["dead"][day] = self.pop.count_dead()
+        self.tracking["hospitalized"][day] = self.pop.count_hospitalized()
+        self.tracking["ICU"][day] = self.pop.count_ICU()
+        self.tracking["tested"][day] = self.pop.count_tested()
+        self.tracking["quarantined"][day] = self.pop.count_quarantined()
+        self.tracking["testing_wait_list"][day] = self.pop.get_testing_wait_list()
+        self.tracking["new_quarantined"][day] = self.pop.get_new_quarantined()
+        self.tracking["infected_students"][day] = self.pop.count_infected_students()
+        self.tracking["vaccinated"][day] = self.pop.count_vaccinated()
 
         if day != 0:
-            delta_infected = self.tracking_df.at[day, "infected"] - self.tracking_df.at[day - 1, "infected"]
-            self.tracking_df.at[day, "delta_infected"] = delta_infected
-            self.tracking_df.at[day, "new_infected"] = self.inter_sites.daily_new_infections
-            new_tested = self.tracking_df.at[day, "tested"] - self.tracking_df.at[day - 1, "tested"]
-            self.tracking_df.at[day, "new_tested"] = new_tested
+            delta_infected = self.tracking["infected"][day] - self.tracking["infected"][day - 1]
+            self.tracking["delta_infected"][day] = delta_infected
+            self.tracking["new_infected"][day] = self.inter_sites.daily_new_infections
+            new_tested = self.tracking["tested"][day] - self.tracking["tested"][day - 1]
+            self.tracking["new_tested"][day] = new_tested
 
             self.calculate_SIR_metrics(day)
 
@@ -509,9 +627,9 @@ class Simulation():
         """
 
         # Define variables in accordance with wikipedia page
-        dR_dt = self.tracking_df.at[day, "recovered"] - self.tracking_df.at[day - 1, "recovered"]
-        dI_dt = self.tracking_df.at[day, "delta_infected"]
-        S, I = self.tracking_df.at[day, "susceptible"], self.tracking_df.at[day, "infected"]
+        dR_dt = self.tracking["recovered"][day] - self.tracking["recovered"][day - 1]
+        dI_dt = self.tracking["delta_infected"][day]
+        S, I = self.tracking["susceptible"][day], self.tracking["infected"][day]
         N = self.parameters["simulation_data"]["nPop"]
 
         gamma = dR_dt / I if I > 0 else 0
@@ -520,16 +638,16 @@ class Simulation():
         if day - self.R0_lag_time >= 0:
 
             # Use the old gamma (infected rate) and current beta (recovery rate)
-            lagged_gamma = self.tracking_df.at[day - self.R0_lag_time, "gamma"]
+            lagged_gamma = self.tracking["gamma"][day - self.R0_lag_time]
             daily_R0 = beta / lagged_gamma if lagged_gamma != 0 else 0
             daily_R_eff = daily_R0 * (S / N)
             HIT = 1 - 1 / daily_R_eff if daily_R_eff != 0 else 1
 
-            self.tracking_df.at[day, "R0"] = daily_R0
-            self.tracking_df.at[day, "R_eff"] = daily_R_eff
-            self.tracking_df.at[day, "HIT"] = HIT
+            self.tracking["R0"][day] = daily_R0
+            self.tracking["R_eff"][day] = daily_R_eff
+            self.tracking["HIT"][day] = HIT
 
-        self.tracking_df.at[day, "gamma"], self.tracking_df.at[day, "beta"] = gamma, beta
+        self.tracking["gamma"][day], self.tracking["beta"][day] = gamma, beta
 
     def check_has_run(self, check, information="", fail=True):
         """Method to check whether or not the simulation has run.
@@ -589,6 +707,8 @@ class Simulation():
         """
 
         self.check_has_run(check=True, information="Cannot make plots.", fail=True)
+        import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+        tracking_df = self.get_tracking_dataframe()
 
         _, ax = plt.subplots(figsize=(10, 8), dpi=100)
         days = np.linspace(0, self.nDays, self.nDays, dtype=int)
@@ -609,24 +729,24 @@ class Simulation():
                 if parameter == "virus_types":
                     for vt_key, vt_value in value.items():
                         if vt_value:
-                            plt.plot(days, self.tracking_df[vt_key],
+                            plt.plot(days, tracking_df[vt_key],
                                      label=f"Virus Type: {vt_key}")
 
                 # Handle nested interaction plotting
                 elif parameter == "n_interactions":
                     for nint_key, nint_value in value.items():
                         if nint_value:
-                            plt.plot(days, self.tracking_df[f"n_interactions_{nint_key}"],
+                            plt.plot(days, tracking_df[f"n_interactions_{nint_key}"],
                                      label=f"Total Interactions: {nint_key}")
 
                 # Handle the fill_between plotting
                 elif parameter in fill_plotting_values:
-                    plt.fill_between(days, 0, 1, where=self.tracking_df[parameter], alpha=0.3,
+                    plt.fill_between(days, 0, 1, where=tracking_df[parameter], alpha=0.3,
                                      transform=ax.get_xaxis_transform(), label=f"{parameter} implemented")
 
                 # Handle the regular plotting
                 else:
-                    plt.plot(days, self.tracking_df[parameter], label=parameter.replace("_", " "))
+                    plt.plot(days, tracking_df[parameter], label=parameter.replace("_", " "))
 
         # Final graph formatting
         plt.grid()
@@ -648,7 +768,47 @@ class Simulation():
                            information="Cannot return zero-initialized arrays.",
                            fail=True)
 
-        return self.tracking_df
+        if self._tracking_df is None:
+            import pandas as pd  # pylint: disable=import-outside-toplevel
+            tracking_df = pd.DataFrame(self.tracking)
+
+            # Unpack the virus types into the dataframe
+            for virus_type, virus_type_arr in self.track_virus_types.items():
+                tracking_df[virus_type] = virus_type_arr
+
+            # Unpack the interaction site number of interactions into the dataframe
+            for inter_site, inter_site_arr in self.inter_sites.daily_interactions.items():
+                tracking_df[f"n_interactions_{inter_site}"] = inter_site_arr
+
+            # Change the index to day
+            tracking_df.index.rename("day", inplace=True)
+            self._tracking_df = tracking_df
+
+        return self._tracking_df
+
+    @property
+    def tracking_df(self):
+        """ The tracking arrays as a pandas DataFrame, see get_tracking_dataframe.
+        """
+        return self.get_tracking_dataframe()
+
+    def get_timings_dataframe(self):
+        """ Method to return the time spent on each phase of each day as a pandas DataFrame.
+
+        Returns
+        -------
+        : `pd.DataFrame`
+            A pandas DataFrame with one column per phase of the day (see TIMED_PHASES) holding
+            the wall clock time in seconds spent on that phase, indexed by day.
+        """
+        self.check_has_run(check=True,
+                           information="Cannot return zero-initialized arrays.",
+                           fail=True)
+
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+        timings_df = pd.DataFrame(self.timings)
+        timings_df.index.rename("day", inplace=True)
+        return timings_df
 
     def get_tracking_arrays(self):
         """ Method to return all tracking arrays as a dictionary of lists.
@@ -0,0 +1,255 @@
+"""
+This file holds the site membership class used by interaction_sites.py to store which people can visit each site.
+"""
+import numpy as np
+
+
+def _ranges(starts, lengths):
+    """Function to list every position of many ranges of positions, range after range.
+
+    Parameters
+    ----------
+    starts : :obj:`np.array` of :obj:`int`
+        The first position of each range.
+    lengths : :obj:`np.array` of :obj:`int`
+        The number of positions in each range.
+
+    Returns
+    -------
+    : :obj:`np.array` of :obj:`int`
+    """
+    return np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+
+
+class SiteMembership:
+    """The people associated with each interaction site of one grade, in compressed sparse row form.
+
+    The people of every site are held in a single array (indices), where the people of site s
+    are indices[indptr[s]:indptr[s + 1]]. The transposed structure, with the sites of each person,
+    is held in the same way in person_sites and person_indptr, and is only built when first used.
+    This avoids holding one small array per site, and lets operations over all of the sites of a
+    grade be done in single vectorized passes.
+
+    Indexing and iterating over the object gives the people of each site, as for a list of arrays.
+    The arrays are read only, and are replaced rather than changed when people are removed, so
+    views of the membership can be handed out without copying. Use copy for writeable arrays.
+
+    Attributes
+    ----------
+    indptr : :obj:`np.array` of :obj:`int`
+        The start of the people of each site in indices, with one extra entry holding the end of the last site.
+    indices : :obj:`np.array` of :obj:`int`
+        The indices of the people associated with each site, site after site.
+    person_indptr : :obj:`np.array` of :obj:`int`
+        The start of the sites of each person in person_sites, with one extra entry holding the end.
+    person_sites : :obj:`np.array` of :obj:`int`
+        The sites associated with each person, person after person.
+    n_people : int
+        The number of people the person indices can refer to.
+    """
+
+    def __init__(self, indptr, indices, n_people):
+        """ __init__ method docstring.
+
+        Parameters
+        ----------
+        indptr : :obj:`np.array` of :obj:`int`
+            The start of the people of each site in indices, followed by the end of the last site.
+        indices : :obj:`np.array` of :obj:`int`
+            The indices of the people associated with each site, site after site.
+        n_people : int
+            The number of people the person indices can refer to.
+        """
+
+        self.indptr = np.asarray(indptr, dtype=int)
+        self.indices = np.asarray(indices, dtype=int)
+        self.n_people = n_people
+        self.transposed = None  # (person_indptr, person_sites), built when first needed
+        self.set_read_only()
+
+    @classmethod
+    def from_pairs(cls, sites, people, n_sites, n_people):
+        """Method to create the membership of a grade from a list of (site, person) pairs.
+
+        The people of each site keep the order in which they are given.
+
+        Parameters
+        ----------
+        sites : :obj:`np.array` of :obj:`int`
+            The site of each pair.
+        people : :obj:`np.array` of :obj:`int`
+            The person of each pair.
+        n_sites : int
+            The number of sites of the grade.
+        n_people : int
+            The number of people the person indices can refer to.
+
+        Returns
+        -------
+        membership : :obj:`SiteMembership`
+        """
+
+        sites = np.asarray(sites, dtype=int)
+        people = np.asarray(people, dtype=int)
+
+        indptr = np.zeros(n_sites + 1, dtype=int)
+        np.cumsum(np.bincount(sites, minlength=n_sites), out=indptr[1:])
+
+        return cls(indptr, people[np.argsort(sites, kind="stable")], n_people)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __getitem__(self, site):
+        return self.indices[self.indptr[site]:self.indptr[site + 1]]
+
+    def __iter__(self):
+        return (self[site] for site in range(len(self)))
+
+    def site_of_entries(self):
+        """Method to find the site of each entry of indices.
+
+        Returns
+        -------
+        sites : :obj:`np.array` of :obj:`int`
+            The site that each entry of indices belongs to.
+        """
+        return np.repeat(np.arange(len(self)), np.diff(self.indptr))
+
+    def transpose(self):
+        """Method to build the person to site index from the site to person index.
+
+        Returns
+        -------
+        person_indptr : :obj:`np.array` of :obj:`int`
+            The start of the sites of each person in person_sites, followed by the end of the last person.
+        person_sites : :obj:`np.array` of :obj:`int`
+            The sites associated with each person, person after person.
+        """
+
+        person_indptr = np.zeros(self.n_people + 1, dtype=int)
+        np.cumsum(np.bincount(self.indices, minlength=self.n_people), out=person_indptr[1:])
+        person_sites = self.site_of_entries()[np.argsort(self.indices, kind="stable")]
+
+        return person_indptr, person_sites
+
+    @property
+    def person_indptr(self):
+        """The start of the sites of each person in person_sites, followed by the end of the last person."""
+        return self.get_transposed()[0]
+
+    @property
+    def person_sites(self):
+        """The sites associated with each person, person after person."""
+        return self.get_transposed()[1]
+
+    def get_transposed(self):
+        """Method to return the person to site index, building it the first time it is needed.
+
+        Returns
+        -------
+        person_indptr : :obj:`np.array` of :obj:`int`
+        person_sites : :obj:`np.array` of :obj:`int`
+        """
+
+        if self.transposed is None:
+            self.transposed = self.transpose()
+            self.set_read_only()
+        return self.transposed
+
+    def sites_of(self, person):
+        """Method to return the sites associated with a person.
+
+        Parameters
+        ----------
+        person : int
+            The index of the person.
+
+        Returns
+        -------
+        : :obj:`np.array` of :obj:`int`
+        """
+        return self.person_sites[self.person_indptr[person]:self.person_indptr[person + 1]]
+
+    def members(self):
+        """Method to return every person associated with at least one site.
+
+        Returns
+        -------
+        : :obj:`np.array` of :obj:`int`
+            The sorted indices of the people.
+        """
+        return np.flatnonzero(np.diff(self.person_indptr))
+
+    def remove(self, people):
+        """Method to remove people from every site they are associated with.
+
+        The sites of the people are found with the person to site index, so only those sites
+        are searched for the people and have their counts changed. People that are not
+        associated with any site are ignored.
+
+        Parameters
+        ----------
+        people : :obj:`np.array` of :obj:`int`
+            The indices of the people to be removed.
+        """
+
+        people = np.unique(people)
+        people = people[(people >= 0) & (people < self.n_people)]
+        starts, lengths = self.person_indptr[people], np.diff(self.person_indptr)[people]
+        if lengths.sum() == 0:
+            return
+
+        # Entries of person_sites belonging to the people, and the sites they are removed from
+        entries = _ranges(starts, lengths)
+        sites = np.unique(self.person_sites[entries])
+        removed_per_site = np.bincount(self.person_sites[entries], minlength=len(self))
+
+        # Entries of indices belonging to the people, searched for within their sites only
+        site_entries = _ranges(self.indptr[sites], np.diff(self.indptr)[sites])
+        removed = site_entries[np.isin(self.indices[site_entries], people)]
+
+        self.indices = np.delete(self.indices, removed)
+        self.indptr = self.indptr - np.concatenate(([0], np.cumsum(removed_per_site)))
+
+        person_counts = np.diff(self.person_indptr)
+        person_counts[people] = 0
+        self.transposed = (np.concatenate(([0], np.cumsum(person_counts))), np.delete(self.person_sites, entries))
+        self.set_read_only()
+
+    def set_read_only(self):
+        """Method to stop the arrays of the membership from being changed in place."""
+
+        for array in (self.indptr, self.indices) + (self.transposed or ()):
+            array.setflags(write=False)
+
+    def view(self):
+        """Method to return a read only view of the membership, without copying its arrays.
+
+        The person to site index is built first, so that it is shared by the membership and all
+        of its views. The view is not changed when people are later removed from the membership.
+
+        Returns
+        -------
+        : :obj:`SiteMembership`
+        """
+
+        self.get_transposed()
+        membership = SiteMembership.__new__(SiteMembership)
+        membership.__dict__.update(self.__dict__)
+        return membership
+
+    def copy(self):
+        """Method to return a copy of the membership, with writeable arrays.
+
+        Returns
+        -------
+        : :obj:`SiteMembership`
+        """
+
+        membership = SiteMembership.__new__(SiteMembership)
+        membership.indptr = self.indptr.copy()
+        membership.indices = self.indices.copy()
+        membership.n_people = self.n_people
+        membership.transposed = None if self.transposed is None else tuple(a.copy() for a in self.transposed)
+        return membership
@@ -0,0 +1,3 @@
+CV19ROOT=/root/package
+PYTHONPATH=${CV19ROOT}:${PYTHONPATH}
+export CV19ROOT PYTHONPATH
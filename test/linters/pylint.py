@@ -33,7 +33,7 @@ def run_pylint():
     print("")
 
     # List of class names for which member attributes should not be checked (from pylint).
-    ignored_classes = ['InteractionSites', 'Person', 'Policy',
+    ignored_classes = ['AgentStore', 'InteractionSites', 'Person', 'Policy',
                        'Population', 'Simulation']
 
     # Overall command to run.
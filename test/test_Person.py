@@ -58,44 +58,40 @@ class TestPerson(unittest.TestCase):
         self.assertFalse(person2.is_recovered())          # Should be recovered
         self.assertEqual(person2.recovered_day, None)     # Should have no recovery day
 
-        person3 = Person(3, sim_obj=self.sim_obj, infected=False)
-        person3.infect(day=infected_day, cure_days=cure_days, virus_type='alpha')
+        pop = self.sim_obj.pop
+        index = pop.get_susceptible()[0]
+        person3 = pop.get_person(index)
+        self.assertTrue(pop.infect(index=index, day=infected_day, virus_type='alpha'))
 
-        day = infected_day + cure_days
+        day = infected_day + person3.cure_days
         self.assertTrue(person3.check_cured(day=day))     # Should be cured by infected_day + cure_days
         self.assertFalse(person3.is_infected())           # Should no longer be infected
         self.assertTrue(person3.is_recovered())           # Should be recovered
         self.assertEqual(person3.recovered_day, day)      # Should have the right recovery day
 
     def test_infect(self):
-        """ Method used to test the infect method to ensure it is behaving correctly.
+        """ Method used to test infecting a person to ensure it is behaving correctly.
 
-        This method looks to test for proper performance of the infect function in the person
-        class. Specifically, it looks at people who should not be able to get infected, that cure
-        days is set properly, and that default parameters work.
+        This method looks to test for proper performance of infecting a person through the population.
+        Specifically, it looks at people who should not be able to get infected, and that cure days
+        and the infected day are set.
         """
 
-        infected_day, cure_days = 10, 5
-        person1 = Person(1, sim_obj=self.sim_obj, infected=False, recovered=False)
+        infected_day = 10
+        pop = self.sim_obj.pop
+        index = pop.get_susceptible()[0]
+        person1 = pop.get_person(index)
 
-        self.assertTrue(person1.infect(day=infected_day, virus_type='alpha'))  # Infection should have worked
+        self.assertTrue(pop.infect(index=index, day=infected_day, virus_type='alpha'))  # Infection should have worked
         self.assertTrue(person1.is_infected())             # Should be infected
         self.assertFalse(person1.is_recovered())           # Should not be recovered
         self.assertEqual(person1.infected_day, infected_day)              # Should have the right infected day
+        self.assertIsNotNone(person1.cure_days)            # Make sure that cure days is set
 
-        person2 = Person(2, sim_obj=self.sim_obj, infected=True, recovered=False)
-        self.assertFalse(person2.infect(day=infected_day, virus_type='alpha'))  # Should not get infected - already infected
-
-        person3 = Person(3, sim_obj=self.sim_obj, infected=False, recovered=True)
-        self.assertFalse(person3.infect(day=infected_day, virus_type='alpha'))  # Should not get infected - already recovered
+        self.assertFalse(pop.infect(index=index, day=infected_day, virus_type='alpha'))  # Should not get infected - already infected
 
-        person4 = Person(4, sim_obj=self.sim_obj, infected=False, recovered=False)
-        person4.infect(day=infected_day, cure_days=cure_days, virus_type='alpha')
-        self.assertEqual(person4.cure_days, cure_days)     # Make sure that cure days is set properly
-
-        person5 = Person(5, sim_obj=self.sim_obj, infected=False, recovered=False)
-        person5.infect(day=infected_day, virus_type='alpha')
-        self.assertIsNotNone(person5.cure_days)            # Make sure that cure days is set even though no parameter passed
+        self.assertTrue(pop.cure(index=index, day=infected_day + person1.cure_days))
+        self.assertFalse(pop.infect(index=index, day=infected_day, virus_type='alpha'))  # Should not get infected - already recovered
 
     def test_quarantine(self):
         """ Method used to test the quarantine mechanic to ensure it is behaving correctly.
@@ -106,8 +102,14 @@ class TestPerson(unittest.TestCase):
 
         infected_day, quarantined_day = 20, 25
         quarantine_time = self.sim_obj.quarantine_time
-        person1 = Person(1, sim_obj=self.sim_obj, infected=True, infected_day=infected_day,
-                         recovered=False, quarantined_day=quarantined_day)
+        pop = self.sim_obj.pop
+        index = pop.get_susceptible()[0]
+        person1 = pop.get_person(index)
+        n_quarantined = pop.count_quarantined()
+
+        self.assertTrue(pop.infect(index=index, day=infected_day, virus_type='alpha'))
+        self.assertTrue(person1.set_quarantine(day=quarantined_day))
+        self.assertEqual(pop.count_quarantined(), n_quarantined + 1)
 
         # Make sure they are let out properly
         did_leave_quarantine = person1.leave_quarantine(day=quarantined_day + quarantine_time - 1)
@@ -115,6 +117,7 @@ class TestPerson(unittest.TestCase):
         did_leave_quarantine = person1.leave_quarantine(day=quarantined_day + quarantine_time)
         self.assertTrue(did_leave_quarantine)
         self.assertFalse(person1.is_quarantined())
+        self.assertEqual(pop.count_quarantined(), n_quarantined)
 
 
 if __name__ == '__main__':
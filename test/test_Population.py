@@ -76,6 +76,8 @@ class TestPopulation(unittest.TestCase):
         # Make sure the get person works
         i = np.random.choice(nPop)
         self.assertEqual(pop.get_person(index=i).get_index(), i)
+        self.assertEqual(pop.get_population()[i].get_index(), i)
+        self.assertEqual(pop.get_population()[-1].get_index(), nPop - 1)
 
     def test_globals(self):
         """ Method to test the global variables used in the population class.
@@ -169,6 +171,238 @@ class TestPopulation(unittest.TestCase):
         self.assertTrue(pop.get_person(index=infected_id).is_recovered())
         self.assertFalse(pop.get_person(index=infected_id).is_infected())
 
+    def test_infect_many(self):
+        """ Method to test the batched infect function of the population class.
+
+        Infects a group of people at once, including repeated and already infected people,
+        and checks that only the susceptible people are infected, with durations drawn from
+        the ranges of their case severity.
+        """
+        pop = Population(self.sim_obj)
+        d_params = self.sim_obj.disease_parameters
+        virus_code = self.sim_obj.variant_codes['alpha']
+
+        susceptible = pop.get_susceptible()[:50]
+        already_infected = pop.get_infected()[:1]
+        n_infected = pop.count_infected()
+        indices = np.concatenate([susceptible, susceptible[:5], already_infected])
+
+        infected = pop.infect_many(indices, virus_code, day=2)
+        self.assertEqual(sorted(infected), sorted(susceptible))
+        self.assertEqual(pop.count_infected(), n_infected + len(susceptible))
+        self.assertTrue(pop.agents.infected[susceptible].all())
+        self.assertTrue((pop.agents.infected_day[susceptible] == 2).all())
+        self.assertTrue((pop.agents.virus_type[susceptible] == virus_code).all())
+
+        days_key = {'Mild': 'mild_days', 'Hospitalization': 'hospital_days', 'ICU': 'ICU_days', 'Death': 'die_days'}
+        for index in susceptible:
+            person = pop.get_person(index=index)
+            severity = person.case_severity or 'Mild'
+            self.assertTrue(d_params[days_key[severity]]['min'] <= person.cure_days
+                            < d_params[days_key[severity]]['max'])
+            if person.will_get_symptoms:
+                self.assertTrue(d_params['days_before_symptoms']['min'] <= person.days_until_symptoms
+                                < d_params['days_before_symptoms']['max'])
+            else:
+                self.assertIsNone(person.days_until_symptoms)
+            self.assertEqual(person.hospitalized, severity != 'Mild')
+
+        # Nobody is left to infect
+        self.assertEqual(len(pop.infect_many(indices, virus_code, day=3)), 0)
+
+    def test_state_counters(self):
+        """ Method to test that the state counters are kept up to date by the transition methods.
+
+        Moves people through the different compartments, and checks that every counter matches
+        a full count of the state array after each step.
+        """
+        pop = Population(self.sim_obj)
+
+        def check_counts():
+            self.assertEqual(pop.count_susceptible(), len(pop.get_susceptible()))
+            self.assertEqual(pop.count_infected(), len(pop.get_infected()))
+            self.assertEqual(pop.count_recovered(), len(pop.get_recovered()))
+            self.assertEqual(pop.count_dead(), len(pop.get_dead()))
+            self.assertEqual(pop.count_hospitalized(), len(pop.get_hospitalized()))
+            self.assertEqual(pop.count_ICU(), len(pop.get_ICU()))
+            self.assertEqual(pop.count_quarantined(), len(pop.get_quarantined()))
+            self.assertEqual(pop.count_vaccinated(), len(pop.get_vaccinated()))
+            infected = pop.get_infected()
+            for virus_name, virus_code in self.sim_obj.variant_codes.items():
+                self.assertEqual(pop.count_variant_cases(virus_name),
+                                 np.count_nonzero(pop.agents.virus_type[infected] == virus_code))
+
+        check_counts()
+
+        # Infect, quarantine and cure someone
+        index = pop.get_susceptible()[0]
+        self.assertTrue(pop.infect(index=index, day=0, virus_type='alpha'))
+        pop.get_person(index=index).set_quarantine(day=0)
+        check_counts()
+        self.assertTrue(pop.cure(index=index, day=40))
+        self.assertFalse(pop.update_cured(index=index))
+        pop.update_quarantine(day=40)
+        check_counts()
+
+        # Kill someone
+        index = pop.get_susceptible()[0]
+        self.assertTrue(pop.infect(index=index, day=0, virus_type='alpha'))
+        pop.get_person(index=index).dead = True
+        self.assertTrue(pop.update_dead(index=index))
+        self.assertFalse(pop.update_dead(index=index))
+        check_counts()
+
+    def test_disease_progression(self):
+        """ Method to test that infections and quarantines end on the day they are scheduled to.
+
+        Infects and quarantines a person, and checks that they are only cured and released once
+        their scheduled day has been reached.
+        """
+        pop = Population(self.sim_obj)
+        quarantine_time = self.sim_obj.quarantine_time
+
+        index = pop.get_susceptible()[0]
+        pop.infect(index=index, day=1, virus_type='alpha')
+        person = pop.get_person(index=index)
+        person.case_severity = 'Mild'
+        person.cure_days = quarantine_time + 5
+        pop.quarantine(index=index, day=1)
+        # Reschedule the infection with the new cure days
+        pop.schedule_infections([index])
+
+        # Released from quarantine before the infection ends
+        pop.update_quarantine(day=quarantine_time)
+        self.assertTrue(person.is_quarantined())
+        pop.update_quarantine(day=1 + quarantine_time)
+        self.assertFalse(person.is_quarantined())
+
+        # Cured once the cure days have passed
+        pop.update_disease_progression(day=quarantine_time + 5)
+        self.assertTrue(person.is_infected())
+        pop.update_disease_progression(day=1 + quarantine_time + 5)
+        self.assertTrue(person.is_recovered())
+        self.assertTrue(index in pop.get_recovered())
+
+    def test_seed(self):
+        """ Method to test that populations are reproducible from the seed of the simulation.
+
+        Builds populations from simulations with the same and different seeds, and checks that
+        only the ones with the same seed are identical.
+        """
+        config_file = str(Path(Path(__file__).parent, "../config_files/main.toml").resolve())
+        pop_1 = Simulation(config_file, seed=42).pop
+        pop_2 = Simulation(config_file, seed=42).pop
+        pop_3 = Simulation(config_file, seed=43).pop
+
+        for column in ("age", "job", "case_severity", "household", "infected", "cure_days"):
+            self.assertTrue(np.array_equal(getattr(pop_1.agents, column), getattr(pop_2.agents, column)))
+        self.assertTrue(np.array_equal(pop_1.get_infected(), pop_2.get_infected()))
+        self.assertFalse(np.array_equal(pop_1.agents.age, pop_3.agents.age))
+
+    def test_agent_store(self):
+        """ Method to test that people are views onto the agent store of the population.
+
+        Checks that attributes read through a person match the agent store columns, and that
+        changes made through a person are written back to the store (and vice versa).
+        """
+        pop = Population(self.sim_obj)
+
+        index = pop.get_susceptible()[0]
+        person = pop.get_person(index=index)
+        self.assertEqual(person.get_index(), index)
+        self.assertEqual(person.is_infected(), pop.agents.infected[index])
+        self.assertEqual(person.age, pop.age_options[pop.agents.age[index]])
+
+        # Writes through the person should be seen in the store
+        self.assertTrue(pop.infect(index=index, day=3, virus_type='alpha'))
+        self.assertTrue(pop.agents.infected[index])
+        self.assertEqual(pop.agents.infected_day[index], 3)
+        self.assertEqual(pop.agents.virus_type[index], self.sim_obj.variant_codes['alpha'])
+
+        # Writes to the store should be seen through the person
+        pop.agents.has_mask[index] = False
+        self.assertFalse(pop.get_person(index=index).has_mask)
+
+        # Unset optional values are returned as None
+        self.assertIsNone(person.recovered_day)
+
+    def test_get_housemates(self):
+        """ Method to test that the housemates of a person are the other members of their house.
+
+        Checks a person in a general house and a student in a student house, if there are any.
+        """
+        pop = Population(self.sim_obj)
+
+        for houses in (pop.house_ppl_i, pop.house_stud_i):
+            if len(houses) == 0:
+                continue
+            house = max(houses, key=len)
+            housemates = pop.get_housemates(house[0])
+            self.assertEqual(sorted(housemates.tolist()), sorted(house[1:].tolist()))
+
+    def test_contact_log(self):
+        """ Method to test that the contact log of the population only keeps the last ct_length days.
+
+        Logs contacts over more days than are kept, and checks that contacts are found from
+        either person, that personal contacts can be picked out, and that old days are dropped.
+        """
+        pop = Population(self.sim_obj)
+        n_days = pop.contact_log.n_days
+
+        for day in range(n_days + 1):
+            pop.contact_log.log(day, np.array([day]), np.array([100 + day]), personal=day % 2 == 0)
+
+        self.assertEqual(pop.contact_log.get_contacts(n_days, 0, n_days + 1), {100 + n_days})
+        self.assertEqual(pop.contact_log.get_contacts(100 + n_days, 0, n_days + 1), {n_days})
+        self.assertEqual(pop.contact_log.get_contacts(1, 1, 2, personal_only=True), set())
+        self.assertEqual(pop.contact_log.get_contacts(0, 0, n_days + 1), set())
+
+    def test_trace_contacts(self):
+        """ Method to test that tracing the contacts of many people at once quarantines the right people.
+
+        Positive people without the contact tracing app only notify the personal contacts and
+        housemates they remember, while positive people with the app notify every contact.
+        """
+        pop = Population(self.sim_obj)
+        self.sim_obj.ct_prob_remember_personal_contacts = 1
+        house_a, house_b = sorted((house for house in pop.house_ppl_i if len(house) > 1), key=len)[-2:]
+        positive_a, positive_b = house_a[0], house_b[0]
+        others = np.setdiff1d(np.arange(pop.nPop), np.concatenate((house_a, house_b)))[:4]
+
+        pop.agents.has_ct_app[:] = False
+        pop.agents.has_ct_app[positive_b] = True
+        pop.contact_log.log(0, [positive_a, others[1]], [others[0], positive_b], personal=False)
+        pop.contact_log.log(0, [others[2]], [positive_a], personal=True)
+
+        notified = pop.trace_contacts(np.array([positive_a, positive_b]), 0)
+
+        expected = np.concatenate((house_a[1:], house_b[1:], [others[1], others[2]]))
+        self.assertEqual(sorted(notified.tolist()), sorted(expected.tolist()))
+        self.assertTrue(pop.agents.quarantined[expected].all())
+        self.assertFalse(pop.agents.quarantined[[others[0], others[3]]].any())
+        self.assertEqual(pop.count_quarantined(), len(expected))
+
+    def test_testing_wait_list(self):
+        """ Method to test that the testing wait list is first in first out, and holds each person once.
+
+        Adds the same symptomatic people to the wait list twice, then tests some of them.
+        """
+        pop = Population(self.sim_obj)
+        pop.prob_of_test = 2
+        people = np.flatnonzero(~pop.agents.infected[:pop.nPop])[:5]
+        pop.agents.has_cold[people] = True
+
+        pop.update_infected_symptomatics(0)
+        pop.update_infected_symptomatics(0)
+        waiting = list(pop.testing)
+        self.assertEqual(len(waiting), len(set(waiting)))
+        self.assertEqual([person for person in waiting if person in people], people.tolist())
+
+        pop.get_tested(len(waiting) - 2, 0)
+        self.assertEqual(list(pop.testing), waiting[-2:])
+        self.assertEqual(np.flatnonzero(pop.agents.waiting_for_test).tolist(), sorted(waiting[-2:]))
+        self.assertTrue((pop.agents.test_day[waiting[:-2]] == 0).all())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -81,6 +81,21 @@ class TestSimulation(unittest.TestCase):
         # Make sure it falls within a standard deviation
         self.assertTrue(np.abs(start_interactions_mean - end_interactions_mean) < n_interactions.std())
 
+    def test_timings(self):
+        """ Method used to make sure the time spent on each phase of each day is recorded.
+
+        Checks that there is one column per phase and one row per day, and that the phases
+        add up to no more than the total time of the simulation.
+        """
+
+        timings = self.quarantine_obj_1.get_timings_dataframe()
+        raw_data = self.quarantine_obj_1.get_tracking_dataframe()
+
+        self.assertEqual(len(timings), len(raw_data))
+        self.assertTrue((timings >= 0).all(axis=None))
+        self.assertTrue(timings["progression"].gt(0).all())
+        self.assertLessEqual(timings.to_numpy().sum(), raw_data["time"].iloc[-1])
+
 
 if __name__ == '__main__':
     unittest.main()